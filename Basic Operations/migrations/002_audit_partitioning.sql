@@ -0,0 +1,154 @@
+-- =========================================
+-- AUDIT TRAIL PARTITIONING
+-- =========================================
+-- The triggers in security/Trigers.sql append to the *_audit tables on every
+-- write and security_log is never trimmed. This migration:
+--   * partitions the five audit tables and security_log by month
+--     (RANGE COLUMNS on ChangeTimestamp / Timestamp), so reads of recent
+--     history prune to a few partitions and old months can be dropped
+--     instantly instead of DELETEd row by row
+--   * adds (entity ID, timestamp) indexes for per-record history reads
+--   * keeps three months of empty partitions ahead of the current one with a
+--     daily event (needs event_scheduler=ON, like rollups.sql)
+--
+-- Old partitions are archived and dropped by the retention job:
+--   python -m maintenance.audit_retention --keep-months 12 --archive-dir /var/backups/audit
+--
+-- MySQL requires the partitioning column in every unique key, so the
+-- primary keys become (AuditID, ChangeTimestamp) / (LogID, Timestamp).
+-- AuditID stays AUTO_INCREMENT and unique in practice, so the rollup high-water
+-- marks in rollups.sql keep working. Partitioned tables cannot have foreign
+-- keys; the audit tables have none.
+--
+-- Each ALTER rebuilds its table: run in a maintenance window on large tables.
+--   mysql -u root -p ecommerce_db < "Basic Operations/migrations/002_audit_partitioning.sql"
+
+USE ecommerce_db;
+
+-- 1. Timestamps become NOT NULL and part of the primary key
+UPDATE customer_audit SET ChangeTimestamp = '1970-01-01' WHERE ChangeTimestamp IS NULL;
+ALTER TABLE customer_audit
+    MODIFY ChangeTimestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (AuditID, ChangeTimestamp),
+    ADD INDEX idx_customer_audit_entity_time (CustomerID, ChangeTimestamp);
+
+UPDATE card_audit SET ChangeTimestamp = '1970-01-01' WHERE ChangeTimestamp IS NULL;
+ALTER TABLE card_audit
+    MODIFY ChangeTimestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (AuditID, ChangeTimestamp),
+    ADD INDEX idx_card_audit_entity_time (CardID, ChangeTimestamp);
+
+UPDATE product_audit SET ChangeTimestamp = '1970-01-01' WHERE ChangeTimestamp IS NULL;
+ALTER TABLE product_audit
+    MODIFY ChangeTimestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (AuditID, ChangeTimestamp),
+    ADD INDEX idx_product_audit_entity_time (ProductID, ChangeTimestamp);
+
+UPDATE orders_audit SET ChangeTimestamp = '1970-01-01' WHERE ChangeTimestamp IS NULL;
+ALTER TABLE orders_audit
+    MODIFY ChangeTimestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (AuditID, ChangeTimestamp),
+    ADD INDEX idx_orders_audit_entity_time (OrderID, ChangeTimestamp);
+
+UPDATE payment_audit SET ChangeTimestamp = '1970-01-01' WHERE ChangeTimestamp IS NULL;
+ALTER TABLE payment_audit
+    MODIFY ChangeTimestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (AuditID, ChangeTimestamp),
+    ADD INDEX idx_payment_audit_entity_time (PaymentID, ChangeTimestamp);
+
+UPDATE security_log SET Timestamp = '1970-01-01' WHERE Timestamp IS NULL;
+ALTER TABLE security_log
+    MODIFY Timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (LogID, Timestamp),
+    ADD INDEX idx_security_log_user_time (UserAttempted, Timestamp);
+
+DELIMITER $$
+
+-- =========================
+-- PARTITION MAINTENANCE
+-- =========================
+-- Every partitioned table has monthly partitions named pYYYYMM (rows of that
+-- month) and a catch-all p_future (MAXVALUE) that should stay empty.
+
+-- Split p_future into monthly partitions up to p_months_ahead months past the
+-- current one. Cheap while p_future is empty.
+CREATE PROCEDURE add_audit_partitions(IN p_table VARCHAR(64), IN p_months_ahead INT)
+BEGIN
+    DECLARE v_next DATE;
+    DECLARE v_stop DATE;
+    DECLARE v_parts TEXT DEFAULT '';
+
+    -- Upper bound of the newest monthly partition
+    SELECT MAX(CAST(LEFT(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION), 10) AS DATE))
+    INTO v_next
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = p_table
+    AND PARTITION_DESCRIPTION <> 'MAXVALUE';
+
+    SET v_stop = DATE_ADD(DATE_FORMAT(CURDATE(), '%Y-%m-01'), INTERVAL p_months_ahead + 1 MONTH);
+    WHILE v_next < v_stop DO
+        SET v_parts = CONCAT(v_parts, 'PARTITION p', DATE_FORMAT(v_next, '%Y%m'),
+                             ' VALUES LESS THAN (''', DATE_ADD(v_next, INTERVAL 1 MONTH), '''), ');
+        SET v_next = DATE_ADD(v_next, INTERVAL 1 MONTH);
+    END WHILE;
+
+    IF v_parts <> '' THEN
+        SET @partition_sql = CONCAT('ALTER TABLE ', p_table, ' REORGANIZE PARTITION p_future INTO (',
+                                    v_parts, 'PARTITION p_future VALUES LESS THAN (MAXVALUE))');
+        PREPARE stmt FROM @partition_sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+-- Partition an existing table by month of p_column, starting at the month of
+-- its oldest row (p_start is an empty lower bound).
+CREATE PROCEDURE partition_audit_table(IN p_table VARCHAR(64), IN p_column VARCHAR(64))
+BEGIN
+    SET @partition_sql = CONCAT('SELECT DATE_FORMAT(COALESCE(MIN(', p_column, '), CURDATE()), ''%Y-%m-01'') ',
+                                'INTO @first_month FROM ', p_table);
+    PREPARE stmt FROM @partition_sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+
+    SET @partition_sql = CONCAT('ALTER TABLE ', p_table, ' PARTITION BY RANGE COLUMNS(', p_column, ') (',
+                                'PARTITION p_start VALUES LESS THAN (''', @first_month, '''), ',
+                                'PARTITION p_future VALUES LESS THAN (MAXVALUE))');
+    PREPARE stmt FROM @partition_sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+
+    CALL add_audit_partitions(p_table, 3);
+END$$
+
+CREATE PROCEDURE maintain_audit_partitions()
+BEGIN
+    CALL add_audit_partitions('customer_audit', 3);
+    CALL add_audit_partitions('card_audit', 3);
+    CALL add_audit_partitions('product_audit', 3);
+    CALL add_audit_partitions('orders_audit', 3);
+    CALL add_audit_partitions('payment_audit', 3);
+    CALL add_audit_partitions('security_log', 3);
+END$$
+
+DELIMITER ;
+
+-- 2. Partition by month
+CALL partition_audit_table('customer_audit', 'ChangeTimestamp');
+CALL partition_audit_table('card_audit', 'ChangeTimestamp');
+CALL partition_audit_table('product_audit', 'ChangeTimestamp');
+CALL partition_audit_table('orders_audit', 'ChangeTimestamp');
+CALL partition_audit_table('payment_audit', 'ChangeTimestamp');
+CALL partition_audit_table('security_log', 'Timestamp');
+
+-- 3. Keep future months ready
+CREATE EVENT IF NOT EXISTS maintain_audit_partitions_event
+ON SCHEDULE EVERY 1 DAY
+DO CALL maintain_audit_partitions();
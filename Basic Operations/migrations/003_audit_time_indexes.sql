@@ -0,0 +1,27 @@
+-- =========================================
+-- AUDIT EXPLORER INDEXES
+-- =========================================
+-- The Audit Explorer reads each *_audit table newest first with a keyset
+-- cursor: ORDER BY ChangeTimestamp DESC, AuditID DESC, continuing below the
+-- last row read. Filters by record use the (entity ID, ChangeTimestamp)
+-- indexes from 002_audit_partitioning.sql; unfiltered pages need an index
+-- on ChangeTimestamp (InnoDB appends the primary key, which gives the
+-- AuditID tiebreak).
+--
+-- Run after 002_audit_partitioning.sql:
+--   mysql -u root -p ecommerce_db < "Basic Operations/migrations/003_audit_time_indexes.sql"
+
+USE ecommerce_db;
+
+CREATE INDEX idx_customer_audit_time ON customer_audit (ChangeTimestamp);
+CREATE INDEX idx_card_audit_time ON card_audit (ChangeTimestamp);
+CREATE INDEX idx_product_audit_time ON product_audit (ChangeTimestamp);
+CREATE INDEX idx_orders_audit_time ON orders_audit (ChangeTimestamp);
+CREATE INDEX idx_payment_audit_time ON payment_audit (ChangeTimestamp);
+
+-- Rollback:
+-- DROP INDEX idx_customer_audit_time ON customer_audit;
+-- DROP INDEX idx_card_audit_time ON card_audit;
+-- DROP INDEX idx_product_audit_time ON product_audit;
+-- DROP INDEX idx_orders_audit_time ON orders_audit;
+-- DROP INDEX idx_payment_audit_time ON payment_audit;
@@ -0,0 +1,301 @@
+-- =========================================
+-- DASHBOARD ROLLUP TABLES
+-- =========================================
+-- Pre-aggregated data for the dashboard charts. The charts read these small
+-- tables instead of grouping the full order / customer history on every view.
+--
+-- Run after schema.sql, AuditTrailTables.sql and Trigers.sql:
+--   mysql -u root -p ecommerce_db < "Basic Operations/rollups.sql"
+--
+-- Rollups are refreshed incrementally by refresh_dashboard_rollups():
+--   * daily sales / registrations: re-aggregated from the last processed day
+--     (date high-water mark), so late rows for the current day are included.
+--     Daily sales also re-aggregate the days of orders inserted since the last
+--     processed OrderID, so orders entered with an earlier OrderDate are counted
+--   * order / payment status counts: updated from new rows in orders_audit /
+--     payment_audit since the last processed AuditID (ID high-water mark)
+--
+-- orderProduct has no audit trail: adding or editing order lines of an existing
+-- order dated before the last processed day is only picked up by
+-- CALL refresh_dashboard_rollups(TRUE) (app.refresh_rollups(full_rebuild=True)).
+-- The event at the bottom runs the refresh every minute (needs event_scheduler=ON).
+
+USE ecommerce_db;
+
+-- 1. Units sold and revenue per product per day
+CREATE TABLE daily_product_sales (
+    SalesDate  DATE NOT NULL,
+    ProductID  INT NOT NULL,
+    UnitsSold  INT NOT NULL DEFAULT 0,
+    Revenue    DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (SalesDate, ProductID),
+    KEY idx_daily_product_sales_product (ProductID)
+);
+
+-- 2. All-time totals per product (top-sellers chart)
+CREATE TABLE product_sales_totals (
+    ProductID  INT PRIMARY KEY,
+    UnitsSold  BIGINT NOT NULL DEFAULT 0,
+    Revenue    DECIMAL(16,2) NOT NULL DEFAULT 0,
+    KEY idx_product_sales_totals_units (UnitsSold)
+);
+
+-- 3. New customers per day
+CREATE TABLE daily_customer_registrations (
+    RegDate        DATE PRIMARY KEY,
+    CustomerCount  INT NOT NULL DEFAULT 0
+);
+
+-- 4. Current number of orders / payments per status
+CREATE TABLE status_counts (
+    EntityType   VARCHAR(20) NOT NULL CHECK(EntityType IN ('orders', 'payment')),
+    Status       VARCHAR(20) NOT NULL,
+    StatusCount  INT NOT NULL DEFAULT 0,
+    TotalAmount  DECIMAL(16,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (EntityType, Status)
+);
+
+-- 5. High-water marks of the incremental refresh
+CREATE TABLE rollup_watermark (
+    RollupName   VARCHAR(50) PRIMARY KEY,
+    LastID       BIGINT,
+    LastDate     DATE,
+    LastRefresh  DATETIME
+);
+
+DELIMITER $$
+
+-- =========================
+-- REFRESH PROCEDURE
+-- =========================
+-- CALL refresh_dashboard_rollups(FALSE);  -- incremental
+-- CALL refresh_dashboard_rollups(TRUE);   -- rebuild everything from the base tables
+CREATE PROCEDURE refresh_dashboard_rollups(IN p_full_rebuild BOOLEAN)
+BEGIN
+    DECLARE v_from_date DATE;
+    DECLARE v_from_id BIGINT;
+    DECLARE v_to_id BIGINT;
+
+    -- Days of daily_product_sales to re-aggregate besides those >= the date watermark
+    CREATE TEMPORARY TABLE IF NOT EXISTS tmp_rollup_sales_days (SalesDate DATE PRIMARY KEY);
+    DELETE FROM tmp_rollup_sales_days;
+
+    IF p_full_rebuild THEN
+        DELETE FROM daily_product_sales;
+        DELETE FROM product_sales_totals;
+        DELETE FROM daily_customer_registrations;
+        DELETE FROM status_counts;
+        DELETE FROM rollup_watermark;
+    END IF;
+
+    -- ---------- Product sales per day ----------
+    -- LastDate: the latest day may still receive orders, so the next run starts there.
+    -- LastID: the highest OrderID processed. OrderID is insert-ordered while OrderDate
+    -- is a business date, so newer orders dated before LastDate mark their day dirty.
+    SET v_from_date = NULL;
+    SET v_from_id = NULL;
+    SELECT LastDate, LastID INTO v_from_date, v_from_id
+    FROM rollup_watermark WHERE RollupName = 'daily_product_sales';
+    SET v_from_date = COALESCE(v_from_date, '1000-01-01');
+    SET v_from_id = COALESCE(v_from_id, 0);
+    SELECT COALESCE(MAX(OrderID), v_from_id) INTO v_to_id FROM orders;
+
+    INSERT IGNORE INTO tmp_rollup_sales_days (SalesDate)
+    SELECT DISTINCT DATE(OrderDate)
+    FROM orders
+    WHERE OrderID > v_from_id AND OrderID <= v_to_id AND OrderDate < v_from_date;
+
+    -- Take the days being re-aggregated out of the all-time totals ...
+    UPDATE product_sales_totals t
+    JOIN (
+        SELECT ProductID, SUM(UnitsSold) AS UnitsSold, SUM(Revenue) AS Revenue
+        FROM daily_product_sales
+        WHERE SalesDate >= v_from_date
+        OR SalesDate IN (SELECT SalesDate FROM tmp_rollup_sales_days)
+        GROUP BY ProductID
+    ) w ON w.ProductID = t.ProductID
+    SET t.UnitsSold = t.UnitsSold - w.UnitsSold,
+        t.Revenue = t.Revenue - w.Revenue;
+
+    DELETE FROM daily_product_sales
+    WHERE SalesDate >= v_from_date
+    OR SalesDate IN (SELECT SalesDate FROM tmp_rollup_sales_days);
+
+    INSERT INTO daily_product_sales (SalesDate, ProductID, UnitsSold, Revenue)
+    SELECT DATE(o.OrderDate), op.ProductID, SUM(op.Quantity), SUM(op.Quantity * COALESCE(op.PriceAtPurchase, 0))
+    FROM orders o
+    JOIN orderProduct op ON op.OrderID = o.OrderID
+    WHERE o.OrderDate >= v_from_date
+    OR DATE(o.OrderDate) IN (SELECT SalesDate FROM tmp_rollup_sales_days)
+    GROUP BY DATE(o.OrderDate), op.ProductID;
+
+    -- ... and add them back with the fresh numbers
+    INSERT INTO product_sales_totals (ProductID, UnitsSold, Revenue)
+    SELECT ProductID, SUM(UnitsSold), SUM(Revenue)
+    FROM daily_product_sales
+    WHERE SalesDate >= v_from_date
+    OR SalesDate IN (SELECT SalesDate FROM tmp_rollup_sales_days)
+    GROUP BY ProductID
+    ON DUPLICATE KEY UPDATE UnitsSold = UnitsSold + VALUES(UnitsSold),
+                            Revenue = Revenue + VALUES(Revenue);
+
+    INSERT INTO rollup_watermark (RollupName, LastID, LastDate, LastRefresh)
+    SELECT 'daily_product_sales', v_to_id, COALESCE(DATE(MAX(OrderDate)), v_from_date), NOW() FROM orders
+    ON DUPLICATE KEY UPDATE LastID = VALUES(LastID), LastDate = VALUES(LastDate), LastRefresh = VALUES(LastRefresh);
+
+    -- ---------- Customer registrations per day ----------
+    SET v_from_date = NULL;
+    SELECT LastDate INTO v_from_date FROM rollup_watermark WHERE RollupName = 'daily_customer_registrations';
+    SET v_from_date = COALESCE(v_from_date, '1000-01-01');
+
+    DELETE FROM daily_customer_registrations WHERE RegDate >= v_from_date;
+
+    INSERT INTO daily_customer_registrations (RegDate, CustomerCount)
+    SELECT DATE(RegistrationDate), COUNT(*)
+    FROM customer
+    WHERE RegistrationDate >= v_from_date
+    GROUP BY DATE(RegistrationDate);
+
+    INSERT INTO rollup_watermark (RollupName, LastDate, LastRefresh)
+    SELECT 'daily_customer_registrations', COALESCE(DATE(MAX(RegistrationDate)), v_from_date), NOW() FROM customer
+    ON DUPLICATE KEY UPDATE LastDate = VALUES(LastDate), LastRefresh = VALUES(LastRefresh);
+
+    -- ---------- Order status counts (from orders_audit) ----------
+    -- Only audit rows older than a few seconds are applied, so rows from
+    -- transactions that are still committing are not skipped past.
+    SET v_from_id = NULL;
+    SET v_to_id = NULL;
+    SELECT LastID INTO v_from_id FROM rollup_watermark WHERE RollupName = 'orders_status';
+    SELECT AuditID INTO v_to_id FROM orders_audit
+    WHERE ChangeTimestamp < NOW() - INTERVAL 10 SECOND
+    ORDER BY AuditID DESC LIMIT 1;
+    SET v_to_id = COALESCE(v_to_id, 0);
+
+    IF v_from_id IS NULL THEN
+        -- First run: seed from the orders table itself, as of v_to_id. Audit rows
+        -- after v_to_id are replayed by the next run, so their effect is backed
+        -- out here; one statement reads both tables from the same snapshot.
+        INSERT INTO status_counts (EntityType, Status, StatusCount, TotalAmount)
+        SELECT 'orders', s.Status, SUM(s.CountDelta), SUM(s.AmountDelta)
+        FROM (
+            SELECT OrderStatus AS Status, 1 AS CountDelta, COALESCE(TotalAmount, 0) AS AmountDelta
+            FROM orders
+            WHERE OrderStatus IS NOT NULL
+            UNION ALL
+            SELECT NewOrderStatus, -1, -COALESCE(NewTotalAmount, 0)
+            FROM orders_audit
+            WHERE AuditID > v_to_id
+            AND ActionType IN ('INSERT', 'UPDATE') AND NewOrderStatus IS NOT NULL
+            UNION ALL
+            SELECT OldOrderStatus, 1, COALESCE(OldTotalAmount, 0)
+            FROM orders_audit
+            WHERE AuditID > v_to_id
+            AND ActionType IN ('UPDATE', 'DELETE') AND OldOrderStatus IS NOT NULL
+        ) s
+        GROUP BY s.Status;
+    ELSEIF v_to_id > v_from_id THEN
+        INSERT INTO status_counts (EntityType, Status, StatusCount, TotalAmount)
+        SELECT 'orders', d.Status, SUM(d.CountDelta), SUM(d.AmountDelta)
+        FROM (
+            SELECT NewOrderStatus AS Status, 1 AS CountDelta, COALESCE(NewTotalAmount, 0) AS AmountDelta
+            FROM orders_audit
+            WHERE AuditID > v_from_id AND AuditID <= v_to_id
+            AND ActionType IN ('INSERT', 'UPDATE') AND NewOrderStatus IS NOT NULL
+            UNION ALL
+            SELECT OldOrderStatus, -1, -COALESCE(OldTotalAmount, 0)
+            FROM orders_audit
+            WHERE AuditID > v_from_id AND AuditID <= v_to_id
+            AND ActionType IN ('UPDATE', 'DELETE') AND OldOrderStatus IS NOT NULL
+        ) d
+        GROUP BY d.Status
+        ON DUPLICATE KEY UPDATE StatusCount = StatusCount + VALUES(StatusCount),
+                                TotalAmount = TotalAmount + VALUES(TotalAmount);
+    END IF;
+
+    INSERT INTO rollup_watermark (RollupName, LastID, LastRefresh)
+    VALUES ('orders_status', GREATEST(v_to_id, COALESCE(v_from_id, 0)), NOW())
+    ON DUPLICATE KEY UPDATE LastID = VALUES(LastID), LastRefresh = VALUES(LastRefresh);
+
+    -- ---------- Payment status counts (from payment_audit) ----------
+    SET v_from_id = NULL;
+    SET v_to_id = NULL;
+    SELECT LastID INTO v_from_id FROM rollup_watermark WHERE RollupName = 'payment_status';
+    SELECT AuditID INTO v_to_id FROM payment_audit
+    WHERE ChangeTimestamp < NOW() - INTERVAL 10 SECOND
+    ORDER BY AuditID DESC LIMIT 1;
+    SET v_to_id = COALESCE(v_to_id, 0);
+
+    IF v_from_id IS NULL THEN
+        -- First run: seed as of v_to_id, like the order counts above
+        INSERT INTO status_counts (EntityType, Status, StatusCount, TotalAmount)
+        SELECT 'payment', s.Status, SUM(s.CountDelta), SUM(s.AmountDelta)
+        FROM (
+            SELECT PaymentStatus AS Status, 1 AS CountDelta, COALESCE(Amount, 0) AS AmountDelta
+            FROM payment
+            WHERE PaymentStatus IS NOT NULL
+            UNION ALL
+            SELECT NewPaymentStatus, -1, -COALESCE(NewAmount, 0)
+            FROM payment_audit
+            WHERE AuditID > v_to_id
+            AND ActionType IN ('INSERT', 'UPDATE') AND NewPaymentStatus IS NOT NULL
+            UNION ALL
+            SELECT OldPaymentStatus, 1, COALESCE(OldAmount, 0)
+            FROM payment_audit
+            WHERE AuditID > v_to_id
+            AND ActionType IN ('UPDATE', 'DELETE') AND OldPaymentStatus IS NOT NULL
+        ) s
+        GROUP BY s.Status;
+    ELSEIF v_to_id > v_from_id THEN
+        INSERT INTO status_counts (EntityType, Status, StatusCount, TotalAmount)
+        SELECT 'payment', d.Status, SUM(d.CountDelta), SUM(d.AmountDelta)
+        FROM (
+            SELECT NewPaymentStatus AS Status, 1 AS CountDelta, COALESCE(NewAmount, 0) AS AmountDelta
+            FROM payment_audit
+            WHERE AuditID > v_from_id AND AuditID <= v_to_id
+            AND ActionType IN ('INSERT', 'UPDATE') AND NewPaymentStatus IS NOT NULL
+            UNION ALL
+            SELECT OldPaymentStatus, -1, -COALESCE(OldAmount, 0)
+            FROM payment_audit
+            WHERE AuditID > v_from_id AND AuditID <= v_to_id
+            AND ActionType IN ('UPDATE', 'DELETE') AND OldPaymentStatus IS NOT NULL
+        ) d
+        GROUP BY d.Status
+        ON DUPLICATE KEY UPDATE StatusCount = StatusCount + VALUES(StatusCount),
+                                TotalAmount = TotalAmount + VALUES(TotalAmount);
+    END IF;
+
+    INSERT INTO rollup_watermark (RollupName, LastID, LastRefresh)
+    VALUES ('payment_status', GREATEST(v_to_id, COALESCE(v_from_id, 0)), NOW())
+    ON DUPLICATE KEY UPDATE LastID = VALUES(LastID), LastRefresh = VALUES(LastRefresh);
+END$$
+
+DELIMITER ;
+
+-- Build the rollups once, then keep them fresh every minute
+CALL refresh_dashboard_rollups(TRUE);
+
+CREATE EVENT IF NOT EXISTS refresh_dashboard_rollups_event
+ON SCHEDULE EVERY 1 MINUTE
+DO CALL refresh_dashboard_rollups(FALSE);
+
+-- =========================
+-- GRANTS (read-only, matching each role's chart permissions)
+-- =========================
+GRANT SELECT ON ecommerce_db.daily_product_sales TO 'sales_manager'@'localhost';
+GRANT SELECT ON ecommerce_db.product_sales_totals TO 'sales_manager'@'localhost';
+GRANT SELECT ON ecommerce_db.daily_customer_registrations TO 'sales_manager'@'localhost';
+GRANT SELECT ON ecommerce_db.status_counts TO 'sales_manager'@'localhost';
+
+GRANT SELECT ON ecommerce_db.status_counts TO 'customer_service'@'localhost';
+
+GRANT SELECT ON ecommerce_db.daily_product_sales TO 'warehouse_staff'@'localhost';
+GRANT SELECT ON ecommerce_db.product_sales_totals TO 'warehouse_staff'@'localhost';
+
+GRANT SELECT ON ecommerce_db.daily_product_sales TO 'marketing_team'@'localhost';
+GRANT SELECT ON ecommerce_db.product_sales_totals TO 'marketing_team'@'localhost';
+GRANT SELECT ON ecommerce_db.daily_customer_registrations TO 'marketing_team'@'localhost';
+GRANT SELECT ON ecommerce_db.status_counts TO 'marketing_team'@'localhost';
+
+GRANT SELECT ON ecommerce_db.status_counts TO 'delivery_coordinator'@'localhost';
+
+FLUSH PRIVILEGES;
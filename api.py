@@ -0,0 +1,369 @@
+"""
+Headless read API for the dashboard database
+
+    uvicorn api:api --host 0.0.0.0 --port 8600
+    python api.py --port 8600
+
+Serves the tables, views and charts each MySQL account may see in the
+dashboard, as JSON or Arrow IPC streams, for scripts and other dashboards:
+
+    GET /tables                          tables and views the account may read
+    GET /tables/{name}                   one keyset page (?page_size, ?after / ?before, ?offset for views)
+                                         filtered with ?filter=Column:operator:value and ?q=<search all columns>
+    GET /charts                          chart keys the account may view
+    GET /charts/{key}                    a chart's pre-aggregated series (order_amount: ?start, ?end, ?granularity)
+
+Requests authenticate with HTTP Basic using the same MySQL accounts as the
+dashboard login; ROLE_PERMISSIONS decides what each one may read. Add
+?format=arrow (or Accept: application/vnd.apache.arrow.stream) for Arrow.
+
+Every response carries an ETag. For tables whose writes are audited by
+triggers (customer, card, product, orders, payment) the ETag is derived from
+the audit tables' AuditID high-water marks, so a poll with If-None-Match is
+answered 304 without running the query. Charts that depend on the date
+(DATE_DEPENDENT_CHARTS) also include the database's CURDATE(). Other
+responses are hashed.
+
+Needs starlette and uvicorn (pip install starlette uvicorn), plus the async
+driver used by async_db.py.
+"""
+
+import argparse
+import base64
+import binascii
+import decimal
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+import pandas as pd
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import app
+import async_db
+
+# Largest ?page_size a client may ask for
+API_MAX_PAGE_SIZE = int(os.getenv('DASHBOARD_API_MAX_PAGE_SIZE', 1000))
+# Seconds a verified Basic credential is trusted before it is checked against MySQL again
+API_AUTH_TTL = int(os.getenv('DASHBOARD_API_AUTH_TTL', 300))
+
+ARROW_STREAM_TYPE = 'application/vnd.apache.arrow.stream'
+
+# Base table -> audit table its triggers append to on every INSERT/UPDATE/DELETE
+AUDITED_TABLES = {audit_table[:-len('_audit')]: audit_table for audit_table in app.AUDIT_TABLES}
+
+# Charts whose SQL reads CURDATE(): their results change at midnight without any write
+DATE_DEPENDENT_CHARTS = {'customer_age'}
+
+# =====================================================
+# AUTHENTICATION
+# =====================================================
+
+# (user, credential fingerprint) -> time verified
+_verified = {}
+
+async def authenticate(request):
+    """(role, async engine) for the request's Basic credentials; raises 401/403"""
+    header = request.headers.get('authorization', '')
+    scheme, _, encoded = header.partition(' ')
+    try:
+        username, _, password = base64.b64decode(encoded).decode('utf-8').partition(':')
+    except (binascii.Error, UnicodeDecodeError):
+        username = password = ''
+    if scheme.lower() != 'basic' or not username:
+        raise HTTPException(401, headers={'WWW-Authenticate': 'Basic realm="dashboard"'})
+
+    key = (username, app.EngineRegistry.fingerprint(username, password))
+    verified = _verified.get(key)
+    if verified is None or time.monotonic() - verified > API_AUTH_TTL:
+        if not await async_db.authenticate_user(username, password):
+            _verified.pop(key, None)
+            raise HTTPException(401, headers={'WWW-Authenticate': 'Basic realm="dashboard"'})
+        _verified[key] = time.monotonic()
+
+    role = app.get_user_role(username)
+    if role is None:
+        raise HTTPException(403, "This account has no dashboard role")
+    return role, async_db.get_async_engine(username, password)
+
+def table_allowed(role, table_name):
+    """can_access_table, ignoring case (MySQL reports view names as created)"""
+    allowed = app.ROLE_PERMISSIONS[role]['tables']
+    return allowed == 'all' or table_name.lower() in {t.lower() for t in allowed}
+
+# =====================================================
+# ETAGS
+# =====================================================
+
+async def audit_watermarks(tables, with_date=False):
+    """{table: MAX(AuditID) of its audit table}, or None if a table isn't audited or can't be read
+
+    Read with the MYSQL_USER service account, since most roles may not SELECT
+    the audit tables. With `with_date` the database's CURDATE() is read in the
+    same query and included under 'CURDATE()'.
+    """
+    tables = sorted({t.lower() for t in tables})
+    if not tables or any(t not in AUDITED_TABLES for t in tables):
+        return None
+    keys = list(tables)
+    selects = [f"(SELECT MAX(AuditID) FROM {AUDITED_TABLES[t]})" for t in tables]
+    if with_date:
+        keys.append('CURDATE()')
+        selects.append("CURDATE()")
+    try:
+        async with async_db.get_async_engine().connect() as conn:
+            row = (await conn.execute(text(f"SELECT {', '.join(selects)}"))).one()
+    except Exception:
+        return None
+    return dict(zip(keys, row))
+
+def make_etag(*parts):
+    digest = hashlib.sha256(json.dumps(parts, default=str, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+    return f'"{digest}"'
+
+def etag_matches(request, etag):
+    """True if If-None-Match lists this ETag (or *)"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix('W/') for c in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+def request_identity(request, role):
+    """What the response depends on besides the data: path, query string, role and format"""
+    return [request.url.path, sorted(request.query_params.multi_items()), role, wants_arrow(request)]
+
+# =====================================================
+# RESPONSES
+# =====================================================
+
+def wants_arrow(request):
+    return (request.query_params.get('format') == 'arrow' or
+            ARROW_STREAM_TYPE in request.headers.get('accept', ''))
+
+def json_value(value):
+    """json.dumps default: Decimal -> float, dates -> ISO 8601"""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def dataframe_records(df):
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+def arrow_stream(df, table_name=None, catalog=None):
+    """Arrow IPC stream bytes, typed from the schema catalog for table reads"""
+    import pyarrow as pa
+
+    if table_name is not None:
+        schema = app.arrow_schema_for(table_name, list(df.columns), catalog)
+        table = pa.Table.from_arrays(
+            [app.to_arrow_array(df[field.name].astype(object).where(df[field.name].notna(), None).tolist(),
+                                field.type) for field in schema],
+            schema=schema)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def data_response(request, df, etag, meta, table_name=None, catalog=None):
+    """JSON body (rows + meta) or an Arrow stream (meta in X- headers), with ETag"""
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if wants_arrow(request):
+        try:
+            body = arrow_stream(df, table_name, catalog)
+        except ImportError:
+            raise HTTPException(406, "Arrow output needs pyarrow on the server")
+        for name, value in meta.items():
+            headers['X-' + name.replace('_', '-').title()] = json.dumps(value, default=json_value)
+        return Response(body, media_type=ARROW_STREAM_TYPE, headers=headers)
+
+    body = json.dumps({**meta, 'rows': dataframe_records(df)}, default=json_value)
+    return Response(body, media_type='application/json', headers=headers)
+
+def not_modified(etag):
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+# =====================================================
+# TABLES
+# =====================================================
+
+def parse_filters(request):
+    """?filter=Column:operator:value (repeatable) and ?q=term -> build_filter_clause predicates
+
+    `range` takes low..high and `in` takes values separated by |.
+    """
+    predicates = []
+    for raw in request.query_params.getlist('filter'):
+        column, operator, value = (raw.split(':', 2) + ['', ''])[:3]
+        if operator == 'range':
+            low, _, high = value.partition('..')
+            value = (low, high)
+        elif operator == 'in':
+            value = value.split('|')
+        predicates.append((column, operator, value))
+    if request.query_params.get('q'):
+        predicates.append((None, 'like', request.query_params['q']))
+    return predicates
+
+def parse_cursor(raw, key_columns, catalog, table_name):
+    """JSON array from ?after / ?before -> key values typed like the key columns"""
+    try:
+        values = json.loads(raw)
+    except json.JSONDecodeError:
+        values = None
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise HTTPException(400, f"Cursor must be a JSON array of {', '.join(key_columns)}")
+    try:
+        return tuple(app.coerce_filter_value(catalog.get_column(table_name, column), value)
+                     for column, value in zip(key_columns, values))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+def int_param(request, name, default, low, high):
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise HTTPException(400, f"{name} must be an integer")
+    return max(low, min(value, high))
+
+async def list_tables(request):
+    role, engine = await authenticate(request)
+    tables = await async_db.get_all_tables(include_audit=role == 'admin_user', engine=engine)
+    return JSONResponse({'tables': [t for t in tables if table_allowed(role, t)]})
+
+async def read_table(request):
+    role, engine = await authenticate(request)
+    catalog = await async_db.get_schema_catalog(engine)
+    table_name = catalog.resolve(request.path_params['name'])
+    if table_name is None or not table_allowed(role, table_name):
+        raise HTTPException(404, f"No table or view '{request.path_params['name']}' for this account")
+
+    # Audited tables: answer a matching poll before touching the table itself
+    watermarks = await audit_watermarks([table_name])
+    etag = make_etag(request_identity(request, role), watermarks) if watermarks is not None else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+
+    page_size = int_param(request, 'page_size', app.DEFAULT_PAGE_SIZE, 1, API_MAX_PAGE_SIZE)
+    key_columns = catalog.get_primary_key(table_name)
+    after = before = None
+    if key_columns and request.query_params.get('after'):
+        after = parse_cursor(request.query_params['after'], key_columns, catalog, table_name)
+    elif key_columns and request.query_params.get('before'):
+        before = parse_cursor(request.query_params['before'], key_columns, catalog, table_name)
+    offset = int_param(request, 'offset', 0, 0, 2 ** 31) if not key_columns else 0
+    try:
+        where, params = app.build_filter_clause(table_name, parse_filters(request), catalog=catalog)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    df, has_more = await async_db.fetch_table_page(table_name, page_size, after, before, offset, where, params,
+                                                   engine=engine)
+    meta = {'table': table_name, 'has_more': has_more}
+    if key_columns and not df.empty:
+        meta['next_after'] = [app.to_python_value(v) for v in df.iloc[-1][key_columns]]
+        meta['prev_before'] = [app.to_python_value(v) for v in df.iloc[0][key_columns]]
+    elif not key_columns:
+        meta['next_offset'] = offset + len(df)
+
+    if etag is None:
+        etag = make_etag(request_identity(request, role), pd.util.hash_pandas_object(df.astype(str)).sum())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    return data_response(request, df, etag, meta, table_name, catalog)
+
+# =====================================================
+# CHARTS
+# =====================================================
+
+async def chart_tables(viz_key, engine):
+    """Tables the chart's query will read (its rollup tables when those are used)"""
+    if viz_key not in async_db.VIZ_LOADERS and await async_db.rollups_available(viz_key, engine):
+        return app.referenced_tables(app.ROLLUP_QUERIES[viz_key])
+    return app.referenced_tables(app.VIZ_QUERIES[viz_key])
+
+def chart_params(request, viz_key):
+    """?start / ?end / ?granularity for the order time series"""
+    if viz_key != 'order_amount':
+        return None
+    params = {}
+    try:
+        for name in ('start', 'end'):
+            if request.query_params.get(name):
+                params[name] = pd.Timestamp(request.query_params[name])
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if len(params) == 1:
+        raise HTTPException(400, "Give both start and end")
+    granularity = request.query_params.get('granularity')
+    if granularity:
+        if granularity not in app.TIME_BUCKET_SPANS:
+            raise HTTPException(400, f"granularity must be one of {', '.join(app.TIME_BUCKET_SPANS)}")
+        params['granularity'] = granularity
+    return params
+
+async def list_charts(request):
+    role, _ = await authenticate(request)
+    return JSONResponse({'charts': [{'key': key, 'title': title} for key, title in app.VIZ_TITLES.items()
+                                    if app.can_view_visualization(role, key)]})
+
+async def read_chart(request):
+    role, engine = await authenticate(request)
+    viz_key = request.path_params['key']
+    if viz_key not in app.VIZ_QUERIES or not app.can_view_visualization(role, viz_key):
+        raise HTTPException(404, f"No chart '{viz_key}' for this account")
+    params = chart_params(request, viz_key)
+
+    watermarks = await audit_watermarks(await chart_tables(viz_key, engine),
+                                        with_date=viz_key in DATE_DEPENDENT_CHARTS)
+    etag = make_etag(request_identity(request, role), watermarks) if watermarks is not None else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+
+    df = await async_db.load_viz_data(viz_key, params, engine=engine)
+    if etag is None:
+        etag = make_etag(request_identity(request, role), pd.util.hash_pandas_object(df.astype(str)).sum())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    return data_response(request, df, etag, {'chart': viz_key, 'title': app.VIZ_TITLES[viz_key]})
+
+async def health(request):
+    return JSONResponse({'status': 'ok'})
+
+@asynccontextmanager
+async def lifespan(application):
+    yield
+    await async_db.dispose_engines()
+
+api = Starlette(routes=[
+    Route('/health', health),
+    Route('/tables', list_tables),
+    Route('/tables/{name}', read_table),
+    Route('/charts', list_charts),
+    Route('/charts/{key}', read_chart)
+], lifespan=lifespan)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=os.getenv('DASHBOARD_API_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('DASHBOARD_API_PORT', 8600)))
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(api, host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
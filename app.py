@@ -7,10 +7,27 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime, date
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, text, inspect, event
+from sqlalchemy.pool import QueuePool
 import re
 import os
+import io
+import sys
+import json
+import time
+import hashlib
+import heapq
+import itertools
+import threading
+import contextlib
+import contextvars
+import tempfile
+import cProfile
+import pstats
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -108,28 +125,1006 @@ MYSQL_CONFIG = {
     'database': os.getenv('MYSQL_DATABASE', 'ecommerce_db')
 }
 
-def get_engine(username=None, password=None):
-    """Create SQLAlchemy engine - uses role-based credentials if provided"""
-    from urllib.parse import quote_plus
+# Full SQLAlchemy URL for the service engine - get_engine() outside a login (benchmarks, maintenance,
+# local stand-ins). Logins always connect with their own credentials through MYSQL_CONFIG.
+DATABASE_URL_OVERRIDE = os.getenv('DASHBOARD_DATABASE_URL', '')
+
+# Connection pool settings - shared by every engine in the registry
+POOL_CONFIG = {
+    'pool_size': int(os.getenv('MYSQL_POOL_SIZE', 5)),
+    'max_overflow': int(os.getenv('MYSQL_MAX_OVERFLOW', 10)),
+    'pool_timeout': int(os.getenv('MYSQL_POOL_TIMEOUT', 30)),
+    'pool_recycle': int(os.getenv('MYSQL_POOL_RECYCLE', 1800)),
+    'pool_pre_ping': os.getenv('MYSQL_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    'idle_timeout': int(os.getenv('MYSQL_POOL_IDLE_TIMEOUT', 600))
+}
+
+# Route fetch_table_data / execute_sql through async_db's sync facade (needs asyncmy and greenlet)
+ASYNC_DB_ENABLED = os.getenv('DASHBOARD_ASYNC_DB', 'false').lower() in ('1', 'true', 'yes')
+
+class PoolStats:
+    """Counters for one connection pool, updated from pool events"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.peak_overflow = 0
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how often (and how long) a checkout had to wait"""
+
+    stats = None
+
+    def _do_get(self):
+        # A checkout waits when nothing is idle and the overflow is used up
+        must_wait = (self.checkedin() == 0 and
+                     self._max_overflow > -1 and
+                     self.overflow() >= self._max_overflow)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if must_wait and self.stats is not None:
+                with self.stats.lock:
+                    self.stats.waits += 1
+                    self.stats.wait_time += time.perf_counter() - start
+
+    def recreate(self):
+        # dispose() rebuilds the pool - keep the same counters on the new one
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class EngineRegistry:
+    """Process-wide cache of pooled engines keyed by (user, credential fingerprint)
+
+    Every Streamlit session logged in with the same credentials shares one
+    engine, so reruns reuse warm connections instead of opening new ones.
+    Engines that have not been used for `idle_timeout` seconds and have no
+    checked-out connections are disposed on the next lookup.
+    """
+
+    def __init__(self, pool_config):
+        self.pool_config = dict(pool_config)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(user, password, url=None):
+        """Short hash identifying a credential set without storing the password"""
+        target = [url] if url else [MYSQL_CONFIG['host'], str(MYSQL_CONFIG['port']), MYSQL_CONFIG['database']]
+        raw = "\0".join([user, password] + target)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+    def get(self, user, password, url=None):
+        """Return the pooled engine for these credentials, creating it on first use
+
+        `url` connects to that database instead of MYSQL_CONFIG - only for the
+        service engine and benchmarks; it is never used for a login.
+        """
+        key = (user, self.fingerprint(user, password, url))
+        now = time.monotonic()
+
+        with self._lock:
+            self._dispose_idle(now, keep=key)
+            entry = self._entries.get(key)
+            if entry is None:
+                stats = PoolStats()
+                entry = {
+                    'engine': self._create_engine(user, password, stats, url),
+                    'stats': stats,
+                    'created': now,
+                    'last_used': now
+                }
+                self._entries[key] = entry
+            entry['last_used'] = now
+            return entry['engine']
+
+    def discard(self, user, password, url=None):
+        """Dispose the engine for these credentials (e.g. after a failed login)"""
+        key = (user, self.fingerprint(user, password, url))
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry:
+            entry['engine'].dispose()
+
+    def dispose_all(self):
+        """Dispose every pooled engine"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry['engine'].dispose()
+
+    def stats(self):
+        """Snapshot of pool usage for every registered engine"""
+        now = time.monotonic()
+        rows = []
+        with self._lock:
+            items = list(self._entries.items())
+
+        for (user, fingerprint), entry in items:
+            pool = entry['engine'].pool
+            stats = entry['stats']
+            with stats.lock:
+                rows.append({
+                    'user': user,
+                    'fingerprint': fingerprint,
+                    'pool_size': pool.size(),
+                    'checked_out': pool.checkedout(),
+                    'idle_in_pool': pool.checkedin(),
+                    'overflow': max(pool.overflow(), 0),
+                    'peak_overflow': stats.peak_overflow,
+                    'checkouts': stats.checkouts,
+                    'connects': stats.connects,
+                    'invalidations': stats.invalidations,
+                    'waits': stats.waits,
+                    'avg_wait_ms': round(stats.wait_time / stats.waits * 1000, 2) if stats.waits else 0.0,
+                    'idle_seconds': int(now - entry['last_used'])
+                })
+        return rows
+
+    def _dispose_idle(self, now, keep=None):
+        idle_timeout = self.pool_config['idle_timeout']
+        if idle_timeout <= 0:
+            return
+        for key in list(self._entries.keys()):
+            entry = self._entries[key]
+            if key == keep or now - entry['last_used'] < idle_timeout:
+                continue
+            if entry['engine'].pool.checkedout() == 0:
+                entry['engine'].dispose()
+                del self._entries[key]
+
+    def _create_engine(self, user, password, stats, url=None):
+        from urllib.parse import quote_plus
+
+        connection_string = url or (
+            f"mysql+pymysql://{user}:{quote_plus(password)}"
+            f"@{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}"
+        )
+        engine = create_engine(
+            connection_string,
+            poolclass=InstrumentedQueuePool,
+            pool_size=self.pool_config['pool_size'],
+            max_overflow=self.pool_config['max_overflow'],
+            pool_timeout=self.pool_config['pool_timeout'],
+            pool_recycle=self.pool_config['pool_recycle'],
+            pool_pre_ping=self.pool_config['pool_pre_ping']
+        )
+        engine.pool.stats = stats
+        instrument_engine(engine, get_user_role(user) or user)
+
+        @event.listens_for(engine, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            with stats.lock:
+                stats.connects += 1
+
+        @event.listens_for(engine, 'checkout')
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with stats.lock:
+                stats.checkouts += 1
+                stats.peak_overflow = max(stats.peak_overflow, engine.pool.overflow())
+            sink = CHECKOUT_SINK.get()
+            if sink is not None:
+                sink.add(dbapi_connection)
+
+        @event.listens_for(engine, 'checkin')
+        def on_checkin(dbapi_connection, connection_record):
+            with stats.lock:
+                stats.checkins += 1
+            sink = CHECKOUT_SINK.get()
+            if sink is not None:
+                sink.discard(dbapi_connection)
+
+        @event.listens_for(engine, 'invalidate')
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with stats.lock:
+                stats.invalidations += 1
+
+        return engine
+
+@st.cache_resource(show_spinner=False)
+def get_engine_registry():
+    """Engine registry shared by all sessions of this Streamlit server"""
+    return EngineRegistry(POOL_CONFIG)
+
+# Engine bound to the current thread/context - worker threads have no session_state
+BOUND_ENGINE = contextvars.ContextVar('bound_engine', default=None)
+
+@contextlib.contextmanager
+def bind_engine(engine):
+    """Make get_engine() return `engine` inside this block (worker threads, load tests)"""
+    token = BOUND_ENGINE.set(engine)
+    try:
+        yield engine
+    finally:
+        BOUND_ENGINE.reset(token)
+
+# Set of DBAPI connections checked out in this context, so another thread can cancel their queries
+CHECKOUT_SINK = contextvars.ContextVar('checkout_sink', default=None)
+
+def cancel_query(engine, dbapi_connection):
+    """Abort the statement running on a checked-out connection (KILL QUERY on MySQL)"""
+    if engine.dialect.name == 'mysql':
+        # Runs on a different connection; an account may always kill its own threads
+        with engine.connect() as conn:
+            conn.execute(text(f"KILL QUERY {int(dbapi_connection.thread_id())}"))
+    elif hasattr(dbapi_connection, 'interrupt'):
+        dbapi_connection.interrupt()
+
+def get_async_db():
+    """(async_db module, async engine for this session's credentials) - see DASHBOARD_ASYNC_DB"""
+    # Under `streamlit run` this file is __main__ - let async_db's `import app` reuse it
+    sys.modules.setdefault('app', sys.modules[__name__])
+    import async_db
 
+    if 'username' in st.session_state and 'password' in st.session_state:
+        return async_db, async_db.get_async_engine(st.session_state.username, st.session_state.password)
+    return async_db, async_db.get_async_engine()
+
+def get_engine(username=None, password=None):
+    """Get pooled SQLAlchemy engine - uses role-based credentials if provided"""
+    if not (username and password) and BOUND_ENGINE.get() is not None:
+        return BOUND_ENGINE.get()
     if username and password:
         # Use role-based credentials
         user = username
-        pwd = quote_plus(password)
+        pwd = password
     else:
         # Use default admin credentials from session or config
         if 'username' in st.session_state and 'password' in st.session_state:
             user = st.session_state.username
-            pwd = quote_plus(st.session_state.password)
+            pwd = st.session_state.password
         else:
-            user = MYSQL_CONFIG['user']
-            pwd = quote_plus(MYSQL_CONFIG['password'])
+            # Service engine - the only one DASHBOARD_DATABASE_URL applies to
+            return get_engine_registry().get(MYSQL_CONFIG['user'], MYSQL_CONFIG['password'],
+                                             url=DATABASE_URL_OVERRIDE or None)
 
-    connection_string = (
-        f"mysql+pymysql://{user}:{pwd}"
-        f"@{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}"
-    )
-    return create_engine(connection_string)
+    return get_engine_registry().get(user, pwd)
+
+# =====================================================
+# QUERY INSTRUMENTATION
+# =====================================================
+
+# Most recent queries kept in memory for the Performance page
+QUERY_LOG_SIZE = int(os.getenv('DASHBOARD_QUERY_LOG_SIZE', 2000))
+# Optional JSON-lines file receiving every query slower than SLOW_QUERY_MS
+SLOW_QUERY_LOG = os.getenv('DASHBOARD_SLOW_QUERY_LOG', '')
+SLOW_QUERY_MS = float(os.getenv('DASHBOARD_SLOW_QUERY_MS', 500))
+
+# Helpers that run queries on behalf of others - the caller recorded is the function above them
+INSTRUMENTATION_PASSTHROUGH = {'cached_read_sql', 'load_viz_data', 'execute_sql', 'get', 'get_engine', 'read_frame',
+                               'read_sql_arrow'}
+
+PLACEHOLDER_PATTERN = re.compile(r"%\(\w+\)s|%s|\?|(?<![:\w]):\w+")
+LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.|'')*'|\b\d+(?:\.\d+)?\b")
+VALUE_LIST_PATTERN = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)|\((?:\s*\(\?(?:, \?)*\)\s*,)+\s*\(\?(?:, \?)*\)\s*\)")
+
+def fingerprint_sql(sql):
+    """Normalize a statement so executions differing only in values group together"""
+    normalized = PLACEHOLDER_PATTERN.sub('?', sql)
+    normalized = LITERAL_PATTERN.sub('?', normalized)
+    normalized = " ".join(normalized.split())
+    return VALUE_LIST_PATTERN.sub('(...)', normalized)
+
+def cursor_row_count(cursor):
+    """cursor.rowcount, or None when the driver does not know it
+
+    Unbuffered cursors (PyMySQL SSCursor, used by stream_results) report -1 as
+    an unsigned 64-bit value; sqlite3 reports -1 for SELECTs.
+    """
+    rowcount = getattr(cursor, 'rowcount', None)
+    if rowcount is None or rowcount < 0 or rowcount >= 2 ** 63:
+        return None
+    return rowcount
+
+def estimate_result_bytes(cursor, rows, sample=50):
+    """Rough size of a buffered result, extrapolated from its first `sample` rows (None if unknown)"""
+    if not rows:
+        return None if rows is None else 0
+    # PyMySQL's buffered Cursor keeps the rows in _rows; SSCursor and other drivers don't
+    try:
+        buffered = getattr(cursor, '_rows', None)
+    except Exception:
+        buffered = None
+    if not isinstance(buffered, (list, tuple)) or not buffered:
+        return None
+    head = buffered[:sample]
+    size = sum(len(v) if isinstance(v, (str, bytes)) else 8 for row in head for v in row)
+    return int(size / len(head) * rows)
+
+def find_query_caller():
+    """Name of the dashboard function that issued the current query"""
+    frame = sys._getframe(2)
+    this_file = __file__
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == this_file and code.co_name not in INSTRUMENTATION_PASSTHROUGH \
+                and not code.co_name.startswith(('_', 'on_')):
+            return code.co_name
+        frame = frame.f_back
+    return '?'
+
+class QueryLog:
+    """Ring buffer of recent query timings, plus the optional slow-query file"""
+
+    def __init__(self, size, slow_log_path='', slow_ms=SLOW_QUERY_MS):
+        self.entries = deque(maxlen=size)
+        self.slow_log_path = slow_log_path
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+
+    def record(self, entry):
+        with self._lock:
+            self.entries.append(entry)
+            if self.slow_log_path and entry['ms'] >= self.slow_ms:
+                with open(self.slow_log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({**entry, 'time': datetime.fromtimestamp(entry['time']).isoformat()}) + "\n")
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.entries)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def summary(self):
+        """Latency percentiles per fingerprint, slowest p95 first"""
+        df = pd.DataFrame(self.snapshot())
+        if df.empty:
+            return df
+        # None = unknown (unbuffered cursors) - left out of the averages and sums
+        df['rows'] = pd.to_numeric(df['rows'])
+        df['bytes'] = pd.to_numeric(df['bytes'])
+        grouped = df.groupby('fingerprint')
+        summary = pd.DataFrame({
+            'calls': grouped.size(),
+            'p50_ms': grouped['ms'].quantile(0.50),
+            'p95_ms': grouped['ms'].quantile(0.95),
+            'p99_ms': grouped['ms'].quantile(0.99),
+            'max_ms': grouped['ms'].max(),
+            'total_ms': grouped['ms'].sum(),
+            'avg_rows': grouped['rows'].mean(),
+            'total_bytes': grouped['bytes'].sum(),
+            'errors': grouped['error'].apply(lambda e: e.notna().sum()),
+            'callers': grouped['caller'].apply(lambda c: ", ".join(sorted(set(c)))),
+            'roles': grouped['role'].apply(lambda r: ", ".join(sorted(set(map(str, r)))))
+        })
+        return summary.round(2).sort_values('p95_ms', ascending=False).reset_index()
+
+@st.cache_resource(show_spinner=False)
+def get_query_log():
+    """Query timings shared by all sessions of this Streamlit server"""
+    return QueryLog(QUERY_LOG_SIZE, SLOW_QUERY_LOG, SLOW_QUERY_MS)
+
+def instrument_engine(engine, role):
+    """Time every statement the engine runs and record it in the query log"""
+    query_log = get_query_log()
+
+    def finish(conn, statement, rows, size, error=None):
+        started = conn.info.get('query_started')
+        if not started:
+            return
+        elapsed = (time.perf_counter() - started.pop()) * 1000
+        query_log.record({
+            'time': time.time(),
+            'fingerprint': fingerprint_sql(statement),
+            'ms': round(elapsed, 3),
+            'rows': rows,
+            'bytes': size,
+            'role': role,
+            'caller': find_query_caller(),
+            'error': error
+        })
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def on_before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def on_after_execute(conn, cursor, statement, parameters, context, executemany):
+        rows = cursor_row_count(cursor)
+        finish(conn, statement, rows, estimate_result_bytes(cursor, rows))
+
+    @event.listens_for(engine, 'handle_error')
+    def on_error(context):
+        if context.connection is not None and context.statement:
+            finish(context.connection, context.statement, 0, 0, str(context.original_exception)[:200])
+
+def render_performance_page():
+    """Admin page: latency percentiles per query fingerprint and the most recent queries"""
+    query_log = get_query_log()
+    entries = query_log.snapshot()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Queries recorded", f"{len(entries):,}")
+    if entries:
+        latencies = pd.Series([e['ms'] for e in entries])
+        col2.metric("p50", f"{latencies.quantile(0.50):.1f} ms")
+        col3.metric("p95", f"{latencies.quantile(0.95):.1f} ms")
+        col4.metric("p99", f"{latencies.quantile(0.99):.1f} ms")
+    st.caption(f"Last {QUERY_LOG_SIZE:,} queries across all sessions"
+               + (f" | slow-query log: `{SLOW_QUERY_LOG}` (≥ {SLOW_QUERY_MS:g} ms)" if SLOW_QUERY_LOG else ""))
+
+    if not entries:
+        st.info("No queries recorded yet")
+        return
+
+    st.subheader("⏱️ Latency by Query")
+    st.dataframe(query_log.summary(), use_container_width=True, hide_index=True)
+
+    st.subheader("🕒 Recent Queries")
+    recent = pd.DataFrame(entries[-200:][::-1])
+    recent['time'] = pd.to_datetime(recent['time'], unit='s')
+    st.dataframe(recent, use_container_width=True, hide_index=True)
+
+    if st.button("🧹 Clear query log", key="clear_query_log"):
+        query_log.clear()
+        st.rerun()
+
+# =====================================================
+# RERUN PROFILER
+# =====================================================
+
+# Profile every rerun for every user (admins can also switch it on for their own session)
+PROFILE_ENABLED = os.getenv('DASHBOARD_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+# Optional directory receiving one cProfile .prof file per profiled rerun
+PROFILE_DUMP_DIR = os.getenv('DASHBOARD_PROFILE_DIR', '')
+
+# Profiler of the rerun running in this script thread (None when profiling is off)
+ACTIVE_PROFILER = contextvars.ContextVar('active_profiler', default=None)
+
+class RerunProfiler:
+    """Wall-clock timings of the (nested) phases of one script rerun"""
+
+    def __init__(self, use_cprofile=False):
+        self.started = time.perf_counter()
+        self.phases = []
+        self._depth = 0
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+        if self.cprofile:
+            self.cprofile.enable()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        entry = {'phase': name, 'depth': self._depth, 'start_ms': (time.perf_counter() - self.started) * 1000}
+        self.phases.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry['ms'] = (time.perf_counter() - self.started) * 1000 - entry['start_ms']
+
+    def finish(self):
+        """Stop profiling; returns the phase table with self time (time not spent in child phases)"""
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        if self.cprofile:
+            self.cprofile.disable()
+        df = pd.DataFrame(self.phases, columns=['phase', 'depth', 'start_ms', 'ms'])
+        if df.empty:
+            return df
+        df['ms'] = df['ms'].fillna(self.total_ms - df['start_ms'])
+        # A phase's children are the next-depth phases before the next phase at its depth or above
+        child_ms = []
+        for i, row in enumerate(df.itertuples()):
+            later = df[(df.index > i) & (df['depth'] <= row.depth)]
+            end = later.index[0] if len(later) else len(df)
+            child_ms.append(df.loc[(df.index > i) & (df.index < end) & (df['depth'] == row.depth + 1), 'ms'].sum())
+        df['self_ms'] = df['ms'] - child_ms
+        return df.round(2)
+
+    def dump(self, directory):
+        """Write the cProfile stats of this rerun; returns the file path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"rerun-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.prof")
+        self.cprofile.dump_stats(path)
+        return path
+
+def profile_phase(name):
+    """Time a block as one phase of the current rerun; a no-op when profiling is off"""
+    profiler = ACTIVE_PROFILER.get()
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+def profiling_requested():
+    """Profiling is on via DASHBOARD_PROFILE, or an admin's sidebar toggle"""
+    return PROFILE_ENABLED or (st.session_state.get('role') == 'admin_user' and
+                               st.session_state.get('profile_reruns', False))
+
+def render_chart(fig):
+    """st.plotly_chart, timed as the 'chart render' phase"""
+    with profile_phase("chart render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+def render_rerun_profile(profiler):
+    """Waterfall of the rerun's phases (plus the top cProfile entries when dumping)"""
+    phases = profiler.finish()
+    with st.expander(f"⏱️ Rerun profile - {profiler.total_ms:.0f} ms", expanded=False):
+        if phases.empty:
+            st.caption("No phases recorded")
+            return
+        labels = [f"{'  ' * depth}{phase} #{i}" for i, (phase, depth)
+                  in enumerate(zip(phases['phase'], phases['depth']))]
+        fig = go.Figure(go.Bar(
+            y=labels, x=phases['ms'], base=phases['start_ms'], orientation='h',
+            marker_color=phases['depth'], customdata=phases[['ms', 'self_ms']],
+            hovertemplate='%{y}<br>%{customdata[0]:.1f} ms (self %{customdata[1]:.1f} ms)<extra></extra>'
+        ))
+        fig.update_layout(title='Rerun Waterfall', xaxis_title='ms since rerun start',
+                          yaxis=dict(autorange='reversed'), height=max(250, 28 * len(phases)))
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(phases, use_container_width=True, hide_index=True)
+
+        if profiler.cprofile and PROFILE_DUMP_DIR:
+            path = profiler.dump(PROFILE_DUMP_DIR)
+            out = io.StringIO()
+            pstats.Stats(profiler.cprofile, stream=out).sort_stats('cumulative').print_stats(15)
+            st.caption(f"cProfile stats written to `{path}`")
+            st.text(out.getvalue())
+
+# =====================================================
+# SCHEMA METADATA CATALOG
+# =====================================================
+
+# Seconds a loaded schema snapshot is served from memory
+METADATA_TTL = int(os.getenv('DASHBOARD_METADATA_TTL', 300))
+
+# Matches "`Gender` in (_utf8mb4'Male',_utf8mb4'Female')" as stored by MySQL
+CHECK_IN_PATTERN = re.compile(r"`?(\w+)`?\s+IN\s*\(([^)]*)\)", re.IGNORECASE)
+CHECK_VALUE_PATTERN = re.compile(r"'((?:[^']|'')*)'")
+
+def parse_check_in_domains(clause):
+    """Extract {column: [allowed values]} from a CHECK clause with IN lists"""
+    domains = {}
+    for column, values_str in CHECK_IN_PATTERN.findall(clause or ''):
+        values = [v.replace("''", "'") for v in CHECK_VALUE_PATTERN.findall(values_str)]
+        if values:
+            domains[column] = values
+    return domains
+
+class SchemaCatalog:
+    """In-memory snapshot of tables, views, columns, keys and CHECK IN domains"""
+
+    def __init__(self, objects, columns, primary_keys, foreign_keys, check_domains, indexes):
+        self.objects = objects              # name -> {'type', 'rows', 'auto_increment'}
+        self.columns = columns              # name -> [column dicts like inspector.get_columns()]
+        self.primary_keys = primary_keys    # name -> [pk column names]
+        self.foreign_keys = foreign_keys    # name -> [{'constrained_columns', 'referred_table', 'referred_columns'}]
+        self.check_domains = check_domains  # name -> {column: [allowed values]}
+        self.indexes = indexes              # name -> [{'name', 'columns', 'type', 'unique'}]
+        self.loaded_at = time.time()
+        self._names = {name.lower(): name for name in objects}
+
+    def resolve(self, name):
+        """Return the catalog spelling of a table name (MySQL names are case-insensitive)"""
+        return self._names.get(str(name).lower())
+
+    def table_names(self):
+        return sorted(n for n, o in self.objects.items() if o['type'] == 'table')
+
+    def view_names(self):
+        return sorted(n for n, o in self.objects.items() if o['type'] == 'view')
+
+    def get_columns(self, name):
+        return self.columns.get(self.resolve(name), [])
+
+    def get_primary_key(self, name):
+        return self.primary_keys.get(self.resolve(name), [])
+
+    def get_foreign_keys(self, name):
+        return self.foreign_keys.get(self.resolve(name), [])
+
+    def get_check_values(self, name, column_name):
+        domains = self.check_domains.get(self.resolve(name), {})
+        for column, values in domains.items():
+            if column.lower() == column_name.lower():
+                return values
+        return None
+
+    def get_indexes(self, name):
+        return self.indexes.get(self.resolve(name), [])
+
+    def get_column(self, name, column_name):
+        """Column dict by case-insensitive name, or None if it does not exist"""
+        for col in self.get_columns(name):
+            if col['name'].lower() == str(column_name).lower():
+                return col
+        return None
+
+    def has_leading_index(self, name, column_name):
+        """True if a B-tree index (or the PK) starts with this column"""
+        return any(
+            idx['type'] != 'FULLTEXT' and idx['columns'][0].lower() == column_name.lower()
+            for idx in self.get_indexes(name)
+        )
+
+    def find_fulltext_index(self, name, column_names):
+        """FULLTEXT index covering exactly these columns (MATCH needs an exact match)"""
+        wanted = sorted(c.lower() for c in column_names)
+        for idx in self.get_indexes(name):
+            if idx['type'] == 'FULLTEXT' and sorted(c.lower() for c in idx['columns']) == wanted:
+                return idx
+        return None
+
+def load_schema_catalog(engine):
+    """Load the whole schema in one pass (one query per information_schema table)"""
+    with engine.connect() as conn:
+        return read_schema_catalog(conn)
+
+def read_schema_catalog(conn):
+    """Schema catalog read over an open connection (also run by async_db via run_sync)"""
+    if conn.dialect.name != 'mysql':
+        return _load_schema_catalog_inspector(conn)
+
+    params = {'db_name': conn.engine.url.database or MYSQL_CONFIG['database']}
+    objects, columns, primary_keys, foreign_keys, check_domains, indexes = {}, {}, {}, {}, {}, {}
+
+    for row in conn.execute(text("""
+        SELECT TABLE_NAME, TABLE_TYPE, TABLE_ROWS, AUTO_INCREMENT
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = :db_name
+    """), params):
+        objects[row[0]] = {
+            'type': 'view' if row[1] == 'VIEW' else 'table',
+            'rows': row[2],
+            'auto_increment': row[3]
+        }
+
+    for row in conn.execute(text("""
+        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT, EXTRA
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = :db_name
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """), params):
+        columns.setdefault(row[0], []).append({
+            'name': row[1],
+            'type': row[2].upper(),
+            'nullable': row[3] == 'YES',
+            'default': row[4],
+            'autoincrement': 'auto_increment' in (row[5] or '').lower()
+        })
+
+    fk_by_name = {}
+    for row in conn.execute(text("""
+        SELECT TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME,
+               REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = :db_name
+        ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
+    """), params):
+        table_name, constraint_name, column_name, ref_table, ref_column = row
+        if constraint_name == 'PRIMARY':
+            primary_keys.setdefault(table_name, []).append(column_name)
+        elif ref_table:
+            fk = fk_by_name.get((table_name, constraint_name))
+            if fk is None:
+                fk = {'constrained_columns': [], 'referred_table': ref_table, 'referred_columns': []}
+                fk_by_name[(table_name, constraint_name)] = fk
+                foreign_keys.setdefault(table_name, []).append(fk)
+            fk['constrained_columns'].append(column_name)
+            fk['referred_columns'].append(ref_column)
+
+    # CHECK_CONSTRAINTS has no TABLE_NAME column - join TABLE_CONSTRAINTS for it
+    for row in conn.execute(text("""
+        SELECT tc.TABLE_NAME, cc.CHECK_CLAUSE
+        FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+        JOIN INFORMATION_SCHEMA.CHECK_CONSTRAINTS cc
+          ON cc.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA
+         AND cc.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
+        WHERE tc.CONSTRAINT_SCHEMA = :db_name
+        AND tc.CONSTRAINT_TYPE = 'CHECK'
+    """), params):
+        check_domains.setdefault(row[0], {}).update(parse_check_in_domains(row[1]))
+
+    index_by_name = {}
+    for row in conn.execute(text("""
+        SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME, INDEX_TYPE, NON_UNIQUE
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = :db_name
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    """), params):
+        idx = index_by_name.get((row[0], row[1]))
+        if idx is None:
+            idx = {'name': row[1], 'columns': [], 'type': row[3], 'unique': not row[4]}
+            index_by_name[(row[0], row[1])] = idx
+            indexes.setdefault(row[0], []).append(idx)
+        idx['columns'].append(row[2])
+
+    return SchemaCatalog(objects, columns, primary_keys, foreign_keys, check_domains, indexes)
+
+def _load_schema_catalog_inspector(conn):
+    """Fallback for non-MySQL backends (e.g. a SQLite stand-in) using SQLAlchemy inspection"""
+    inspector = inspect(conn)
+    objects, columns, primary_keys, foreign_keys, check_domains, indexes = {}, {}, {}, {}, {}, {}
+
+    for object_type, names in (('table', inspector.get_table_names()), ('view', inspector.get_view_names())):
+        for name in names:
+            objects[name] = {'type': object_type, 'rows': None, 'auto_increment': None}
+            columns[name] = [
+                {
+                    'name': col['name'],
+                    'type': str(col['type']).upper(),
+                    'nullable': col.get('nullable', True),
+                    'default': col.get('default'),
+                    'autoincrement': col.get('autoincrement') is True
+                }
+                for col in inspector.get_columns(name)
+            ]
+            if object_type == 'table':
+                primary_keys[name] = inspector.get_pk_constraint(name).get('constrained_columns') or []
+                foreign_keys[name] = [
+                    {key: fk[key] for key in ('constrained_columns', 'referred_table', 'referred_columns')}
+                    for fk in inspector.get_foreign_keys(name)
+                ]
+                for check in inspector.get_check_constraints(name):
+                    check_domains.setdefault(name, {}).update(parse_check_in_domains(check.get('sqltext')))
+                indexes[name] = [
+                    {'name': idx['name'], 'columns': idx['column_names'], 'type': 'BTREE', 'unique': bool(idx['unique'])}
+                    for idx in inspector.get_indexes(name)
+                ]
+                if primary_keys[name]:
+                    indexes[name].append({'name': 'PRIMARY', 'columns': primary_keys[name], 'type': 'BTREE', 'unique': True})
+
+    return SchemaCatalog(objects, columns, primary_keys, foreign_keys, check_domains, indexes)
+
+class SchemaCatalogCache:
+    """Schema snapshots per database user, refreshed after `ttl` seconds or on demand
+
+    Each MySQL user only sees the objects it has privileges on, so catalogs
+    are cached per connection URL (password excluded).
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._catalogs = {}
+        self._lock = threading.Lock()
+
+    def get(self, engine):
+        key = engine.url.render_as_string(hide_password=True)
+        with self._lock:
+            catalog = self._catalogs.get(key)
+            if catalog is None or time.time() - catalog.loaded_at > self.ttl:
+                catalog = load_schema_catalog(engine)
+                self._catalogs[key] = catalog
+            return catalog
+
+    def invalidate(self):
+        """Drop every cached snapshot so the next lookup reloads the schema"""
+        with self._lock:
+            self._catalogs.clear()
+
+@st.cache_resource(show_spinner=False)
+def get_catalog_cache():
+    """Schema catalog cache shared by all sessions of this Streamlit server"""
+    return SchemaCatalogCache(METADATA_TTL)
+
+def get_schema_catalog(engine=None):
+    """Get the cached schema catalog for the current user's engine"""
+    with profile_phase("metadata"):
+        return get_catalog_cache().get(engine if engine is not None else get_engine())
+
+def invalidate_schema_catalog():
+    """Force the schema catalog to reload (e.g. after DDL changes)"""
+    get_catalog_cache().invalidate()
+
+# Seconds an AUTO_INCREMENT preview is reused before information_schema is asked again
+ID_PREVIEW_TTL = int(os.getenv('DASHBOARD_ID_PREVIEW_TTL', 5))
+
+def read_auto_increment(engine, table_name):
+    """Next AUTO_INCREMENT value of a table, or None if the backend can't tell"""
+    if engine.dialect.name != 'mysql':
+        # SQLite keeps AUTOINCREMENT counters in sqlite_sequence (only once a row was inserted)
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = :t"),
+                                   {'t': table_name}).fetchone()
+            return row[0] + 1 if row else None
+        except Exception:
+            return None
+
+    with engine.connect() as conn:
+        # MySQL 8 caches information_schema table statistics (24h by default);
+        # read the live counter for this one query, then restore the default
+        try:
+            conn.execute(text("SET SESSION information_schema_stats_expiry = 0"))
+        except Exception:
+            pass  # MySQL 5.7 / MariaDB: statistics are always live
+        try:
+            row = conn.execute(text("""
+                SELECT AUTO_INCREMENT
+                FROM INFORMATION_SCHEMA.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t
+            """), {'t': table_name}).fetchone()
+        finally:
+            try:
+                conn.execute(text("SET SESSION information_schema_stats_expiry = DEFAULT"))
+            except Exception:
+                pass
+    return row[0] if row else None
+
+class IdPreviewCache:
+    """Short-lived AUTO_INCREMENT previews per (database user, table)
+
+    The preview is only a hint for the create form - the real ID is taken from
+    the cursor's lastrowid after the insert.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, engine, table_name):
+        key = (engine.url.render_as_string(hide_password=True), table_name)
+        with self._lock:
+            cached = self._values.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+        value = read_auto_increment(engine, table_name)
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, table_name):
+        with self._lock:
+            for key in [k for k in self._values if k[1] == table_name]:
+                del self._values[key]
+
+@st.cache_resource(show_spinner=False)
+def get_id_preview_cache():
+    """AUTO_INCREMENT preview cache shared by all sessions of this Streamlit server"""
+    return IdPreviewCache(ID_PREVIEW_TTL)
+
+# =====================================================
+# QUERY RESULT CACHE
+# =====================================================
+
+# Seconds a cached query result is served, and how many results are kept
+RESULT_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 60))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv('DASHBOARD_CACHE_MAX_ENTRIES', 256))
+
+TABLE_REFERENCE_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+WRITE_TARGET_PATTERN = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+
+def referenced_tables(sql):
+    """Lower-cased names of the tables a SELECT reads (FROM / JOIN targets)"""
+    return {name.lower() for name in TABLE_REFERENCE_PATTERN.findall(sql)}
+
+def written_tables(sql):
+    """Lower-cased name of the table an INSERT/UPDATE/DELETE writes, plus its audit table"""
+    match = WRITE_TARGET_PATTERN.match(sql)
+    if not match:
+        return set()
+    table = match.group(1).lower()
+    # Audit triggers write {table}_audit in the same transaction
+    return {table, f"{table}_audit"}
+
+class QueryResultCache:
+    """LRU + TTL cache of query results keyed by (query, role, params)
+
+    Each entry remembers the tables its query reads; invalidate_tables()
+    drops every entry that depends on a table that was just written.
+    """
+
+    def __init__(self, ttl, max_entries):
+        from collections import OrderedDict
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (DataFrame, expires_at, tables)
+        self._by_table = {}             # table -> {keys}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(sql, role, params=None):
+        normalized = " ".join(sql.split())
+        frozen = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+        return (normalized, role, frozen)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df, tables):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (df, time.monotonic() + self.ttl, frozenset(tables))
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_tables(self, tables):
+        """Drop every cached result that reads one of these tables; returns how many"""
+        removed = 0
+        with self._lock:
+            for table in tables:
+                for key in list(self._by_table.get(table.lower(), ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def _remove(self, key):
+        _, _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache():
+    """Query result cache shared by all sessions of this Streamlit server"""
+    return QueryResultCache(RESULT_CACHE_TTL, RESULT_CACHE_MAX_ENTRIES)
+
+def cached_read_sql(sql, params=None, engine=None, tables=None):
+    """pd.read_sql through the result cache
+
+    Args:
+        tables: tables the query depends on (parsed from FROM/JOIN if omitted)
+
+    Returns a copy, so callers can modify the DataFrame freely.
+    """
+    engine = engine if engine is not None else get_engine()
+    cache = get_result_cache()
+    key = cache.make_key(sql, engine.url.username, params)
+
+    df = cache.get(key)
+    if df is None:
+        with profile_phase("query"), engine.connect() as conn:
+            df = read_frame(conn, sql, params)
+        cache.put(key, df, tables if tables is not None else referenced_tables(sql))
+    return df.copy()
 
 # =====================================================
 # AUTHENTICATION & AUTHORIZATION FUNCTIONS
@@ -144,6 +1139,8 @@ def authenticate_user(username, password):
             conn.execute(text("SELECT 1"))
         return True
     except Exception:
+        # Don't keep a pool around for credentials that failed
+        get_engine_registry().discard(username, password)
         return False
 
 def get_user_role(username):
@@ -215,6 +1212,8 @@ def get_accessible_tables(role):
 
 def logout():
     """Clear session and logout user"""
+    for key in [k for k in st.session_state.keys() if str(k).endswith('_export')]:
+        discard_export_file(key)
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     st.rerun()
@@ -222,10 +1221,12 @@ def logout():
 def fetch_table_data(table_name):
     """Fetch all data from a specific table"""
     try:
+        if ASYNC_DB_ENABLED and BOUND_ENGINE.get() is None:
+            async_db, async_engine = get_async_db()
+            return async_db.sync.fetch_table_data(table_name, engine=async_engine)
         engine = get_engine()
-        query = text(f"SELECT * FROM {table_name}")
         with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+            df = read_frame(conn, f"SELECT * FROM {table_name}", table_name=table_name)
         return df
     except Exception as e:
         st.error(f"Error fetching data from {table_name}: {str(e)}")
@@ -234,23 +1235,26 @@ def fetch_table_data(table_name):
 def execute_sql(query, params=None):
     """Execute SQL query with parameters to prevent SQL injection"""
     try:
+        if ASYNC_DB_ENABLED and BOUND_ENGINE.get() is None:
+            # Missing async driver (ImportError) is reported like any other failure
+            async_db, async_engine = get_async_db()
+            return async_db.sync.execute_sql(query, params, engine=async_engine)
         engine = get_engine()
         with engine.begin() as conn:  # Use begin() for auto-commit transaction
             if params:
                 result = conn.execute(text(query), params)
             else:
                 result = conn.execute(text(query))
-            return True, "Operation successful"
+        # Cached results that read the written table are now stale
+        get_result_cache().invalidate_tables(written_tables(query))
+        return True, "Operation successful"
     except Exception as e:
         return False, str(e)
 
 def get_table_columns(table_name):
     """Get column names and types for a table"""
     try:
-        engine = get_engine()
-        inspector = inspect(engine)
-        columns = inspector.get_columns(table_name)
-        return columns
+        return get_schema_catalog().get_columns(table_name)
     except Exception as e:
         st.error(f"Error getting columns for {table_name}: {str(e)}")
         return []
@@ -258,13 +1262,12 @@ def get_table_columns(table_name):
 def get_primary_key(table_name):
     """Get primary key column(s) for a table"""
     try:
-        engine = get_engine()
-        inspector = inspect(engine)
-        pk = inspector.get_pk_constraint(table_name)
-        if pk and pk['constrained_columns']:
-            return pk['constrained_columns']
+        catalog = get_schema_catalog()
+        pk = catalog.get_primary_key(table_name)
+        if pk:
+            return pk
         # Fallback: assume first column if no PK defined
-        columns = inspector.get_columns(table_name)
+        columns = catalog.get_columns(table_name)
         if columns:
             return [columns[0]['name']]
         return []
@@ -279,13 +1282,9 @@ def get_all_tables(include_audit=False):
         include_audit: If True, includes audit tables and security logs (for admin only)
     """
     try:
-        engine = get_engine()
-        inspector = inspect(engine)
-        # Get both tables and views
-        all_tables = inspector.get_table_names()
-        all_views = inspector.get_view_names()
+        catalog = get_schema_catalog()
         # Combine tables and views
-        all_objects = all_tables + all_views
+        all_objects = catalog.table_names() + catalog.view_names()
 
         if include_audit:
             # Admin: Include everything
@@ -318,50 +1317,1492 @@ def is_numeric_column(column_type):
     return any(num_type in str(column_type).upper() for num_type in numeric_types)
 
 def get_next_id(table_name, id_column):
-    """Get the next auto-increment ID value"""
+    """Preview of the next auto-increment ID (from AUTO_INCREMENT, not SELECT MAX); None if unknown"""
     try:
-        engine = get_engine()
-        query = text(f"SELECT MAX({id_column}) as max_id FROM {table_name}")
-        with engine.connect() as conn:
-            result = conn.execute(query)
-            row = result.fetchone()
-            if row and row[0] is not None:
-                return row[0] + 1
-            return 1
+        return get_id_preview_cache().get(get_engine(), table_name)
     except Exception:
-        return 1
+        return None
 
-def get_check_constraint_values(table_name, column_name):
-    """Extract allowed values from CHECK constraint for MySQL"""
+def insert_record(table_name, data):
+    """INSERT one row; returns (success, message, new_id) with new_id from the cursor's lastrowid"""
+    columns_str = ", ".join(data.keys())
+    placeholders = ", ".join([f":{key}" for key in data.keys()])
+    query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
     try:
         engine = get_engine()
-        # Query to get CHECK constraints from information_schema
-        query = text("""
-            SELECT CHECK_CLAUSE
-            FROM INFORMATION_SCHEMA.CHECK_CONSTRAINTS
-            WHERE CONSTRAINT_SCHEMA = :db_name
-            AND TABLE_NAME = :table_name
-        """)
-
-        with engine.connect() as conn:
-            result = conn.execute(query, {'db_name': MYSQL_CONFIG['database'], 'table_name': table_name})
-
-            for row in result:
-                clause = row[0]
-                # Look for pattern like: Gender IN ('Male', 'Female')
-                if column_name.lower() in clause.lower():
-                    # Extract values within parentheses after IN
-                    match = re.search(rf"{column_name}\s+IN\s*\(([^)]+)\)", clause, re.IGNORECASE)
-                    if match:
-                        values_str = match.group(1)
-                        # Extract quoted values
-                        values = re.findall(r"'([^']+)'", values_str)
-                        return values
+        with engine.begin() as conn:
+            result = conn.execute(text(query), data)
+            new_id = result.lastrowid
+        get_result_cache().invalidate_tables(written_tables(query))
+        get_id_preview_cache().invalidate(table_name)
+        return True, "Operation successful", new_id
+    except Exception as e:
+        return False, str(e), None
 
+def get_check_constraint_values(table_name, column_name):
+    """Get allowed values from a CHECK ... IN (...) constraint (served from the schema catalog)"""
+    try:
+        return get_schema_catalog().get_check_values(table_name, column_name)
+    except Exception:
         return None
+
+# =====================================================
+# PAGINATED READS
+# =====================================================
+
+PAGE_SIZE_OPTIONS = [50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = int(os.getenv('DASHBOARD_PAGE_SIZE', 100))
+
+# Exact counts are only run up to this many rows - beyond it the estimate is shown
+ROW_COUNT_CAP = int(os.getenv('DASHBOARD_ROW_COUNT_CAP', 10000))
+
+def to_python_value(value):
+    """Convert numpy/pandas scalars to plain Python values for query parameters"""
+    return value.item() if hasattr(value, 'item') else value
+
+def get_keyset_columns(table_name):
+    """Columns to paginate on: the real primary key, or [] for views/tables without one"""
+    try:
+        return get_schema_catalog().get_primary_key(table_name)
+    except Exception:
+        return []
+
+def build_keyset_predicate(key_columns, key_values, direction='after'):
+    """Row-value comparison (a, b) > (:a, :b) expanded to OR/AND so MySQL range-scans the key"""
+    op = '>' if direction == 'after' else '<'
+    clauses = []
+    params = {}
+    for i, col in enumerate(key_columns):
+        parts = [f"{key_columns[j]} = :key_{j}" for j in range(i)]
+        parts.append(f"{col} {op} :key_{i}")
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params[f"key_{i}"] = key_values[i]
+    return "(" + " OR ".join(clauses) + ")", params
+
+def build_page_query(table_name, key_columns, page_size, after=None, before=None, offset=0,
+                     where=None, params=None):
+    """Build the SQL for one page (plus one look-ahead row)
+
+    With key columns the page is located by seeking past `after` (or before
+    `before`, scanning backwards); without them LIMIT/OFFSET is used.
+
+    Returns:
+        (sql, params, reversed) - `reversed` is True when rows come back in
+        descending key order and must be flipped for display.
+    """
+    params = dict(params or {})
+    conditions = [f"({where})"] if where else []
+    descending = False
+
+    if key_columns:
+        if after is not None:
+            predicate, key_params = build_keyset_predicate(key_columns, after, 'after')
+            conditions.append(predicate)
+            params.update(key_params)
+        elif before is not None:
+            predicate, key_params = build_keyset_predicate(key_columns, before, 'before')
+            conditions.append(predicate)
+            params.update(key_params)
+            descending = True
+        order = ", ".join(f"{col} DESC" if descending else col for col in key_columns)
+        limit_clause = "LIMIT :page_limit"
+    else:
+        # No usable key (e.g. views): fall back to OFFSET on the first column
+        order = "1"
+        limit_clause = "LIMIT :page_limit OFFSET :page_offset"
+        params['page_offset'] = int(offset)
+
+    params['page_limit'] = int(page_size) + 1
+    where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"SELECT * FROM {table_name}{where_clause} ORDER BY {order} {limit_clause}"
+    return sql, params, descending
+
+def fetch_table_page(table_name, page_size, after=None, before=None, offset=0, where=None, params=None):
+    """Fetch one page of rows; returns (DataFrame, has_more) where has_more refers to the scan direction"""
+    key_columns = get_keyset_columns(table_name)
+    sql, query_params, descending = build_page_query(
+        table_name, key_columns, page_size, after, before, offset, where, params
+    )
+    engine = get_engine()
+    with profile_phase("query"), engine.connect() as conn:
+        df = read_frame(conn, sql, query_params, table_name)
+
+    has_more = len(df) > page_size
+    df = df.iloc[:page_size]
+    if descending:
+        df = df.iloc[::-1]
+    return df.reset_index(drop=True), has_more
+
+def seek_page_start(table_name, key_columns, page_number, page_size, where=None, params=None):
+    """Key of the last row before `page_number` - an index-only OFFSET probe used for jumps"""
+    query_params = dict(params or {})
+    query_params['seek_offset'] = (page_number - 1) * page_size - 1
+    where_clause = f" WHERE {where}" if where else ""
+    sql = (f"SELECT {', '.join(key_columns)} FROM {table_name}{where_clause} "
+           f"ORDER BY {', '.join(key_columns)} LIMIT 1 OFFSET :seek_offset")
+    engine = get_engine()
+    with engine.connect() as conn:
+        row = conn.execute(text(sql), query_params).fetchone()
+    return tuple(row) if row else None
+
+def estimate_row_count(table_name, where=None, params=None):
+    """Cheap row count: exact up to ROW_COUNT_CAP rows, otherwise the InnoDB estimate
+
+    Returns:
+        (count, is_estimate)
+    """
+    if not where:
+        catalog = get_schema_catalog()
+        info = catalog.objects.get(catalog.resolve(table_name)) or {}
+        if info.get('rows') is not None and info['rows'] > ROW_COUNT_CAP:
+            return int(info['rows']), True
+
+    where_clause = f" WHERE {where}" if where else ""
+    sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {table_name}{where_clause} LIMIT :count_cap) AS capped"
+    engine = get_engine()
+    with engine.connect() as conn:
+        count = conn.execute(text(sql), {**(params or {}), 'count_cap': ROW_COUNT_CAP + 1}).scalar()
+    if count > ROW_COUNT_CAP:
+        return ROW_COUNT_CAP, True
+    return int(count), False
+
+def render_paginated_table(table_name, key_prefix, height=400, where=None, params=None):
+    """Show one page of a table/view with prev/next/jump navigation
+
+    Navigation state lives in st.session_state under `key_prefix`, so only a
+    single page is ever fetched per rerun. Returns the displayed page.
+    """
+    key_columns = get_keyset_columns(table_name)
+    state_key = f"{key_prefix}_page_state"
+
+    col_size, col_info = st.columns([1, 3])
+    page_size = col_size.selectbox(
+        "Rows per page",
+        PAGE_SIZE_OPTIONS,
+        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE) if DEFAULT_PAGE_SIZE in PAGE_SIZE_OPTIONS else 1,
+        key=f"{key_prefix}_page_size"
+    )
+
+    # Reset to the first page whenever the page size or the filter changes
+    signature = (page_size, where, tuple(sorted((params or {}).items())))
+    state = st.session_state.get(state_key)
+    if not state or state['signature'] != signature:
+        state = {'signature': signature, 'page': 1, 'after': None, 'before': None}
+        st.session_state[state_key] = state
+
+    try:
+        df, has_more = fetch_table_page(
+            table_name, page_size,
+            after=state['after'], before=state['before'],
+            offset=(state['page'] - 1) * page_size,
+            where=where, params=params
+        )
+        total, is_estimate = estimate_row_count(table_name, where, params)
     except Exception as e:
+        st.error(f"Error fetching data from {table_name}: {str(e)}")
+        return pd.DataFrame()
+
+    if state['before'] is not None:
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = state['page'] > 1, has_more
+    total_pages = max(1, -(-total // page_size))
+
+    def go_next():
+        if key_columns:
+            last_row = df.iloc[-1]
+            state.update(after=tuple(to_python_value(last_row[c]) for c in key_columns), before=None)
+        state['page'] += 1
+
+    def go_prev():
+        if key_columns:
+            first_row = df.iloc[0]
+            state.update(before=tuple(to_python_value(first_row[c]) for c in key_columns), after=None)
+        state['page'] = max(1, state['page'] - 1)
+        if state['page'] == 1:
+            state.update(after=None, before=None)
+
+    def go_to(page_number):
+        if page_number <= 1:
+            state.update(page=1, after=None, before=None)
+        elif key_columns:
+            start = seek_page_start(table_name, key_columns, page_number, page_size, where, params)
+            if start is not None:
+                state.update(page=page_number, after=start, before=None)
+        else:
+            state.update(page=page_number, after=None, before=None)
+
+    st.dataframe(df, use_container_width=True, height=height)
+
+    count_label = f"~{total:,}" if is_estimate else f"{total:,}"
+    pages_label = f"~{total_pages:,}" if is_estimate else f"{total_pages:,}"
+    memory = df.attrs.get('memory_bytes')
+    memory_label = f" | {memory[1] / 1024:,.0f} KB in memory (was {memory[0] / 1024:,.0f} KB)" if memory else ""
+    col_info.caption(f"Page {state['page']} of {pages_label} | {count_label} records{memory_label}")
+
+    nav_prev, nav_next, nav_jump, nav_go = st.columns([1, 1, 1, 1])
+    nav_prev.button("◀ Prev", key=f"{key_prefix}_prev", disabled=not has_prev or df.empty,
+                    on_click=go_prev, use_container_width=True)
+    nav_next.button("Next ▶", key=f"{key_prefix}_next", disabled=not has_next or df.empty,
+                    on_click=go_next, use_container_width=True)
+    jump_to = nav_jump.number_input("Page", min_value=1, value=state['page'], step=1,
+                                    key=f"{key_prefix}_jump", label_visibility="collapsed")
+    nav_go.button("Go", key=f"{key_prefix}_go", on_click=go_to, args=(int(jump_to),),
+                  use_container_width=True)
+
+    return df
+
+def get_numeric_column_stats(table_name):
+    """Summary statistics for numeric columns, computed in one aggregate query"""
+    numeric_cols = [c['name'] for c in get_table_columns(table_name) if is_numeric_column(c['type'])]
+    if not numeric_cols:
+        return pd.DataFrame()
+
+    stats = ['count', 'mean', 'std', 'min', 'max']
+    functions = {'count': 'COUNT', 'mean': 'AVG', 'std': 'STDDEV_SAMP', 'min': 'MIN', 'max': 'MAX'}
+    select_list = ", ".join(
+        f"{functions[stat]}({col}) AS `{col}__{stat}`" for col in numeric_cols for stat in stats
+    )
+    engine = get_engine()
+    with engine.connect() as conn:
+        row = conn.execute(text(f"SELECT {select_list} FROM {table_name}")).mappings().fetchone()
+
+    return pd.DataFrame(
+        {col: [row[f"{col}__{stat}"] for stat in stats] for col in numeric_cols},
+        index=stats
+    ).apply(pd.to_numeric, errors='coerce')
+
+# =====================================================
+# COMPACT DATAFRAMES
+# =====================================================
+
+# Shrink fetched tables: CHECK ... IN columns become categoricals, integers and decimals get narrower dtypes
+COMPACT_DTYPES_ENABLED = os.getenv('DASHBOARD_COMPACT_DTYPES', 'true').lower() in ('1', 'true', 'yes')
+
+# DECIMAL columns up to this precision are exact enough as float64 (15 significant digits)
+FLOAT_EXACT_PRECISION = 15
+
+def column_domain(catalog, table_name, column_name):
+    """CHECK IN values of a column; for views, those of the base table column with that name
+
+    A view column is only mapped when every table defining a domain for that
+    column name agrees on it.
+    """
+    values = catalog.get_check_values(table_name, column_name)
+    if values is not None or (catalog.objects.get(catalog.resolve(table_name)) or {}).get('type') != 'view':
+        return values
+    candidates = {tuple(v) for domains in catalog.check_domains.values()
+                  for column, v in domains.items() if column.lower() == str(column_name).lower()}
+    return list(candidates.pop()) if len(candidates) == 1 else None
+
+def compact_dtypes(df, table_name, catalog=None):
+    """Convert a fetched table/view DataFrame to compact dtypes in place and return it
+
+    - text columns with a CHECK ... IN domain -> pd.Categorical with the domain
+      as categories (values outside it, e.g. rows older than the constraint,
+      are appended)
+    - NumPy integer columns -> the smallest signed integer dtype that fits
+    - DECIMAL columns of Decimal objects (precision <= 15) -> float64
+
+    df.attrs['memory_bytes'] holds (bytes before, bytes after).
+    """
+    catalog = catalog if catalog is not None else get_schema_catalog()
+    before = int(df.memory_usage(deep=True).sum())
+
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            domain = column_domain(catalog, table_name, name)
+            if domain is not None:
+                present = series.dropna().unique()
+                extra = sorted(str(v) for v in present if v not in set(domain))
+                df[name] = pd.Categorical(series, categories=list(domain) + extra)
+                continue
+            column = catalog.get_column(table_name, name)
+            decimal = re.match(r"(?:DECIMAL|NUMERIC)\((\d+)", str(column['type']).upper()) if column else None
+            first = series.first_valid_index()
+            if decimal and int(decimal.group(1)) <= FLOAT_EXACT_PRECISION and first is not None \
+                    and not isinstance(series[first], str):
+                df[name] = series.astype('float64')
+        elif pd.api.types.is_integer_dtype(series) and not isinstance(series.dtype, pd.ArrowDtype):
+            df[name] = pd.to_numeric(series, downcast='integer')
+
+    df.attrs['memory_bytes'] = (before, int(df.memory_usage(deep=True).sum()))
+    return df
+
+# =====================================================
+# SQL FILTERS
+# =====================================================
+
+# Supported filter operators and their labels in the UI
+FILTER_OPERATORS = {
+    'equals': 'Equals',
+    'prefix': 'Starts with',
+    'like': 'Contains',
+    'range': 'Between',
+    'in': 'Is one of'
+}
+
+# InnoDB ignores FULLTEXT tokens shorter than this (innodb_ft_min_token_size)
+FULLTEXT_MIN_TOKEN = 3
+
+def escape_like(value):
+    """Escape LIKE wildcards so user input is matched literally (used with ESCAPE '!')"""
+    return str(value).replace('!', '!!').replace('%', '!%').replace('_', '!_')
+
+def coerce_filter_value(column, value):
+    """Convert a search value to the column's type, raising ValueError if it doesn't fit"""
+    value = str(value).strip()
+    if is_numeric_column(column['type']):
+        try:
+            return int(value) if re.fullmatch(r"-?\d+", value) else float(value)
+        except ValueError:
+            raise ValueError(f"'{value}' is not a number (column {column['name']})")
+    return value
+
+def filter_operators_for(column):
+    """Operators that make sense for a column dict (None means 'all columns')"""
+    if column is None:
+        return ['prefix', 'like']
+    if is_numeric_column(column['type']) or is_date_column(column['name']):
+        return ['equals', 'range', 'in']
+    return ['equals', 'prefix', 'like', 'in']
+
+def build_filter_clause(table_name, predicates, catalog=None):
+    """Compile [(column, operator, value)] into a parameterized WHERE clause
+
+    Columns are validated against the schema catalog; `column=None` searches
+    all columns. `range` takes a (low, high) tuple (either end may be empty)
+    and `in` a list of values. Contains-searches on a column with a FULLTEXT
+    index use MATCH ... AGAINST instead of a leading-wildcard LIKE.
+
+    Returns:
+        (where_sql, params) - where_sql is None when there is nothing to filter.
+
+    Raises:
+        ValueError: unknown column/operator or a value of the wrong type.
+    """
+    catalog = catalog if catalog is not None else get_schema_catalog()
+    conditions = []
+    params = {}
+
+    for i, (column_name, operator, value) in enumerate(predicates):
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {operator}")
+        name = f"f{i}"
+
+        if column_name is None:
+            condition = _build_all_columns_condition(catalog, table_name, operator, value, name, params)
+            if condition:
+                conditions.append(condition)
+            continue
+
+        column = catalog.get_column(table_name, column_name)
+        if column is None:
+            raise ValueError(f"Unknown column '{column_name}' in {table_name}")
+        col = column['name']
+
+        if operator == 'equals':
+            conditions.append(f"{col} = :{name}")
+            params[name] = coerce_filter_value(column, value)
+        elif operator == 'prefix':
+            conditions.append(f"{col} LIKE :{name} ESCAPE '!'")
+            params[name] = f"{escape_like(value)}%"
+        elif operator == 'like':
+            words = str(value).split()
+            if (catalog.find_fulltext_index(table_name, [col]) and words and
+                    all(len(w) >= FULLTEXT_MIN_TOKEN for w in words)):
+                # Every word must appear, each matched as a word prefix
+                terms = [re.sub(r"[^\w]", "", w) for w in words]
+                conditions.append(f"MATCH({col}) AGAINST (:{name} IN BOOLEAN MODE)")
+                params[name] = " ".join(f"+{t}*" for t in terms if t)
+            else:
+                conditions.append(f"{col} LIKE :{name} ESCAPE '!'")
+                params[name] = f"%{escape_like(value)}%"
+        elif operator == 'range':
+            low, high = value
+            if str(low).strip():
+                conditions.append(f"{col} >= :{name}_low")
+                params[f"{name}_low"] = coerce_filter_value(column, low)
+            if str(high).strip():
+                conditions.append(f"{col} <= :{name}_high")
+                params[f"{name}_high"] = coerce_filter_value(column, high)
+        elif operator == 'in':
+            values = [v for v in value if str(v).strip()]
+            if not values:
+                raise ValueError(f"Enter at least one value for {col}")
+            placeholders = []
+            for j, v in enumerate(values):
+                params[f"{name}_{j}"] = coerce_filter_value(column, v)
+                placeholders.append(f":{name}_{j}")
+            conditions.append(f"{col} IN ({', '.join(placeholders)})")
+
+    if not conditions:
+        return None, {}
+    return " AND ".join(conditions), params
+
+def _build_all_columns_condition(catalog, table_name, operator, value, name, params):
+    """OR together a text match on every text column and equality on numeric ones"""
+    term = str(value).strip()
+    if not term:
         return None
 
+    pattern = f"{escape_like(term)}%" if operator == 'prefix' else f"%{escape_like(term)}%"
+    params[name] = pattern
+    parts = []
+    for column in catalog.get_columns(table_name):
+        if is_numeric_column(column['type']):
+            try:
+                params[f"{name}_{column['name']}"] = coerce_filter_value(column, term)
+            except ValueError:
+                continue
+            parts.append(f"{column['name']} = :{name}_{column['name']}")
+        else:
+            parts.append(f"{column['name']} LIKE :{name} ESCAPE '!'")
+    return "(" + " OR ".join(parts) + ")" if parts else None
+
+def render_filter_builder(table_name, key_prefix):
+    """Search/filter widgets; returns (where_sql, params) or (None, {}) when no filter is set"""
+    columns = get_table_columns(table_name)
+    by_name = {c['name']: c for c in columns}
+
+    col_select, col_op, col_value = st.columns([2, 1, 3])
+    search_col = col_select.selectbox("Search by column", ["All"] + list(by_name.keys()), key=f"{key_prefix}_col")
+    column = by_name.get(search_col)
+    operators = filter_operators_for(column)
+    operator = col_op.selectbox("Match", operators, format_func=lambda op: FILTER_OPERATORS[op],
+                                key=f"{key_prefix}_op_{search_col}")
+
+    if operator == 'range':
+        low_col, high_col = col_value.columns(2)
+        low = low_col.text_input("From", "", key=f"{key_prefix}_low")
+        high = high_col.text_input("To", "", key=f"{key_prefix}_high")
+        if not low.strip() and not high.strip():
+            return None, {}
+        value = (low, high)
+    elif operator == 'in':
+        allowed = get_check_constraint_values(table_name, search_col)
+        if allowed:
+            value = col_value.multiselect("Values", allowed, key=f"{key_prefix}_in")
+        else:
+            raw = col_value.text_input("Values (comma-separated)", "", key=f"{key_prefix}_in_text")
+            value = [v.strip() for v in raw.split(',')]
+        if not any(str(v).strip() for v in value):
+            return None, {}
+    else:
+        value = col_value.text_input("Search term", "", key=f"{key_prefix}_term")
+        if not value.strip():
+            return None, {}
+
+    if column is not None and get_schema_catalog().has_leading_index(table_name, search_col) and operator != 'like':
+        st.caption(f"⚡ `{search_col}` is indexed - this filter uses an index range scan")
+
+    try:
+        return build_filter_clause(table_name, [(None if column is None else search_col, operator, value)])
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        return None, {}
+
+# =====================================================
+# STREAMING EXPORT
+# =====================================================
+
+EXPORT_FORMATS = {
+    'csv': {'label': 'CSV', 'suffix': '.csv', 'mime': 'text/csv'},
+    'csv.gz': {'label': 'CSV (gzip)', 'suffix': '.csv.gz', 'mime': 'application/gzip'},
+    'parquet': {'label': 'Parquet', 'suffix': '.parquet', 'mime': 'application/vnd.apache.parquet'}
+}
+
+# Rows fetched from the server-side cursor and written per chunk
+EXPORT_CHUNK_ROWS = int(os.getenv('DASHBOARD_EXPORT_CHUNK_ROWS', 10000))
+# Prepared export files live here and are deleted once older than EXPORT_MAX_AGE seconds
+# (abandoned sessions never reach logout(), which removes them otherwise)
+EXPORT_DIR = os.getenv('DASHBOARD_EXPORT_DIR', '') or os.path.join(tempfile.gettempdir(), 'dashboard_exports')
+EXPORT_MAX_AGE = int(os.getenv('DASHBOARD_EXPORT_MAX_AGE', 3600))
+
+# Build displayed DataFrames from Arrow record batches instead of pd.read_sql (needs pyarrow)
+ARROW_FETCH_ENABLED = os.getenv('DASHBOARD_ARROW_FETCH', 'false').lower() in ('1', 'true', 'yes')
+
+def arrow_type_for_column(column_type):
+    """Map a MySQL column type (e.g. 'DECIMAL(10,2)') to a pyarrow type"""
+    import pyarrow as pa
+
+    column_type = str(column_type).upper()
+    decimal = re.match(r"(?:DECIMAL|NUMERIC)\((\d+),\s*(\d+)\)", column_type)
+    if decimal:
+        return pa.decimal128(int(decimal.group(1)), int(decimal.group(2)))
+    if 'INT' in column_type and 'UNSIGNED' in column_type:
+        if column_type.startswith('TINYINT'):
+            return pa.uint8()
+        if column_type.startswith('SMALLINT'):
+            return pa.uint16()
+        if column_type.startswith('BIGINT'):
+            return pa.uint64()
+        return pa.uint32()
+    if column_type.startswith('TINYINT'):
+        return pa.int8()
+    if column_type.startswith('SMALLINT'):
+        return pa.int16()
+    if column_type.startswith('BIGINT'):
+        return pa.int64()
+    if 'INT' in column_type:
+        return pa.int32()
+    if column_type.startswith(('FLOAT', 'DOUBLE', 'REAL')):
+        return pa.float64()
+    if column_type.startswith('DATETIME') or column_type.startswith('TIMESTAMP'):
+        return pa.timestamp('us')
+    if column_type.startswith('DATE'):
+        return pa.date32()
+    return pa.string()
+
+def arrow_schema_for(table_name, column_names, catalog=None):
+    """Arrow schema for a result set, typed from the schema catalog (unknown columns -> string)"""
+    import pyarrow as pa
+
+    catalog = catalog if catalog is not None else get_schema_catalog()
+    fields = []
+    for name in column_names:
+        column = catalog.get_column(table_name, name)
+        fields.append(pa.field(name, arrow_type_for_column(column['type']) if column else pa.string()))
+    return pa.schema(fields)
+
+def to_arrow_array(values, arrow_type):
+    """Build a typed Arrow array, parsing values the driver returned as strings (e.g. SQLite dates)"""
+    import pyarrow as pa
+
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array(values).cast(arrow_type)
+
+def iter_arrow_batches(result, column_names, schema=None, chunk_size=EXPORT_CHUNK_ROWS):
+    """Read a SQLAlchemy result in chunks of `chunk_size` rows, yielding typed pyarrow RecordBatches
+
+    Rows are the DBAPI tuples, fetched through the result's cursor strategy:
+    with stream_results SQLAlchemy has already buffered the first row, which
+    reading result.cursor directly would drop, and result.partitions() would
+    wrap every tuple in a GC-tracked Row (about 3x slower on a large heap).
+    Each chunk is converted once per column. Without a schema every chunk's
+    types are inferred from its values.
+    """
+    import pyarrow as pa
+
+    while True:
+        chunk = result.cursor_strategy.fetchmany(result, result.cursor, chunk_size)
+        if not chunk:
+            break
+        columns = list(zip(*chunk))
+        if schema is None:
+            yield pa.RecordBatch.from_arrays([pa.array(values) for values in columns], names=column_names)
+        else:
+            yield pa.RecordBatch.from_arrays(
+                [to_arrow_array(values, field.type) for values, field in zip(columns, schema)], schema=schema)
+
+def read_sql_arrow(conn, sql, params=None, table_name=None, chunk_size=EXPORT_CHUNK_ROWS):
+    """Run a query and collect it into a pyarrow Table
+
+    With `table_name` the columns are typed from the schema catalog
+    (DECIMAL -> decimal128, DATE -> date32, ...); otherwise they are inferred.
+    """
+    import pyarrow as pa
+
+    result = conn.execution_options(stream_results=True, max_row_buffer=chunk_size).execute(
+        text(sql) if isinstance(sql, str) else sql, params or {})
+    column_names = list(result.keys())
+    schema = arrow_schema_for(table_name, column_names, get_schema_catalog(conn.engine)) if table_name else None
+    try:
+        batches = list(iter_arrow_batches(result, column_names, schema, chunk_size))
+    finally:
+        result.close()
+    if schema is not None:
+        return pa.Table.from_batches(batches, schema=schema)
+    if not batches:
+        return pa.table({name: pa.array([], pa.null()) for name in column_names})
+    # Inferred chunks can differ (e.g. a column that is all NULL in one chunk)
+    return pa.concat_tables([pa.Table.from_batches([batch]) for batch in batches], promote_options='permissive')
+
+def read_frame(conn, sql, params=None, table_name=None):
+    """pd.read_sql, or an Arrow-backed DataFrame when DASHBOARD_ARROW_FETCH is on
+
+    Rows of a table or view (`table_name`) go through compact_dtypes() when
+    DASHBOARD_COMPACT_DTYPES is on.
+    """
+    if ARROW_FETCH_ENABLED:
+        df = read_sql_arrow(conn, sql, params, table_name).to_pandas(types_mapper=pd.ArrowDtype)
+    else:
+        df = pd.read_sql(text(sql) if isinstance(sql, str) else sql, conn, params=params)
+    if COMPACT_DTYPES_ENABLED and table_name:
+        with profile_phase("compact dtypes"):
+            df = compact_dtypes(df, table_name, get_schema_catalog(conn.engine))
+    return df
+
+def stream_export(table_name, fmt='csv', where=None, params=None, chunk_size=EXPORT_CHUNK_ROWS,
+                  progress=None, engine=None):
+    """Stream a table or view into a temporary CSV, gzip-CSV or Parquet file
+
+    Rows are read from a server-side cursor (stream_results / SSCursor) in
+    chunks of `chunk_size` and written straight to disk, so memory use does
+    not depend on the table size. `progress(rows_written)` is called after
+    every chunk.
+
+    Returns:
+        (file_path, rows_written)
+    """
+    import csv
+    import gzip
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+    engine = engine if engine is not None else get_engine()
+    where_clause = f" WHERE {where}" if where else ""
+    query = text(f"SELECT * FROM {table_name}{where_clause}")
+
+    purge_stale_exports()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    handle, path = tempfile.mkstemp(prefix=f"{table_name}_", suffix=EXPORT_FORMATS[fmt]['suffix'], dir=EXPORT_DIR)
+    os.close(handle)
+    rows_written = 0
+
+    try:
+        with engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+            result = conn.execute(query, params or {})
+            column_names = list(result.keys())
+
+            if fmt == 'parquet':
+                schema = arrow_schema_for(table_name, column_names)
+                with pq.ParquetWriter(path, schema) as writer:
+                    for batch in iter_arrow_batches(result, column_names, schema, chunk_size):
+                        writer.write_batch(batch)
+                        rows_written += batch.num_rows
+                        if progress:
+                            progress(rows_written)
+            else:
+                opener = gzip.open if fmt == 'csv.gz' else open
+                with opener(path, 'wt', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(column_names)
+                    for chunk in result.partitions(chunk_size):
+                        writer.writerows(chunk)
+                        rows_written += len(chunk)
+                        if progress:
+                            progress(rows_written)
+    except Exception:
+        os.remove(path)
+        raise
+
+    return path, rows_written
+
+def purge_stale_exports(max_age=None):
+    """Delete export files older than `max_age` seconds (default EXPORT_MAX_AGE); returns how many"""
+    max_age = EXPORT_MAX_AGE if max_age is None else max_age
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(EXPORT_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # Another session removed it first
+            pass
+    return removed
+
+def read_export_file(path):
+    """Bytes of a prepared export - called by the download button only when it is clicked"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def discard_export_file(state_key):
+    """Delete a previously prepared export file tracked in session state"""
+    export = st.session_state.pop(state_key, None)
+    if export and os.path.exists(export['path']):
+        os.remove(export['path'])
+
+def render_export_controls(table_name, key_prefix, where=None, params=None):
+    """Format picker + 'Prepare export' button that streams the (filtered) data to a file"""
+    state_key = f"{key_prefix}_export"
+    signature = (where, tuple(sorted((params or {}).items())))
+
+    col_format, col_prepare, col_download = st.columns([1, 1, 1])
+    fmt = col_format.selectbox("Export format", list(EXPORT_FORMATS.keys()),
+                               format_func=lambda f: EXPORT_FORMATS[f]['label'],
+                               key=f"{key_prefix}_export_format", label_visibility="collapsed")
+
+    purge_stale_exports()
+    export = st.session_state.get(state_key)
+    if export and (export['signature'] != signature or export['fmt'] != fmt):
+        # Filter or format changed - the prepared file no longer matches
+        discard_export_file(state_key)
+        export = None
+    elif export and not os.path.exists(export['path']):
+        # Expired (EXPORT_MAX_AGE) - prepare it again
+        st.session_state.pop(state_key, None)
+        export = None
+
+    if col_prepare.button("📦 Prepare export", key=f"{key_prefix}_export_prepare", use_container_width=True):
+        discard_export_file(state_key)
+        total, is_estimate = estimate_row_count(table_name, where, params)
+        bar = st.progress(0.0, text="Exporting...")
+
+        def report(rows_written):
+            fraction = min(rows_written / total, 1.0) if total else 1.0
+            bar.progress(fraction, text=f"Exported {rows_written:,} rows")
+
+        try:
+            path, rows = stream_export(table_name, fmt, where, params, progress=report)
+        except ImportError:
+            bar.empty()
+            st.error("❌ Parquet export requires the optional `pyarrow` package")
+            return
+        except Exception as e:
+            bar.empty()
+            st.error(f"❌ Error exporting {table_name}: {str(e)}")
+            return
+        bar.progress(1.0, text=f"Exported {rows:,} rows")
+        export = {'path': path, 'fmt': fmt, 'rows': rows, 'signature': signature}
+        st.session_state[state_key] = export
+
+    if export:
+        # Deferred: the file is read when the button is clicked, not on every rerun
+        col_download.download_button(
+            label=f"📥 Download ({export['rows']:,} rows)",
+            data=lambda path=export['path']: read_export_file(path),
+            file_name=f"{table_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{EXPORT_FORMATS[fmt]['suffix']}",
+            mime=EXPORT_FORMATS[fmt]['mime'],
+            key=f"{key_prefix}_export_download",
+            use_container_width=True
+        )
+
+# =====================================================
+# BULK IMPORT
+# =====================================================
+
+IMPORT_FORMATS = {
+    'csv': 'CSV',
+    'parquet': 'Parquet'
+}
+
+# Rows sent per executemany / committed per transaction
+IMPORT_BATCH_ROWS = int(os.getenv('DASHBOARD_IMPORT_BATCH_ROWS', 1000))
+
+# Per-row errors shown on screen (the full list is downloadable)
+IMPORT_ERRORS_SHOWN = 200
+
+def read_import_file(uploaded_file):
+    """Load an uploaded CSV or Parquet file; CSV cells are kept as strings for validation"""
+    name = uploaded_file.name.lower()
+    if name.endswith('.parquet'):
+        return pd.read_parquet(uploaded_file)
+    return pd.read_csv(uploaded_file, dtype=str, keep_default_na=False, na_values=[''])
+
+def validate_import_rows(table_name, df):
+    """Check an import frame against the catalog's column types and CHECK domains
+
+    Returns (clean_df, errors_df). clean_df holds the rows that passed, with file
+    columns renamed to the table's column names and values converted for binding;
+    errors_df has one row per failed cell (Row is the 1-based data row in the file).
+    Raises ValueError if the file's columns don't fit the table at all.
+    """
+    catalog = get_schema_catalog()
+    columns = catalog.get_columns(table_name)
+    if not columns:
+        raise ValueError(f"Table '{table_name}' not found")
+
+    rename = {}
+    for name in df.columns:
+        col = catalog.get_column(table_name, str(name).strip())
+        if col is None:
+            raise ValueError(f"Column '{name}' does not exist in {table_name}")
+        rename[name] = col['name']
+    df = df.rename(columns=rename)
+
+    pk_columns = catalog.get_primary_key(table_name)
+    missing = [col['name'] for col in columns
+               if col['name'] not in df.columns and not col['nullable']
+               and col['default'] is None and not col.get('autoincrement')
+               and not (col['name'] in pk_columns and len(pk_columns) == 1 and 'INT' in col['type'])]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    clean = pd.DataFrame(index=df.index)
+    problems = []
+
+    for col in columns:
+        name = col['name']
+        if name not in df.columns:
+            continue
+        col_type = col['type'].upper()
+        raw = df[name]
+        text_values = raw.astype(str).str.strip().where(raw.notna())
+        blank = text_values.isna() | (text_values == '')
+
+        if is_numeric_column(col_type):
+            values = pd.to_numeric(text_values.where(~blank), errors='coerce')
+            bad = ~blank & values.isna()
+            reason = "not a number"
+            if 'INT' in col_type:
+                fractional = values.notna() & (values != values.round())
+                problems.append((fractional, "not a whole number", name))
+                values = values.where(~fractional).astype('Int64')
+        elif 'DATE' in col_type or 'TIMESTAMP' in col_type:
+            parsed = pd.to_datetime(text_values.where(~blank), errors='coerce', format='mixed')
+            bad = ~blank & parsed.isna()
+            reason = "not a valid date (use yyyy-mm-dd)"
+            fmt = '%Y-%m-%d' if col_type == 'DATE' else '%Y-%m-%d %H:%M:%S'
+            values = parsed.dt.strftime(fmt)
+        else:
+            values = text_values.where(~blank)
+            length = re.search(r'CHAR\((\d+)\)', col_type)
+            if length:
+                bad = values.str.len() > int(length.group(1))
+                reason = f"longer than {length.group(1)} characters"
+            else:
+                bad = pd.Series(False, index=df.index)
+                reason = ""
+        problems.append((bad, reason, name))
+
+        allowed = catalog.get_check_values(table_name, name)
+        if allowed:
+            outside = ~blank & ~bad & ~values.astype(str).isin(allowed)
+            problems.append((outside, f"must be one of {', '.join(allowed)}", name))
+
+        if not col['nullable'] and col['default'] is None and not col.get('autoincrement'):
+            problems.append((blank, "required", name))
+
+        clean[name] = values.astype(object).where(values.notna(), None)
+
+    error_frames = []
+    for mask, message, column in problems:
+        if mask.any():
+            failed = df.index[mask.fillna(False).to_numpy(dtype=bool)]
+            error_frames.append(pd.DataFrame({
+                'Row': failed + 1,
+                'Column': column,
+                'Value': df.loc[failed, column].fillna('').astype(str).to_numpy(),
+                'Error': message
+            }))
+    errors = (pd.concat(error_frames, ignore_index=True).sort_values(['Row', 'Column'], ignore_index=True)
+              if error_frames else pd.DataFrame(columns=['Row', 'Column', 'Value', 'Error']))
+    clean = clean.drop(index=df.index[errors['Row'].unique() - 1] if len(errors) else [])
+    return clean, errors
+
+def bulk_insert(table_name, df, batch_size=IMPORT_BATCH_ROWS, progress=None, engine=None):
+    """Insert a validated frame with one executemany per chunk, each chunk in its own transaction
+
+    PyMySQL rewrites executemany on INSERT ... VALUES into multi-row INSERT statements.
+    If a chunk fails (duplicate key, FK violation...), it is rolled back and retried one
+    row at a time so the good rows still land and each bad row gets its own error.
+    Returns a dict with inserted, errors (DataFrame), seconds and rows_per_second.
+    """
+    engine = engine if engine is not None else get_engine()
+    columns = list(df.columns)
+    query = (f"INSERT INTO {table_name} ({', '.join(columns)}) "
+             f"VALUES ({', '.join(f':{c}' for c in columns)})")
+    statement = text(query)
+    records = df.to_dict('records')
+    row_numbers = (df.index + 1).tolist()
+
+    inserted = 0
+    errors = []
+    started = time.perf_counter()
+    for offset in range(0, len(records), batch_size):
+        chunk = records[offset:offset + batch_size]
+        try:
+            with engine.begin() as conn:
+                conn.execute(statement, chunk)
+            inserted += len(chunk)
+        except Exception:
+            for row_number, record in zip(row_numbers[offset:offset + batch_size], chunk):
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(statement, record)
+                    inserted += 1
+                except Exception as e:
+                    message = str(getattr(e, 'orig', e))
+                    errors.append({'Row': row_number, 'Column': '', 'Value': '', 'Error': message})
+        if progress:
+            progress(min(offset + batch_size, len(records)), len(records))
+    seconds = time.perf_counter() - started
+
+    if inserted:
+        get_result_cache().invalidate_tables(written_tables(query))
+        get_id_preview_cache().invalidate(table_name)
+    return {
+        'inserted': inserted,
+        'errors': pd.DataFrame(errors, columns=['Row', 'Column', 'Value', 'Error']),
+        'seconds': seconds,
+        'rows_per_second': inserted / seconds if seconds > 0 else 0.0
+    }
+
+def render_bulk_import(table_name):
+    """Upload → validate → import, with per-row error reporting"""
+    uploaded = st.file_uploader("Upload CSV or Parquet file", type=list(IMPORT_FORMATS.keys()),
+                                key=f"import_file_{table_name}")
+    if uploaded is None:
+        columns = [col['name'] for col in get_table_columns(table_name)]
+        st.caption(f"Expected columns: {', '.join(columns)}. Auto-increment IDs may be left out.")
+        return
+
+    try:
+        df = read_import_file(uploaded)
+        clean, errors = validate_import_rows(table_name, df)
+    except ImportError:
+        st.error("❌ Parquet import requires the optional `pyarrow` package")
+        return
+    except Exception as e:
+        st.error(f"❌ Cannot import this file: {str(e)}")
+        return
+
+    st.dataframe(df.head(20), use_container_width=True)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Rows in file", f"{len(df):,}")
+    col2.metric("Valid rows", f"{len(clean):,}")
+    col3.metric("Rows with errors", f"{errors['Row'].nunique():,}")
+
+    if not errors.empty:
+        st.warning("⚠️ These rows failed validation and will be skipped:")
+        st.dataframe(errors.head(IMPORT_ERRORS_SHOWN), use_container_width=True)
+        st.download_button("📥 Download validation errors", errors.to_csv(index=False),
+                           file_name=f"{table_name}_import_errors.csv", mime="text/csv",
+                           key=f"import_errors_{table_name}")
+
+    if clean.empty:
+        return
+
+    if st.button(f"📤 Import {len(clean):,} rows", type="primary", key=f"import_run_{table_name}"):
+        bar = st.progress(0.0, text="Importing...")
+
+        def report(done, total):
+            bar.progress(done / total, text=f"Processed {done:,} of {total:,} rows")
+
+        result = bulk_insert(table_name, clean, progress=report)
+        bar.progress(1.0, text=f"Imported {result['inserted']:,} rows")
+
+        if result['inserted']:
+            st.success(f"✅ Imported {result['inserted']:,} rows into {table_name} in "
+                       f"{result['seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s)")
+        if not result['errors'].empty:
+            st.error(f"❌ {len(result['errors']):,} rows were rejected by the database:")
+            st.dataframe(result['errors'].head(IMPORT_ERRORS_SHOWN), use_container_width=True)
+
+# =====================================================
+# BATCH OPERATIONS
+# =====================================================
+
+# Keys per UPDATE/DELETE statement (all chunks share one transaction)
+BATCH_CHUNK_ROWS = int(os.getenv('DASHBOARD_BATCH_CHUNK_ROWS', 500))
+# Most rows a single batch operation may touch
+BATCH_MAX_ROWS = int(os.getenv('DASHBOARD_BATCH_MAX_ROWS', 10000))
+
+def build_key_in_clause(key_columns, keys, prefix='k'):
+    """`pk IN (...)` for a list of key tuples - a row constructor for composite keys
+
+    Returns (clause, params) with parameters named {prefix}{row}_{column}.
+    """
+    params = {}
+    rows = []
+    for i, key in enumerate(keys):
+        names = []
+        for j, value in enumerate(key):
+            name = f"{prefix}{i}_{j}"
+            params[name] = to_python_value(value)
+            names.append(f":{name}")
+        rows.append(names[0] if len(key_columns) == 1 else f"({', '.join(names)})")
+
+    target = key_columns[0] if len(key_columns) == 1 else f"({', '.join(key_columns)})"
+    return f"{target} IN ({', '.join(rows)})", params
+
+def fetch_matching_keys(table_name, key_columns, where=None, params=None, limit=BATCH_MAX_ROWS):
+    """Key tuples of the rows matching a filter, in key order, at most limit + 1 of them"""
+    where_clause = f" WHERE {where}" if where else ""
+    sql = (f"SELECT {', '.join(key_columns)} FROM {table_name}{where_clause} "
+           f"ORDER BY {', '.join(key_columns)} LIMIT :key_limit")
+    with get_engine().connect() as conn:
+        result = conn.execute(text(sql), {**(params or {}), 'key_limit': int(limit) + 1})
+        return [tuple(row) for row in result]
+
+def fetch_rows_by_keys(table_name, key_columns, keys):
+    """Full rows for a list of key tuples (used for the batch preview)"""
+    if not keys:
+        return pd.DataFrame()
+    clause, params = build_key_in_clause(key_columns, keys)
+    with get_engine().connect() as conn:
+        return pd.read_sql(text(f"SELECT * FROM {table_name} WHERE {clause} ORDER BY {', '.join(key_columns)}"),
+                           conn, params=params)
+
+def execute_batch(table_name, operation, keys, values=None, chunk_size=BATCH_CHUNK_ROWS):
+    """Apply one set-based UPDATE (operation='update', SET values) or DELETE to many keys
+
+    Keys are sent in chunks of `chunk_size`, all inside a single transaction, so the
+    batch is applied completely or not at all.
+    Returns (success, message, affected_rows, seconds).
+    """
+    if not can_perform_operation(st.session_state.get('role'), operation, table_name):
+        return False, f"Your role cannot {operation} rows in {table_name}", 0, 0.0
+    if operation == 'update' and not values:
+        return False, "No columns to update", 0, 0.0
+
+    # Only a real primary key guarantees the statement touches exactly the previewed rows
+    key_columns = get_keyset_columns(table_name)
+    if not key_columns:
+        return False, f"{table_name} has no primary key - batch operations need one", 0, 0.0
+    if operation == 'update':
+        set_clause = ", ".join(f"{col}=:set_{col}" for col in values)
+        base = f"UPDATE {table_name} SET {set_clause} WHERE "
+        set_params = {f"set_{col}": value for col, value in values.items()}
+    else:
+        base = f"DELETE FROM {table_name} WHERE "
+        set_params = {}
+
+    affected = 0
+    started = time.perf_counter()
+    try:
+        with get_engine().begin() as conn:
+            for offset in range(0, len(keys), chunk_size):
+                clause, params = build_key_in_clause(key_columns, keys[offset:offset + chunk_size])
+                result = conn.execute(text(base + clause), {**set_params, **params})
+                affected += max(result.rowcount, 0)
+    except Exception as e:
+        return False, str(getattr(e, 'orig', e)), 0, time.perf_counter() - started
+
+    get_result_cache().invalidate_tables(written_tables(base))
+    return True, "Operation successful", affected, time.perf_counter() - started
+
+def render_batch_selection(table_name, key_prefix):
+    """Pick rows by filter or from the current page; returns (key_columns, keys) for the preview"""
+    key_columns = get_keyset_columns(table_name)
+    if not key_columns:
+        st.error(f"❌ {table_name} has no primary key, so rows cannot be selected for a batch operation. "
+                 "Use the single-record mode instead.")
+        return key_columns, []
+    select_by = st.radio("Select rows by", ["Filter", "Pick from page"], horizontal=True,
+                         key=f"{key_prefix}_select_by")
+
+    if select_by == "Filter":
+        where, params = render_filter_builder(table_name, key_prefix=f"{key_prefix}_filter")
+        if not where:
+            st.info("Set a filter to choose the rows to change")
+            return key_columns, []
+        keys = fetch_matching_keys(table_name, key_columns, where, params)
+        if len(keys) > BATCH_MAX_ROWS:
+            st.error(f"❌ More than {BATCH_MAX_ROWS:,} rows match - narrow the filter")
+            return key_columns, []
+        return key_columns, keys
+
+    df = render_paginated_table(table_name, key_prefix=f"{key_prefix}_page", height=250)
+    if df.empty:
+        return key_columns, []
+    page_keys = [tuple(row) for row in df[key_columns].itertuples(index=False)]
+    label = lambda key: ", ".join(f"{col}={value}" for col, value in zip(key_columns, key))
+    if st.checkbox("Select every row on this page", key=f"{key_prefix}_all"):
+        return key_columns, page_keys
+    return key_columns, st.multiselect("Rows", page_keys, format_func=label, key=f"{key_prefix}_rows")
+
+def render_batch_preview(table_name, key_columns, keys):
+    """Show how many rows the batch touches and the first of them"""
+    st.write(f"**{len(keys):,} row(s) selected**")
+    st.dataframe(fetch_rows_by_keys(table_name, key_columns, keys[:100]), use_container_width=True, height=250)
+    if len(keys) > 100:
+        st.caption(f"Showing the first 100 of {len(keys):,} rows")
+
+def render_batch_update(table_name):
+    """Set the same column values on many rows at once"""
+    key_columns, keys = render_batch_selection(table_name, key_prefix=f"batch_update_{table_name}")
+    if not keys:
+        return
+    render_batch_preview(table_name, key_columns, keys)
+
+    editable = [col for col in get_table_columns(table_name) if col['name'] not in key_columns]
+    chosen = st.multiselect("Columns to change", [col['name'] for col in editable],
+                            key=f"batch_update_cols_{table_name}")
+    if not chosen:
+        return
+
+    with st.form(f"batch_update_form_{table_name}"):
+        values = {}
+        for col in editable:
+            col_name = col['name']
+            if col_name not in chosen:
+                continue
+            allowed_values = get_check_constraint_values(table_name, col_name)
+            if allowed_values:
+                values[col_name] = st.selectbox(f"{col_name}", allowed_values, key=f"batch_set_{table_name}_{col_name}")
+            elif is_date_column(col_name):
+                value = st.date_input(f"{col_name}", value=None, key=f"batch_set_{table_name}_{col_name}")
+                values[col_name] = value.strftime('%Y-%m-%d') if value else None
+            elif is_numeric_column(col['type']):
+                if any(t in col['type'].upper() for t in ('DECIMAL', 'FLOAT', 'DOUBLE')):
+                    values[col_name] = st.number_input(f"{col_name}", value=0.0, step=0.01, key=f"batch_set_{table_name}_{col_name}")
+                else:
+                    values[col_name] = st.number_input(f"{col_name}", value=0, step=1, key=f"batch_set_{table_name}_{col_name}")
+            else:
+                values[col_name] = st.text_input(f"{col_name}", key=f"batch_set_{table_name}_{col_name}")
+
+        submitted = st.form_submit_button(f"Update {len(keys):,} rows", type="primary")
+
+    if submitted:
+        success, message, affected, seconds = execute_batch(table_name, 'update', keys, values)
+        if success:
+            st.success(f"✅ Updated {affected:,} rows in {table_name} in {seconds:.2f}s")
+        else:
+            st.error(f"❌ Error updating records: {message}")
+
+def render_batch_delete(table_name):
+    """Delete many rows at once"""
+    key_columns, keys = render_batch_selection(table_name, key_prefix=f"batch_delete_{table_name}")
+    if not keys:
+        return
+    render_batch_preview(table_name, key_columns, keys)
+
+    with st.form(f"batch_delete_form_{table_name}"):
+        st.warning(f"⚠️ This deletes {len(keys):,} rows and cannot be undone!")
+        confirmed = st.checkbox("I understand", key=f"batch_delete_confirm_{table_name}")
+        submitted = st.form_submit_button(f"🗑️ Delete {len(keys):,} rows", type="primary")
+
+    if submitted:
+        if not confirmed:
+            st.error("Tick the confirmation box first")
+            return
+        success, message, affected, seconds = execute_batch(table_name, 'delete', keys)
+        if success:
+            st.success(f"✅ Deleted {affected:,} rows from {table_name} in {seconds:.2f}s")
+        else:
+            st.error(f"❌ Error deleting records: {message}")
+
+# =====================================================
+# RECORD PICKER
+# =====================================================
+
+# Candidates offered by the primary key type-ahead
+RECORD_PICKER_LIMIT = int(os.getenv('DASHBOARD_RECORD_PICKER_LIMIT', 50))
+
+def build_key_search_query(table_name, key_columns, terms, limit=RECORD_PICKER_LIMIT):
+    """Type-ahead over the primary key index
+
+    `terms` maps key columns to what the user typed. Filled columns before the
+    last one must match exactly; the last filled column is a prefix (strings) or
+    a lower bound (numbers), so the search stays a range scan on the PK index.
+    Returns (sql, params); raises ValueError for a non-numeric term on a numeric column.
+    """
+    catalog = get_schema_catalog()
+    filled = [col for col in key_columns if str(terms.get(col, '')).strip()]
+    conditions = []
+    params = {'pick_limit': int(limit)}
+
+    for i, col in enumerate(filled):
+        column = catalog.get_column(table_name, col)
+        term = str(terms[col]).strip()
+        name = f"pick_{i}"
+        is_last = i == len(filled) - 1
+        if column is not None and is_numeric_column(column['type']):
+            try:
+                params[name] = float(term) if not term.lstrip('-').isdigit() else int(term)
+            except ValueError:
+                raise ValueError(f"{col} must be a number")
+            conditions.append(f"{col} >= :{name}" if is_last else f"{col} = :{name}")
+        elif is_last:
+            params[name] = escape_like(term) + '%'
+            conditions.append(f"{col} LIKE :{name} ESCAPE '!'")
+        else:
+            params[name] = term
+            conditions.append(f"{col} = :{name}")
+
+    where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = (f"SELECT {', '.join(key_columns)} FROM {table_name}{where_clause} "
+           f"ORDER BY {', '.join(key_columns)} LIMIT :pick_limit")
+    return sql, params
+
+def search_record_keys(table_name, key_columns, terms, limit=RECORD_PICKER_LIMIT):
+    """Up to `limit` key tuples matching the type-ahead terms"""
+    sql, params = build_key_search_query(table_name, key_columns, terms, limit)
+    with get_engine().connect() as conn:
+        return [tuple(row) for row in conn.execute(text(sql), params)]
+
+def fetch_record(table_name, key_columns, key):
+    """One row by primary key (a single index lookup); None if it no longer exists"""
+    where_clause = " AND ".join(f"{col} = :pk_{i}" for i, col in enumerate(key_columns))
+    params = {f"pk_{i}": to_python_value(value) for i, value in enumerate(key)}
+    with get_engine().connect() as conn:
+        df = pd.read_sql(text(f"SELECT * FROM {table_name} WHERE {where_clause} LIMIT 1"), conn, params=params)
+    return None if df.empty else df.iloc[0]
+
+def render_record_picker(table_name, key_prefix):
+    """Search by primary key and load the chosen row; returns (key, row) or (None, None)"""
+    key_columns = get_primary_key(table_name)
+    if not key_columns:
+        st.warning(f"{table_name} has no key to look records up by")
+        return None, None
+
+    inputs = st.columns(len(key_columns))
+    terms = {col: field.text_input(f"🔑 {col}", "", key=f"{key_prefix}_term_{col}",
+                                   placeholder="starts with / from")
+             for col, field in zip(key_columns, inputs)}
+
+    try:
+        keys = search_record_keys(table_name, key_columns, terms)
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        return None, None
+
+    if not keys:
+        st.info("No matching records")
+        return None, None
+
+    label = lambda key: ", ".join(f"{col}={value}" for col, value in zip(key_columns, key))
+    selected = st.selectbox(f"Matching records (first {RECORD_PICKER_LIMIT})", keys, format_func=label,
+                            key=f"{key_prefix}_pick")
+    row = fetch_record(table_name, key_columns, selected)
+    if row is None:
+        st.warning("That record no longer exists")
+        return None, None
+    return selected, row
+
+# =====================================================
+# AUDIT EXPLORER
+# =====================================================
+
+# *_audit tables filled by the triggers in security/Trigers.sql -> ID column of the audited record
+AUDIT_TABLES = {
+    'customer_audit': 'CustomerID',
+    'card_audit': 'CardID',
+    'product_audit': 'ProductID',
+    'orders_audit': 'OrderID',
+    'payment_audit': 'PaymentID'
+}
+AUDIT_ACTIONS = ['INSERT', 'UPDATE', 'DELETE']
+# Events per Audit Explorer page (each table is read in batches of this size)
+AUDIT_PAGE_SIZE = int(os.getenv('DASHBOARD_AUDIT_PAGE_SIZE', 100))
+AUDIT_KEY_COLUMNS = ['ChangeTimestamp', 'AuditID']
+
+def build_audit_query(table_name, entity_id=None, actions=None, changed_by=None, start=None, end=None,
+                      before=None, limit=AUDIT_PAGE_SIZE):
+    """Newest-first keyset query over one audit table
+
+    `before` is the (ChangeTimestamp, AuditID) of the last row already read;
+    the batch continues strictly below it, so every batch is an index range
+    scan instead of an OFFSET. With `entity_id` the (entity ID,
+    ChangeTimestamp) index is used; a start/end range prunes partitions.
+
+    Returns:
+        (sql, params)
+    """
+    conditions = []
+    params = {'limit': int(limit)}
+    if entity_id is not None:
+        conditions.append(f"{AUDIT_TABLES[table_name]} = :entity_id")
+        params['entity_id'] = entity_id
+    if actions:
+        names = [f"action_{i}" for i in range(len(actions))]
+        conditions.append(f"ActionType IN ({', '.join(':' + n for n in names)})")
+        params.update(zip(names, actions))
+    if changed_by:
+        # USER() is stored as user@host, so match on the prefix
+        conditions.append("ChangedBy LIKE :changed_by ESCAPE '!'")
+        params['changed_by'] = escape_like(changed_by) + '%'
+    if start is not None:
+        conditions.append("ChangeTimestamp >= :start")
+        params['start'] = start
+    if end is not None:
+        conditions.append("ChangeTimestamp < :end")
+        params['end'] = end
+    if before is not None:
+        predicate, key_params = build_keyset_predicate(AUDIT_KEY_COLUMNS, before, direction='before')
+        conditions.append(predicate)
+        params.update(key_params)
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"SELECT * FROM {table_name}{where} ORDER BY ChangeTimestamp DESC, AuditID DESC LIMIT :limit"
+    return sql, params
+
+def audit_changes(row):
+    """[(field, old, new)] for the Old*/New* column pairs of one audit row that differ"""
+    fields = sorted({column[3:] for column in row if column.startswith(('Old', 'New'))})
+    changes = []
+    for field in fields:
+        old = row.get(f"Old{field}")
+        new = row.get(f"New{field}")
+        old = None if pd.isna(old) else old
+        new = None if pd.isna(new) else new
+        if old != new:
+            changes.append((field, old, new))
+    return changes
+
+def iter_audit_table(table_name, filters=None, before=None, batch_size=AUDIT_PAGE_SIZE, engine=None):
+    """Yield the matching events of one audit table, newest first, one keyset batch at a time"""
+    while True:
+        sql, params = build_audit_query(table_name, before=before, limit=batch_size, **(filters or {}))
+        batch = cached_read_sql(sql, params, engine=engine, tables=[table_name])
+        for row in batch.to_dict('records'):
+            # The raw values continue the keyset; the parsed timestamp orders the merge
+            before = (to_python_value(row['ChangeTimestamp']), int(row['AuditID']))
+            yield {
+                'ChangeTimestamp': pd.Timestamp(row['ChangeTimestamp']),
+                'Table': table_name,
+                'AuditID': int(row['AuditID']),
+                'EntityID': row[AUDIT_TABLES[table_name]],
+                'ActionType': row['ActionType'],
+                'ChangedBy': row['ChangedBy'],
+                'Changes': "; ".join(f"{field}: {old} → {new}" for field, old, new in audit_changes(row)),
+                'cursor': before
+            }
+        if len(batch) < batch_size:
+            return
+
+def iter_audit_events(filters=None, tables=None, cursors=None, batch_size=AUDIT_PAGE_SIZE, engine=None):
+    """Matching events of several audit tables as one newest-first stream
+
+    Each table is read lazily through its own keyset cursor and the streams
+    are combined with a k-way heapq.merge, so producing N events reads at
+    most N + batch_size rows per table, whatever the size of the history.
+    """
+    cursors = cursors or {}
+    streams = [iter_audit_table(t, filters, cursors.get(t), batch_size, engine) for t in tables or AUDIT_TABLES]
+    return heapq.merge(*streams, key=lambda e: (e['ChangeTimestamp'], e['AuditID']), reverse=True)
+
+def fetch_audit_page(filters=None, tables=None, cursors=None, limit=AUDIT_PAGE_SIZE, engine=None):
+    """One page of the merged audit stream
+
+    Args:
+        filters: entity_id, actions, changed_by, start, end (see build_audit_query)
+        cursors: {table: (ChangeTimestamp, AuditID)} returned for the previous page
+
+    Returns:
+        (events DataFrame, next_cursors, has_more)
+    """
+    tables = list(tables or AUDIT_TABLES)
+    events = list(itertools.islice(iter_audit_events(filters, tables, cursors, limit, engine), limit + 1))
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    next_cursors = dict(cursors or {})
+    for event in events:
+        next_cursors[event['Table']] = event.pop('cursor')
+    columns = ['ChangeTimestamp', 'Table', 'AuditID', 'EntityID', 'ActionType', 'ChangedBy', 'Changes']
+    df = pd.DataFrame(events, columns=columns)
+    if COMPACT_DTYPES_ENABLED:
+        # The audit tables share one ActionType CHECK domain
+        df = compact_dtypes(df, tables[0])
+    return df, next_cursors, has_more
+
+def fetch_entity_history(table_name, entity_id, engine=None):
+    """Field-level change history of one audited record, oldest first
+
+    Reads only that record's rows, through the (entity ID, ChangeTimestamp)
+    index. One row per changed field.
+    """
+    entity_column = AUDIT_TABLES[table_name]
+    df = cached_read_sql(
+        f"SELECT * FROM {table_name} WHERE {entity_column} = :entity_id ORDER BY ChangeTimestamp, AuditID",
+        {'entity_id': entity_id}, engine=engine, tables=[table_name]
+    )
+    history = []
+    for row in df.to_dict('records'):
+        for field, old, new in audit_changes(row):
+            history.append({
+                'ChangeTimestamp': row['ChangeTimestamp'],
+                'AuditID': row['AuditID'],
+                'ActionType': row['ActionType'],
+                'ChangedBy': row['ChangedBy'],
+                'Field': field,
+                # Fields of different types share these columns
+                'OldValue': None if old is None else str(old),
+                'NewValue': None if new is None else str(new)
+            })
+    columns = ['ChangeTimestamp', 'AuditID', 'ActionType', 'ChangedBy', 'Field', 'OldValue', 'NewValue']
+    return pd.DataFrame(history, columns=columns)
+
+def render_audit_explorer():
+    """Admin page: filtered, time-ordered audit events across tables and one record's history"""
+    catalog = get_schema_catalog()
+    available = [t for t in AUDIT_TABLES if catalog.resolve(t)]
+    if not available:
+        st.warning("No audit tables found - run security/AuditTrailTables.sql and security/Trigers.sql")
+        return
+
+    st.subheader("🔎 Audit Events")
+    col1, col2, col3 = st.columns(3)
+    tables = col1.multiselect("Tables", available, default=available, key="audit_tables")
+    actions = col2.multiselect("Action", AUDIT_ACTIONS, key="audit_actions")
+    changed_by = col3.text_input("Changed by (user prefix)", key="audit_changed_by").strip()
+
+    col1, col2 = st.columns(2)
+    entity_text = col1.text_input("Record ID", key="audit_entity_id",
+                                  help="ID of the audited record (CustomerID, OrderID, ...) in each selected table")
+    date_range = col2.date_input("Date range", value=(), key="audit_date_range")
+
+    filters = {'actions': actions, 'changed_by': changed_by}
+    if entity_text.strip():
+        try:
+            filters['entity_id'] = int(entity_text)
+        except ValueError:
+            st.error("Record ID must be a whole number")
+            return
+    if len(date_range) == 2:
+        filters['start'] = datetime.combine(date_range[0], datetime.min.time())
+        filters['end'] = datetime.combine(date_range[1], datetime.min.time()) + pd.Timedelta(days=1)
+
+    if not tables:
+        st.info("Select at least one table")
+        return
+
+    # Page history is a stack of per-table cursors; any filter change starts over
+    signature = (tuple(tables), repr(sorted(filters.items())))
+    state = st.session_state.get('audit_page_state')
+    if not state or state['signature'] != signature:
+        state = {'signature': signature, 'pages': [{}]}
+        st.session_state['audit_page_state'] = state
+
+    try:
+        events, next_cursors, has_more = fetch_audit_page(filters, tables, state['pages'][-1])
+    except Exception as e:
+        st.error(f"Error reading audit tables: {str(e)}")
+        return
+
+    st.dataframe(events, use_container_width=True, hide_index=True)
+    st.caption(f"Page {len(state['pages'])} | newest first across {len(tables)} tables")
+
+    def go_next():
+        state['pages'].append(next_cursors)
+
+    def go_prev():
+        state['pages'].pop()
+
+    nav_prev, nav_next = st.columns(2)
+    nav_prev.button("◀ Newer", key="audit_prev", disabled=len(state['pages']) == 1,
+                    on_click=go_prev, use_container_width=True)
+    nav_next.button("Older ▶", key="audit_next", disabled=not has_more,
+                    on_click=go_next, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("🕰️ Record History")
+    col1, col2 = st.columns(2)
+    history_table = col1.selectbox("Table", available, key="audit_history_table")
+    history_id = col2.text_input(f"{AUDIT_TABLES[history_table]}", key="audit_history_id").strip()
+    if history_id:
+        try:
+            history = fetch_entity_history(history_table, int(history_id))
+        except ValueError:
+            st.error(f"{AUDIT_TABLES[history_table]} must be a whole number")
+            return
+        except Exception as e:
+            st.error(f"Error reading history: {str(e)}")
+            return
+        if history.empty:
+            st.info(f"No audit history for {AUDIT_TABLES[history_table]} {history_id}")
+        else:
+            st.dataframe(history, use_container_width=True, hide_index=True)
+            st.caption(f"{history['AuditID'].nunique()} changes, {len(history)} field updates")
+
 # =====================================================
 # CRUD OPERATIONS
 # =====================================================
@@ -370,8 +2811,23 @@ def create_record(table_name):
     """Create a new record in the selected table"""
     st.subheader(f"➕ Add New Record to {table_name}")
 
+    entry_mode = st.radio("Entry mode", ["Single record", "Bulk import"], horizontal=True,
+                          key=f"create_mode_{table_name}")
+    if entry_mode == "Bulk import":
+        render_bulk_import(table_name)
+        return
+
+    created = st.session_state.pop(f"create_last_id_{table_name}", None)
+    if created:
+        id_column, new_id = created
+        if id_column and new_id:
+            st.success(f"✅ Record created successfully in {table_name} with {id_column} **{new_id}**!")
+        else:
+            st.success(f"✅ Record created successfully in {table_name}!")
+
     columns = get_table_columns(table_name)
     pk_columns = get_primary_key(table_name)
+    auto_id_column = None
 
     with st.form(f"create_form_{table_name}"):
         form_data = {}
@@ -388,7 +2844,11 @@ def create_record(table_name):
 
             if is_auto_id:
                 next_id = get_next_id(table_name, col_name)
-                st.info(f"🔢 {col_name} (Auto-generated): **{next_id}**")
+                if next_id is not None:
+                    st.info(f"🔢 {col_name} (Auto-generated): probably **{next_id}** - the actual ID is shown after saving")
+                else:
+                    st.info(f"🔢 {col_name} (Auto-generated): assigned when the record is saved")
+                auto_id_column = col_name
                 continue
 
             # Check for domain constraints (CHECK IN constraint)
@@ -425,54 +2885,44 @@ def create_record(table_name):
                     date_error = True
 
             if not date_error:
-                # Build INSERT query with placeholders
-                columns_str = ", ".join(form_data.keys())
-                placeholders = ", ".join([f":{key}" for key in form_data.keys()])
-                query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
-
-                success, message = execute_sql(query, form_data)
+                success, message, new_id = insert_record(table_name, form_data)
 
                 if success:
-                    st.success(f"✅ Record created successfully in {table_name}!")
+                    # Shown after the rerun below
+                    st.session_state[f"create_last_id_{table_name}"] = (auto_id_column, new_id)
                     st.rerun()
                 else:
                     st.error(f"❌ Error creating record: {message}")
 
 def read_records(table_name):
-    """Display all records from the selected table"""
+    """Display records from the selected table, one page at a time"""
     st.subheader(f"📊 View All Records from {table_name}")
 
-    df = fetch_table_data(table_name)
+    df = render_paginated_table(table_name, key_prefix=f"read_{table_name}")
 
-    if not df.empty:
-        st.dataframe(df, use_container_width=True, height=400)
-        st.info(f"Total records: {len(df)}")
-    else:
+    if df.empty:
         st.warning(f"No records found in {table_name}")
+    else:
+        render_export_controls(table_name, key_prefix=f"read_{table_name}")
 
 def update_record(table_name):
     """Update an existing record"""
     st.subheader(f"✏️ Update Record in {table_name}")
 
-    df = fetch_table_data(table_name)
-
-    if df.empty:
-        st.warning(f"No records available to update in {table_name}")
+    if st.radio("Update mode", ["Single record", "Batch"], horizontal=True,
+                key=f"update_mode_{table_name}") == "Batch":
+        render_batch_update(table_name)
         return
 
     pk_columns = get_primary_key(table_name)
 
-    # Let user select a record to update
-    st.write("Select a record to update:")
-    selected_index = st.selectbox(
-        "Choose record by index",
-        options=range(len(df)),
-        format_func=lambda x: f"Row {x}: {dict(df.iloc[x])}",
-        key=f"update_select_{table_name}"
-    )
+    # Look the record up by primary key instead of loading the table
+    st.write("Find the record to update:")
+    selected_key, selected_row = render_record_picker(table_name, key_prefix=f"update_{table_name}")
 
-    if selected_index is not None:
-        selected_row = df.iloc[selected_index]
+    if selected_row is not None:
+        # Widget keys follow the record so the form resets when another one is picked
+        selected_index = "_".join(str(value) for value in selected_key)
         columns = get_table_columns(table_name)
 
         with st.form(f"update_form_{table_name}", clear_on_submit=False):
@@ -486,7 +2936,7 @@ def update_record(table_name):
 
                 # Store primary key values separately and show as read-only
                 if col_name in pk_columns:
-                    pk_values[col_name] = current_value
+                    pk_values[col_name] = to_python_value(current_value)
                     st.info(f"🔑 {col_name} (Primary Key - Cannot be modified): **{current_value}**")
                     continue
 
@@ -578,46 +3028,16 @@ def delete_record(table_name):
     """Delete a record from the table"""
     st.subheader(f"🗑️ Delete Record from {table_name}")
 
-    df = fetch_table_data(table_name)
-
-    if df.empty:
-        st.warning(f"No records available to delete in {table_name}")
+    if st.radio("Delete mode", ["Single record", "Batch"], horizontal=True,
+                key=f"delete_mode_{table_name}") == "Batch":
+        render_batch_delete(table_name)
         return
 
     pk_columns = get_primary_key(table_name)
 
-    # Display all records in a table first
-    st.write("### All Records:")
-    st.dataframe(df, use_container_width=True, height=300)
-
-    st.write("---")
-
-    # Let user select a record to delete by primary key
-    st.write("### Select a record to delete:")
-
-    # Create a more user-friendly display for selection
-    if len(pk_columns) == 1:
-        # Single primary key - show as simple dropdown
-        pk_col = pk_columns[0]
-        pk_values_list = df[pk_col].tolist()
-
-        selected_pk = st.selectbox(
-            f"Choose by {pk_col}",
-            options=pk_values_list,
-            format_func=lambda x: f"{pk_col}: {x}",
-            key=f"delete_select_{table_name}"
-        )
-
-        selected_row = df[df[pk_col] == selected_pk].iloc[0]
-    else:
-        # Composite primary key - use index-based selection
-        selected_index = st.selectbox(
-            "Choose record by row number",
-            options=range(len(df)),
-            format_func=lambda x: f"Row {x}: {dict(df.iloc[x])}",
-            key=f"delete_select_{table_name}"
-        )
-        selected_row = df.iloc[selected_index]
+    # Look the record up by primary key instead of loading the table
+    st.write("### Find the record to delete:")
+    selected_key, selected_row = render_record_picker(table_name, key_prefix=f"delete_{table_name}")
 
     if selected_row is not None:
         st.warning("⚠️ **You are about to delete this record:**")
@@ -625,7 +3045,7 @@ def delete_record(table_name):
         # Display selected record in a more readable format
         col1, col2 = st.columns([1, 3])
         with col2:
-            for col_name in df.columns:
+            for col_name in selected_row.index:
                 st.text(f"{col_name}: {selected_row[col_name]}")
 
         st.write("---")
@@ -637,7 +3057,7 @@ def delete_record(table_name):
 
             if submitted:
                 # Build DELETE query with placeholders
-                pk_values = {col: selected_row[col] for col in pk_columns}
+                pk_values = {col: to_python_value(selected_row[col]) for col in pk_columns}
                 where_clause = " AND ".join([f"{key}=:{key}" for key in pk_values.keys()])
                 query = f"DELETE FROM {table_name} WHERE {where_clause}"
 
@@ -653,40 +3073,480 @@ def delete_record(table_name):
 # VISUALIZATIONS
 # =====================================================
 
+# SQL behind each chart, keyed like ROLE_PERMISSIONS['visualizations']
+VIZ_QUERIES = {
+    'customer_age': """
+        WITH valid AS (
+            SELECT TIMESTAMPDIFF(YEAR, DOB, CURDATE()) AS Age
+            FROM customer
+            WHERE DOB IS NOT NULL
+            AND DOB BETWEEN CURDATE() - INTERVAL 121 YEAR AND CURDATE()
+        ),
+        bounds AS (
+            SELECT MIN(Age) AS MinAge, AVG(Age) AS AvgAge, COUNT(*) AS Customers,
+                   GREATEST(CEIL((MAX(Age) - MIN(Age) + 1) / :bins), 1) AS BucketWidth
+            FROM valid
+            WHERE Age BETWEEN 0 AND 120
+        )
+        SELECT b.MinAge + FLOOR((v.Age - b.MinAge) / b.BucketWidth) * b.BucketWidth AS BucketStart,
+               b.BucketWidth, COUNT(*) AS CustomerCount, b.AvgAge, b.Customers
+        FROM valid v
+        CROSS JOIN bounds b
+        WHERE v.Age BETWEEN 0 AND 120
+        GROUP BY BucketStart, b.BucketWidth, b.AvgAge, b.Customers
+        ORDER BY BucketStart
+    """,
+    'customer_growth': """
+        SELECT DATE(RegistrationDate) as RegDate, COUNT(*) as CustomerCount
+        FROM customer
+        WHERE RegistrationDate IS NOT NULL
+        GROUP BY DATE(RegistrationDate)
+        ORDER BY DATE(RegistrationDate)
+    """,
+    'customer_account_status': """
+        SELECT AccountStatus, COUNT(*) as Count
+        FROM customer
+        WHERE AccountStatus IS NOT NULL
+        GROUP BY AccountStatus
+    """,
+    'product_sales': """
+        SELECT p.ProductName,
+               COALESCE(SUM(op.Quantity), 0) as TotalSold
+        FROM product p
+        LEFT JOIN orderProduct op ON p.ProductID = op.ProductID
+        WHERE p.ProductName IS NOT NULL
+        GROUP BY p.ProductID, p.ProductName
+        ORDER BY TotalSold DESC
+        LIMIT 20
+    """,
+    'product_stock': """
+        SELECT StockStatus, COUNT(*) as Count
+        FROM product
+        WHERE StockStatus IS NOT NULL
+        GROUP BY StockStatus
+    """,
+    'order_amount': """
+        WITH ranked AS (
+            SELECT {bucket} AS Bucket, TotalAmount,
+                   ROW_NUMBER() OVER (PARTITION BY {bucket} ORDER BY TotalAmount) AS AmountRank,
+                   COUNT(*) OVER (PARTITION BY {bucket}) AS BucketOrders
+            FROM orders
+            WHERE OrderDate >= :start AND OrderDate < :end AND TotalAmount IS NOT NULL
+        )
+        SELECT Bucket, COUNT(*) AS OrderCount, SUM(TotalAmount) AS Revenue,
+               AVG(TotalAmount) AS AvgAmount,
+               MIN(CASE WHEN AmountRank * 100 >= BucketOrders * 95 THEN TotalAmount END) AS P95Amount
+        FROM ranked
+        GROUP BY Bucket
+        ORDER BY Bucket
+    """,
+    'order_status': """
+        SELECT OrderStatus, COUNT(*) as Count
+        FROM orders
+        WHERE OrderStatus IS NOT NULL
+        GROUP BY OrderStatus
+    """,
+    'payment_status': """
+        SELECT PaymentStatus, COUNT(*) as Count, SUM(Amount) as TotalAmount
+        FROM payment
+        WHERE PaymentStatus IS NOT NULL
+        GROUP BY PaymentStatus
+    """
+}
+
+# Same charts served from the rollup tables in "Basic Operations/rollups.sql"
+ROLLUP_QUERIES = {
+    'customer_growth': """
+        SELECT RegDate, CustomerCount
+        FROM daily_customer_registrations
+        ORDER BY RegDate
+    """,
+    'product_sales': """
+        SELECT p.ProductName,
+               COALESCE(t.UnitsSold, 0) as TotalSold
+        FROM product p
+        LEFT JOIN product_sales_totals t ON p.ProductID = t.ProductID
+        WHERE p.ProductName IS NOT NULL
+        ORDER BY TotalSold DESC
+        LIMIT 20
+    """,
+    'order_status': """
+        SELECT Status as OrderStatus, StatusCount as Count
+        FROM status_counts
+        WHERE EntityType = 'orders' AND StatusCount > 0
+    """,
+    'payment_status': """
+        SELECT Status as PaymentStatus, StatusCount as Count, TotalAmount
+        FROM status_counts
+        WHERE EntityType = 'payment' AND StatusCount > 0
+    """
+}
+
+def rollups_available(viz_key, engine=None):
+    """True if every table the chart's rollup query reads is visible to this role"""
+    if viz_key not in ROLLUP_QUERIES:
+        return False
+    catalog = get_schema_catalog(engine)
+    return all(catalog.resolve(table) for table in referenced_tables(ROLLUP_QUERIES[viz_key]))
+
+# Number of buckets in the customer age histogram
+AGE_BUCKETS = 20
+
+def compute_age_buckets(dobs, today=None, bins=AGE_BUCKETS):
+    """Vectorized age histogram for backends without TIMESTAMPDIFF
+
+    Ages are whole years as of `today` (a birthday that hasn't happened yet
+    this year doesn't count, so Feb 29 birthdays are handled correctly).
+    Returns the same columns as the SQL version of VIZ_QUERIES['customer_age'].
+    """
+    dob = pd.to_datetime(pd.Series(dobs), errors='coerce').dropna().to_numpy(dtype='datetime64[D]')
+    today = np.datetime64(today or date.today(), 'D')
+
+    years = dob.astype('datetime64[Y]').astype(int) + 1970
+    months = dob.astype('datetime64[M]').astype(int) % 12 + 1
+    days = (dob - dob.astype('datetime64[M]')).astype(int) + 1
+    today_year = today.astype('datetime64[Y]').astype(int) + 1970
+    today_month = today.astype('datetime64[M]').astype(int) % 12 + 1
+    today_day = (today - today.astype('datetime64[M]')).astype(int) + 1
+
+    before_birthday = (months > today_month) | ((months == today_month) & (days > today_day))
+    ages = today_year - years - before_birthday.astype(int)
+    ages = ages[(ages >= 0) & (ages <= 120)]
+
+    columns = ['BucketStart', 'BucketWidth', 'CustomerCount', 'AvgAge', 'Customers']
+    if len(ages) == 0:
+        return pd.DataFrame(columns=columns)
+
+    low = int(ages.min())
+    width = max(int(np.ceil((ages.max() - low + 1) / bins)), 1)
+    starts, counts = np.unique(low + (ages - low) // width * width, return_counts=True)
+    return pd.DataFrame({
+        'BucketStart': starts,
+        'BucketWidth': width,
+        'CustomerCount': counts,
+        'AvgAge': float(ages.mean()),
+        'Customers': len(ages)
+    }, columns=columns)
+
+def load_age_buckets(params=None, engine=None):
+    """Age histogram buckets - computed in MySQL, or with NumPy over the DOB column elsewhere"""
+    engine = engine if engine is not None else get_engine()
+    if engine.dialect.name == 'mysql':
+        return cached_read_sql(VIZ_QUERIES['customer_age'], {'bins': AGE_BUCKETS}, engine)
+    dobs = cached_read_sql("SELECT DOB FROM customer WHERE DOB IS NOT NULL", engine=engine)
+    return compute_age_buckets(dobs['DOB'])
+
+# Most points the order time series sends to the browser
+CHART_MAX_POINTS = int(os.getenv('DASHBOARD_CHART_MAX_POINTS', 2000))
+
+# Bucket start expressions for the order time series, per SQL dialect
+TIME_BUCKET_EXPRESSIONS = {
+    'mysql': {
+        'hour': "DATE_FORMAT(OrderDate, '%Y-%m-%d %H:00:00')",
+        'day': "DATE(OrderDate)",
+        'week': "DATE(OrderDate) - INTERVAL WEEKDAY(OrderDate) DAY",
+        'month': "DATE_FORMAT(OrderDate, '%Y-%m-01')"
+    },
+    'sqlite': {
+        'hour': "strftime('%Y-%m-%d %H:00:00', OrderDate)",
+        'day': "date(OrderDate)",
+        'week': "date(OrderDate, 'weekday 0', '-6 days')",
+        'month': "strftime('%Y-%m-01', OrderDate)"
+    }
+}
+
+TIME_BUCKET_SPANS = {
+    'hour': pd.Timedelta(hours=1),
+    'day': pd.Timedelta(days=1),
+    'week': pd.Timedelta(weeks=1),
+    'month': pd.Timedelta(days=31)
+}
+
+def choose_time_granularity(start, end, max_points=CHART_MAX_POINTS):
+    """Finest bucket size that keeps the range within max_points buckets"""
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for granularity, bucket in TIME_BUCKET_SPANS.items():
+        if span / bucket <= max_points:
+            return granularity
+    return 'month'
+
+def lttb_downsample(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the series' shape
+
+    The first and last points are always kept; every bucket in between keeps the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous]) -
+                      (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(area.argmax())
+        keep[i + 1] = previous
+    return keep
+
+def get_order_date_range(engine=None):
+    """(first, last) OrderDate, or (None, None) when there are no orders"""
+    df = cached_read_sql("SELECT MIN(OrderDate) AS FirstOrder, MAX(OrderDate) AS LastOrder FROM orders",
+                         engine=engine)
+    if df.empty or pd.isna(df['FirstOrder'].iloc[0]):
+        return None, None
+    return pd.to_datetime(df['FirstOrder'].iloc[0]), pd.to_datetime(df['LastOrder'].iloc[0])
+
+def load_order_series(params=None, engine=None):
+    """Order count, revenue, average and p95 amount per time bucket
+
+    params: start / end (end exclusive) and an optional granularity; without one
+    the finest granularity within CHART_MAX_POINTS buckets is used.
+    """
+    engine = engine if engine is not None else get_engine()
+    params = dict(params or {})
+    if 'start' not in params or 'end' not in params:
+        first, last = get_order_date_range(engine)
+        if first is None:
+            return pd.DataFrame(columns=['Bucket', 'OrderCount', 'Revenue', 'AvgAmount', 'P95Amount'])
+        params.setdefault('start', first)
+        params.setdefault('end', last + pd.Timedelta(seconds=1))
+    granularity = params.pop('granularity', None) or choose_time_granularity(params['start'], params['end'])
+
+    expressions = TIME_BUCKET_EXPRESSIONS.get(engine.dialect.name, TIME_BUCKET_EXPRESSIONS['mysql'])
+    sql = VIZ_QUERIES['order_amount'].format(bucket=expressions[granularity])
+    bind = {'start': pd.Timestamp(params['start']).to_pydatetime(),
+            'end': pd.Timestamp(params['end']).to_pydatetime()}
+    return cached_read_sql(sql, bind, engine)
+
+# Charts whose data needs more than a single cached query
+VIZ_LOADERS = {
+    'customer_age': load_age_buckets,
+    'order_amount': load_order_series
+}
+
+def load_viz_data(viz_key, params=None, engine=None):
+    """Run a chart's query through the result cache, preferring its rollup table"""
+    if viz_key in VIZ_LOADERS:
+        return VIZ_LOADERS[viz_key](params=params, engine=engine)
+    try:
+        use_rollup = rollups_available(viz_key, engine)
+    except Exception:
+        use_rollup = False
+    sql = ROLLUP_QUERIES[viz_key] if use_rollup else VIZ_QUERIES[viz_key]
+    return cached_read_sql(sql, params, engine)
+
+def refresh_rollups(full_rebuild=False):
+    """Run the incremental (or full) rollup refresh now instead of waiting for the event"""
+    success, message = execute_sql("CALL refresh_dashboard_rollups(:full)", {'full': bool(full_rebuild)})
+    if success:
+        get_result_cache().invalidate_tables(
+            {'daily_product_sales', 'product_sales_totals', 'daily_customer_registrations',
+             'status_counts', 'rollup_watermark'}
+        )
+    return success, message
+
+def customer_age_figure(df):
+    """Histogram of the customer_age buckets; returns (figure, prepared df), figure None without data"""
+    with profile_phase("transform"):
+        df['BucketStart'] = pd.to_numeric(df['BucketStart'], errors='coerce')
+        df['BucketWidth'] = pd.to_numeric(df['BucketWidth'], errors='coerce')
+        df['CustomerCount'] = pd.to_numeric(df['CustomerCount'], errors='coerce').fillna(0)
+        df = df.dropna(subset=['BucketStart', 'BucketWidth'])
+        if df.empty:
+            return None, df
+        width = int(df['BucketWidth'].iloc[0])
+        df['AgeRange'] = df['BucketStart'].astype(int).astype(str) + '-' + \
+            (df['BucketStart'] + width - 1).astype(int).astype(str)
+
+    with profile_phase("figure build"):
+        fig = go.Figure(go.Bar(
+            x=df['BucketStart'] + width / 2,
+            y=df['CustomerCount'],
+            width=width,
+            customdata=df['AgeRange'],
+            hovertemplate='Age %{customdata}<br>Customers: %{y}<extra></extra>'
+        ))
+        fig.update_layout(title='Customer Age Distribution', bargap=0,
+                          xaxis_title='Age (years)', yaxis_title='Number of Customers')
+        fig.update_traces(marker_color='lightblue', marker_line_color='darkblue', marker_line_width=1.5)
+    return fig, df
+
+def customer_growth_figure(df):
+    """Cumulative registrations line; returns (figure, prepared df), figure None without data"""
+    with profile_phase("transform"):
+        # Convert dates with error handling
+        df['RegDate'] = pd.to_datetime(df['RegDate'], errors='coerce')
+        df = df.dropna(subset=['RegDate'])
+        if len(df) == 0:
+            return None, df
+
+        # Ensure CustomerCount is numeric
+        df['CustomerCount'] = pd.to_numeric(df['CustomerCount'], errors='coerce').fillna(0)
+        df['CumulativeCustomers'] = df['CustomerCount'].cumsum()
+
+    with profile_phase("figure build"):
+        fig = px.line(df, x='RegDate', y='CumulativeCustomers',
+                     title='Cumulative Customer Growth',
+                     labels={'RegDate': 'Date', 'CumulativeCustomers': 'Total Customers'})
+        fig.update_traces(line_color='green', line_width=3)
+    return fig, df
+
+def product_sales_figure(df):
+    """Top products bar chart; returns (figure, prepared df), figure None without data"""
+    with profile_phase("transform"):
+        # Ensure TotalSold is numeric
+        df['TotalSold'] = pd.to_numeric(df['TotalSold'], errors='coerce').fillna(0)
+    if len(df) == 0:
+        return None, df
+
+    with profile_phase("figure build"):
+        fig = px.bar(df, x='ProductName', y='TotalSold',
+                    title='Top 20 Products by Sales',
+                    labels={'ProductName': 'Product', 'TotalSold': 'Total Units Sold'},
+                    color='TotalSold',
+                    color_continuous_scale='Blues')
+        # Rotate x-axis labels for better readability
+        fig.update_layout(xaxis_tickangle=-45)
+    return fig, df
+
+def order_amount_figure(df, measure='Revenue', granularity=None):
+    """Order amount time series (LTTB-downsampled above CHART_MAX_POINTS)
+
+    Returns (figure, prepared df), figure None without data.
+    """
+    with profile_phase("transform"):
+        df['Bucket'] = pd.to_datetime(df['Bucket'], errors='coerce')
+        df = df.dropna(subset=['Bucket'])
+        for column in ['OrderCount', 'Revenue', 'AvgAmount', 'P95Amount']:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0)
+        if df.empty:
+            return None, df
+
+        plotted = df
+        if len(df) > CHART_MAX_POINTS:
+            # A fine bucket over a long range - keep the shape, drop the excess points
+            keep = lttb_downsample(df['Bucket'].astype('int64'), df[measure], CHART_MAX_POINTS)
+            plotted = df.iloc[keep]
+
+    with profile_phase("figure build"):
+        fig = go.Figure(go.Scatter(x=plotted['Bucket'], y=plotted[measure], mode='lines',
+                                   name=measure, line=dict(width=2)))
+        if measure == 'AvgAmount':
+            fig.add_trace(go.Scatter(x=plotted['Bucket'], y=plotted['P95Amount'], mode='lines',
+                                     name='p95', line=dict(dash='dash')))
+        fig.update_layout(title=f'Order Amount Over Time (per {granularity})' if granularity else 'Order Amount Over Time',
+                          xaxis_title='Date', yaxis_title='Order Amount ($)' if measure != 'OrderCount' else 'Orders')
+    return fig, df
+
+def payment_status_figure(df):
+    """Payment status pie; returns (figure, prepared df), figure None without counts"""
+    with profile_phase("transform"):
+        # Ensure numeric columns are properly typed
+        df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
+        df['TotalAmount'] = pd.to_numeric(df['TotalAmount'], errors='coerce').fillna(0)
+    if df['Count'].sum() <= 0:
+        return None, df
+
+    with profile_phase("figure build"):
+        fig = px.pie(df, values='Count', names='PaymentStatus',
+                    title='Payment Status Distribution',
+                    color_discrete_sequence=px.colors.sequential.RdBu)
+    return fig, df
+
+def order_status_figure(df):
+    """Order status bar chart; returns (figure, prepared df), figure None without counts"""
+    with profile_phase("transform"):
+        # Ensure Count is numeric
+        df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
+    if df['Count'].sum() <= 0:
+        return None, df
+
+    with profile_phase("figure build"):
+        fig = px.bar(df, x='OrderStatus', y='Count',
+                    title='Order Status Distribution',
+                    labels={'OrderStatus': 'Status', 'Count': 'Number of Orders'},
+                    color='Count',
+                    color_continuous_scale='Viridis')
+    return fig, df
+
+def stock_status_figure(df):
+    """Stock status pie; returns (figure, prepared df), figure None without counts"""
+    with profile_phase("transform"):
+        # Ensure Count is numeric
+        df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
+    if df['Count'].sum() <= 0:
+        return None, df
+
+    with profile_phase("figure build"):
+        fig = px.pie(df, values='Count', names='StockStatus',
+                    title='Product Stock Status Distribution')
+    return fig, df
+
+def account_status_figure(df):
+    """Account status bar chart; returns (figure, prepared df), figure None without counts"""
+    with profile_phase("transform"):
+        # Ensure Count is numeric
+        df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
+    if df['Count'].sum() <= 0:
+        return None, df
+
+    with profile_phase("figure build"):
+        fig = px.bar(df, x='AccountStatus', y='Count',
+                    title='Customer Account Status Distribution',
+                    color='AccountStatus',
+                    color_discrete_sequence=px.colors.qualitative.Set2)
+    return fig, df
+
+# Chart key -> figure builder, shared by the single-chart pages and the overview
+VIZ_FIGURES = {
+    'customer_age': customer_age_figure,
+    'customer_growth': customer_growth_figure,
+    'customer_account_status': account_status_figure,
+    'product_sales': product_sales_figure,
+    'product_stock': stock_status_figure,
+    'order_amount': order_amount_figure,
+    'order_status': order_status_figure,
+    'payment_status': payment_status_figure
+}
+
+# Sidebar / panel title of each chart, in menu order
+VIZ_TITLES = {
+    'customer_age': "Customer Age Distribution",
+    'customer_growth': "Customer Growth Over Time",
+    'customer_account_status': "Customer Account Status",
+    'product_sales': "Product Sales Analysis",
+    'product_stock': "Product Stock Status",
+    'order_amount': "Order Amount Distribution",
+    'order_status': "Order Status Overview",
+    'payment_status': "Payment Status Breakdown"
+}
+
 def viz_customer_age_distribution():
     """Age Distribution of Customers"""
     st.subheader("📊 Customer Age Distribution")
 
     try:
-        engine = get_engine()
-        query = text("SELECT DOB FROM customer WHERE DOB IS NOT NULL")
+        # Bucket counts come back pre-aggregated - only ~20 rows cross the wire
+        df = load_viz_data('customer_age')
 
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        fig, df = customer_age_figure(df) if not df.empty else (None, df)
+        if fig is not None:
+            render_chart(fig)
 
-        if not df.empty and len(df) > 0:
-            # Calculate ages with proper date handling
-            df['DOB'] = pd.to_datetime(df['DOB'], errors='coerce')
-            df = df.dropna(subset=['DOB'])  # Remove invalid dates
-
-            if len(df) > 0:
-                df['Age'] = df['DOB'].apply(lambda x: (datetime.now() - x).days // 365)
-                # Filter out unrealistic ages
-                df = df[(df['Age'] >= 0) & (df['Age'] <= 120)]
-
-                if len(df) > 0:
-                    fig = px.histogram(df, x='Age', nbins=20, title='Customer Age Distribution',
-                                     labels={'Age': 'Age (years)', 'count': 'Number of Customers'})
-                    fig.update_traces(marker_color='lightblue', marker_line_color='darkblue', marker_line_width=1.5)
-                    st.plotly_chart(fig, use_container_width=True)
-
-                    st.metric("Average Age", f"{df['Age'].mean():.1f} years")
-                else:
-                    st.info("No valid age data available")
-            else:
-                st.info("No valid customer DOB data available")
+            st.metric("Average Age", f"{float(df['AvgAge'].iloc[0]):.1f} years")
         else:
-            st.info("No customer data available")
+            st.info("No valid customer DOB data available")
     except Exception as e:
         st.error(f"Error generating age distribution: {str(e)}")
 
@@ -695,33 +3555,13 @@ def viz_customer_growth():
     st.subheader("📈 Customer Growth Over Time")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT DATE(RegistrationDate) as RegDate, COUNT(*) as CustomerCount
-            FROM customer
-            WHERE RegistrationDate IS NOT NULL
-            GROUP BY DATE(RegistrationDate)
-            ORDER BY DATE(RegistrationDate)
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = load_viz_data('customer_growth')
 
         if not df.empty and len(df) > 0:
-            # Convert dates with error handling
-            df['RegDate'] = pd.to_datetime(df['RegDate'], errors='coerce')
-            df = df.dropna(subset=['RegDate'])
+            fig, df = customer_growth_figure(df)
 
-            if len(df) > 0:
-                # Ensure CustomerCount is numeric
-                df['CustomerCount'] = pd.to_numeric(df['CustomerCount'], errors='coerce').fillna(0)
-                df['CumulativeCustomers'] = df['CustomerCount'].cumsum()
-
-                fig = px.line(df, x='RegDate', y='CumulativeCustomers',
-                             title='Cumulative Customer Growth',
-                             labels={'RegDate': 'Date', 'CumulativeCustomers': 'Total Customers'})
-                fig.update_traces(line_color='green', line_width=3)
-                st.plotly_chart(fig, use_container_width=True)
+            if fig is not None:
+                render_chart(fig)
 
                 st.metric("Total Customers", int(df['CumulativeCustomers'].iloc[-1]))
             else:
@@ -736,35 +3576,14 @@ def viz_product_sales():
     st.subheader("🛒 Product Sales Analysis")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT p.ProductName,
-                   COALESCE(SUM(op.Quantity), 0) as TotalSold
-            FROM product p
-            LEFT JOIN orderProduct op ON p.ProductID = op.ProductID
-            WHERE p.ProductName IS NOT NULL
-            GROUP BY p.ProductID, p.ProductName
-            ORDER BY TotalSold DESC
-            LIMIT 20
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = load_viz_data('product_sales')
 
         if not df.empty and len(df) > 0:
-            # Ensure TotalSold is numeric
-            df['TotalSold'] = pd.to_numeric(df['TotalSold'], errors='coerce').fillna(0)
+            fig, df = product_sales_figure(df)
 
             # Only create chart if we have data
-            if len(df) > 0:
-                fig = px.bar(df, x='ProductName', y='TotalSold',
-                            title='Top 20 Products by Sales',
-                            labels={'ProductName': 'Product', 'TotalSold': 'Total Units Sold'},
-                            color='TotalSold',
-                            color_continuous_scale='Blues')
-                # Rotate x-axis labels for better readability
-                fig.update_layout(xaxis_tickangle=-45)
-                st.plotly_chart(fig, use_container_width=True)
+            if fig is not None:
+                render_chart(fig)
 
                 col1, col2 = st.columns(2)
                 col1.metric("Total Products", len(df))
@@ -781,41 +3600,46 @@ def viz_order_distribution():
     st.subheader("💰 Order Amount Distribution")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT OrderDate, TotalAmount, ShippingFee
-            FROM orders
-            WHERE OrderDate IS NOT NULL AND TotalAmount IS NOT NULL
-            ORDER BY OrderDate
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
-
-        if not df.empty and len(df) > 0:
-            # Convert dates with error handling
-            df['OrderDate'] = pd.to_datetime(df['OrderDate'], errors='coerce')
-            df = df.dropna(subset=['OrderDate', 'TotalAmount'])
-
-            # Ensure ShippingFee is numeric and handle nulls
-            df['ShippingFee'] = pd.to_numeric(df['ShippingFee'], errors='coerce').fillna(0)
-            # Ensure ShippingFee is positive for size parameter
-            df['ShippingFee'] = df['ShippingFee'].abs() + 1  # Add 1 to avoid zero size
-
-            if len(df) > 0:
-                fig = px.scatter(df, x='OrderDate', y='TotalAmount',
-                               size='ShippingFee', title='Order Amount Over Time',
-                               labels={'OrderDate': 'Date', 'TotalAmount': 'Order Amount ($)'})
-                st.plotly_chart(fig, use_container_width=True)
-
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Total Orders", len(df))
-                col2.metric("Avg Order Value", f"${df['TotalAmount'].mean():.2f}")
-                col3.metric("Total Revenue", f"${df['TotalAmount'].sum():.2f}")
-            else:
-                st.info("No valid order data available")
-        else:
+        first, last = get_order_date_range()
+        if first is None:
             st.info("No order data available")
+            return
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+        selected = col1.date_input("Date range", value=(first.date(), last.date()),
+                                   min_value=first.date(), max_value=last.date(), key="order_series_range")
+        if not isinstance(selected, (tuple, list)) or len(selected) != 2:
+            st.info("Select a start and end date")
+            return
+        start = pd.Timestamp(selected[0])
+        end = pd.Timestamp(selected[1]) + pd.Timedelta(days=1)
+
+        auto = choose_time_granularity(start, end)
+        choice = col2.selectbox("Bucket", ['auto', 'hour', 'day', 'week', 'month'],
+                                     key="order_series_granularity",
+                                     format_func=lambda g: f"auto ({auto})" if g == 'auto' else g)
+        measure = col3.selectbox("Measure", ['Revenue', 'AvgAmount', 'P95Amount', 'OrderCount'],
+                                 key="order_series_measure",
+                                 format_func=lambda m: {'Revenue': 'Revenue', 'AvgAmount': 'Average amount',
+                                                        'P95Amount': 'p95 amount', 'OrderCount': 'Orders'}[m])
+
+        granularity = auto if choice == 'auto' else choice
+        df = load_viz_data('order_amount', {'start': start, 'end': end, 'granularity': granularity})
+
+        fig, df = order_amount_figure(df, measure, granularity) if not df.empty else (None, df)
+        if fig is not None:
+            if len(df) > CHART_MAX_POINTS:
+                st.caption(f"Showing {CHART_MAX_POINTS:,} of {len(df):,} {granularity} buckets (LTTB downsampled)")
+            render_chart(fig)
+
+            orders = int(df['OrderCount'].sum())
+            revenue = float(df['Revenue'].sum())
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Total Orders", orders)
+            col2.metric("Avg Order Value", f"${revenue / orders:.2f}" if orders else "$0.00")
+            col3.metric("Total Revenue", f"${revenue:.2f}")
+        else:
+            st.info("No valid order data available")
     except Exception as e:
         st.error(f"Error generating order distribution: {str(e)}")
 
@@ -824,28 +3648,14 @@ def viz_payment_status():
     st.subheader("💳 Payment Status Breakdown")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT PaymentStatus, COUNT(*) as Count, SUM(Amount) as TotalAmount
-            FROM payment
-            WHERE PaymentStatus IS NOT NULL
-            GROUP BY PaymentStatus
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = load_viz_data('payment_status')
 
         if not df.empty and len(df) > 0:
-            # Ensure numeric columns are properly typed
-            df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
-            df['TotalAmount'] = pd.to_numeric(df['TotalAmount'], errors='coerce').fillna(0)
+            fig, df = payment_status_figure(df)
 
             # Only show chart if we have valid data
-            if df['Count'].sum() > 0:
-                fig = px.pie(df, values='Count', names='PaymentStatus',
-                            title='Payment Status Distribution',
-                            color_discrete_sequence=px.colors.sequential.RdBu)
-                st.plotly_chart(fig, use_container_width=True)
+            if fig is not None:
+                render_chart(fig)
 
                 st.dataframe(df, use_container_width=True)
             else:
@@ -860,28 +3670,13 @@ def viz_order_status():
     st.subheader("📦 Order Status Overview")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT OrderStatus, COUNT(*) as Count
-            FROM orders
-            WHERE OrderStatus IS NOT NULL
-            GROUP BY OrderStatus
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = load_viz_data('order_status')
 
         if not df.empty and len(df) > 0:
-            # Ensure Count is numeric
-            df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
-
-            if df['Count'].sum() > 0:
-                fig = px.bar(df, x='OrderStatus', y='Count',
-                            title='Order Status Distribution',
-                            labels={'OrderStatus': 'Status', 'Count': 'Number of Orders'},
-                            color='Count',
-                            color_continuous_scale='Viridis')
-                st.plotly_chart(fig, use_container_width=True)
+            fig, df = order_status_figure(df)
+
+            if fig is not None:
+                render_chart(fig)
             else:
                 st.info("No valid order status count data available")
         else:
@@ -894,25 +3689,13 @@ def viz_stock_status():
     st.subheader("📦 Stock Status Overview")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT StockStatus, COUNT(*) as Count
-            FROM product
-            WHERE StockStatus IS NOT NULL
-            GROUP BY StockStatus
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = load_viz_data('product_stock')
 
         if not df.empty and len(df) > 0:
-            # Ensure Count is numeric
-            df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
+            fig, df = stock_status_figure(df)
 
-            if df['Count'].sum() > 0:
-                fig = px.pie(df, values='Count', names='StockStatus',
-                            title='Product Stock Status Distribution')
-                st.plotly_chart(fig, use_container_width=True)
+            if fig is not None:
+                render_chart(fig)
             else:
                 st.info("No valid stock status count data available")
         else:
@@ -925,27 +3708,13 @@ def viz_customer_by_status():
     st.subheader("👥 Customer Account Status")
 
     try:
-        engine = get_engine()
-        query = text("""
-            SELECT AccountStatus, COUNT(*) as Count
-            FROM customer
-            WHERE AccountStatus IS NOT NULL
-            GROUP BY AccountStatus
-        """)
-
-        with engine.connect() as conn:
-            df = pd.read_sql(query, conn)
+        df = load_viz_data('customer_account_status')
 
         if not df.empty and len(df) > 0:
-            # Ensure Count is numeric
-            df['Count'] = pd.to_numeric(df['Count'], errors='coerce').fillna(0)
-
-            if df['Count'].sum() > 0:
-                fig = px.bar(df, x='AccountStatus', y='Count',
-                            title='Customer Account Status Distribution',
-                            color='AccountStatus',
-                            color_discrete_sequence=px.colors.qualitative.Set2)
-                st.plotly_chart(fig, use_container_width=True)
+            fig, df = account_status_figure(df)
+
+            if fig is not None:
+                render_chart(fig)
             else:
                 st.info("No valid account status count data available")
         else:
@@ -953,6 +3722,130 @@ def viz_customer_by_status():
     except Exception as e:
         st.error(f"Error generating customer status chart: {str(e)}")
 
+# =====================================================
+# DASHBOARD OVERVIEW
+# =====================================================
+
+# Panel queries running at once across all sessions (each holds one pooled connection)
+OVERVIEW_WORKERS = int(os.getenv('DASHBOARD_OVERVIEW_WORKERS', 4))
+# Seconds a panel's queries may run before they are killed
+OVERVIEW_QUERY_TIMEOUT = float(os.getenv('DASHBOARD_OVERVIEW_TIMEOUT', 20))
+
+@st.cache_resource(show_spinner=False)
+def get_query_executor():
+    """Bounded thread pool running overview panel queries for all sessions"""
+    return ThreadPoolExecutor(max_workers=OVERVIEW_WORKERS, thread_name_prefix='panel-query')
+
+def load_panel(viz_key, engine, state):
+    """Worker: load one chart's data on the shared engine; returns (df, granularity or None)
+
+    state['connections'] collects the connections the worker checks out, so the
+    script thread can kill its queries on timeout.
+    """
+    state['started'] = time.perf_counter()
+    token = CHECKOUT_SINK.set(state['connections'])
+    try:
+        with bind_engine(engine):
+            if viz_key != 'order_amount':
+                return load_viz_data(viz_key, engine=engine), None
+            first, last = get_order_date_range(engine)
+            if first is None:
+                return pd.DataFrame(), None
+            end = last + pd.Timedelta(seconds=1)
+            granularity = choose_time_granularity(first, end)
+            df = load_viz_data('order_amount', {'start': first, 'end': end, 'granularity': granularity}, engine)
+            return df, granularity
+    finally:
+        CHECKOUT_SINK.reset(token)
+        state['finished'] = time.perf_counter()
+
+def cancel_panel(engine, future, state):
+    """Drop a queued panel, or kill the queries of a running one"""
+    if future.cancel():
+        return
+    for dbapi_connection in list(state['connections']):
+        try:
+            cancel_query(engine, dbapi_connection)
+        except Exception:
+            pass
+
+def render_panel(slot, viz_key, future, state):
+    """Draw a finished panel into its placeholder"""
+    title = VIZ_TITLES[viz_key]
+    with slot.container():
+        st.markdown(f"**{title}**")
+        try:
+            df, granularity = future.result()
+            builder = VIZ_FIGURES[viz_key]
+            if df.empty:
+                fig = None
+            elif viz_key == 'order_amount':
+                fig, df = builder(df, 'Revenue', granularity)
+            else:
+                fig, df = builder(df)
+            if fig is not None:
+                render_chart(fig)
+            else:
+                st.info("No data available")
+            st.caption(f"{(state['finished'] - state['started']) * 1000:.0f} ms")
+        except Exception as e:
+            st.error(f"Error loading {title.lower()}: {str(e)}")
+
+def render_overview_page(role):
+    """Every chart the role may view, with their queries run concurrently
+
+    Panels are drawn as their queries finish, so the page takes about as long as
+    its slowest query. A panel still running after OVERVIEW_QUERY_TIMEOUT seconds
+    has its queries killed and shows a warning instead.
+    """
+    viz_keys = [k for k in VIZ_TITLES if can_view_visualization(role, k)]
+    engine = get_engine()
+    executor = get_query_executor()
+
+    columns = st.columns(2)
+    slots = {}
+    for i, viz_key in enumerate(viz_keys):
+        slots[viz_key] = columns[i % 2].empty()
+        slots[viz_key].info(f"⏳ Loading {VIZ_TITLES[viz_key].lower()}...")
+
+    started = time.perf_counter()
+    states = {k: {'connections': set(), 'started': None, 'finished': None} for k in viz_keys}
+    pending = {executor.submit(load_panel, k, engine, states[k]): k for k in viz_keys}
+    futures = dict(pending)
+    timed_out = []
+    try:
+        with profile_phase("overview queries"):
+            while pending:
+                # Wake up for the next finished panel or the next deadline, whichever comes first
+                deadlines = [states[k]['started'] + OVERVIEW_QUERY_TIMEOUT
+                             for k in pending.values() if states[k]['started'] is not None]
+                timeout = min(deadlines, default=time.perf_counter() + 0.5) - time.perf_counter()
+                done, _ = wait(pending, timeout=max(0.0, min(timeout, 0.5)), return_when=FIRST_COMPLETED)
+                for future in done:
+                    viz_key = pending.pop(future)
+                    render_panel(slots[viz_key], viz_key, future, states[viz_key])
+
+                now = time.perf_counter()
+                for future, viz_key in list(pending.items()):
+                    state = states[viz_key]
+                    if state['started'] is not None and now - state['started'] > OVERVIEW_QUERY_TIMEOUT:
+                        cancel_panel(engine, future, state)
+                        del pending[future]
+                        timed_out.append(viz_key)
+                        slots[viz_key].warning(f"⌛ {VIZ_TITLES[viz_key]}: query cancelled after "
+                                               f"{OVERVIEW_QUERY_TIMEOUT:g} s")
+    finally:
+        # A rerun interrupted the page - don't leave its queries running
+        for future, viz_key in pending.items():
+            cancel_panel(engine, future, states[viz_key])
+
+    elapsed = (time.perf_counter() - started) * 1000
+    durations = [(s['finished'] - s['started']) * 1000 for k, s in states.items()
+                 if k not in timed_out and s['finished'] is not None]
+    if durations:
+        st.caption(f"{len(futures)} panels in {elapsed:.0f} ms | slowest panel {max(durations):.0f} ms | "
+                   f"serial total {sum(durations):.0f} ms | {OVERVIEW_WORKERS} workers")
+
 # =====================================================
 # LOGIN PAGE
 # =====================================================
@@ -1034,8 +3927,25 @@ def show_login_page():
 # =====================================================
 
 def main():
+    """Run one rerun of the dashboard, profiled when DASHBOARD_PROFILE or the admin toggle is on"""
+    if not profiling_requested():
+        render_dashboard()
+        return
+
+    profiler = RerunProfiler(use_cprofile=bool(PROFILE_DUMP_DIR))
+    token = ACTIVE_PROFILER.set(profiler)
+    try:
+        render_dashboard()
+    finally:
+        ACTIVE_PROFILER.reset(token)
+    if st.session_state.get('logged_in'):
+        render_rerun_profile(profiler)
+
+def render_dashboard():
     # Check if user is logged in
-    if 'logged_in' not in st.session_state or not st.session_state.logged_in:
+    with profile_phase("auth check"):
+        logged_in = st.session_state.get('logged_in', False)
+    if not logged_in:
         show_login_page()
         return
 
@@ -1055,7 +3965,7 @@ def main():
     st.markdown("---")
 
     # Sidebar
-    with st.sidebar:
+    with st.sidebar, profile_phase("sidebar"):
         st.header("⚙️ Navigation")
 
         # User info and logout
@@ -1064,10 +3974,56 @@ def main():
         if st.button("🚪 Logout", use_container_width=True):
             logout()
 
+        # Connection pool usage across all sessions (admin only)
+        if role == 'admin_user':
+            with st.expander("🔌 Connection Pools"):
+                pool_stats = get_engine_registry().stats()
+                if pool_stats:
+                    st.dataframe(pd.DataFrame(pool_stats), use_container_width=True, hide_index=True)
+                else:
+                    st.caption("No active pools")
+
+            with st.expander("🗂️ Schema Metadata"):
+                catalog = get_schema_catalog()
+                st.caption(
+                    f"{len(catalog.table_names())} tables, {len(catalog.view_names())} views | "
+                    f"loaded {int(time.time() - catalog.loaded_at)}s ago (TTL {METADATA_TTL}s)"
+                )
+                if st.button("🔄 Reload schema", key="reload_schema", use_container_width=True):
+                    invalidate_schema_catalog()
+                    st.rerun()
+
+            if rollups_available('order_status'):
+                with st.expander("🧮 Dashboard Rollups"):
+                    try:
+                        st.dataframe(cached_read_sql("SELECT * FROM rollup_watermark"),
+                                     use_container_width=True, hide_index=True)
+                    except Exception as e:
+                        st.caption(f"Watermarks unavailable: {str(e)}")
+                    full_rebuild = st.checkbox("Full rebuild", key="rollup_full_rebuild")
+                    if st.button("🔄 Refresh rollups", key="refresh_rollups", use_container_width=True):
+                        success, message = refresh_rollups(full_rebuild)
+                        if success:
+                            st.success("✅ Rollups refreshed")
+                        else:
+                            st.error(f"❌ Error refreshing rollups: {message}")
+
+            st.checkbox("⏱️ Profile reruns", key="profile_reruns",
+                        help="Time each phase of every rerun and show a waterfall at the bottom of the page")
+
+            with st.expander("🗃️ Query Cache"):
+                cache_stats = get_result_cache().stats()
+                st.caption(f"TTL {RESULT_CACHE_TTL}s | max {RESULT_CACHE_MAX_ENTRIES} entries")
+                st.dataframe(pd.DataFrame([cache_stats]).T.rename(columns={0: 'value'}), use_container_width=True)
+                if st.button("🧹 Clear cache", key="clear_result_cache", use_container_width=True):
+                    get_result_cache().clear()
+                    st.rerun()
+
         st.markdown("---")
 
         # Get accessible tables for this role
-        tables = get_accessible_tables(role)
+        with profile_phase("table list"):
+            tables = get_accessible_tables(role)
 
         if not tables:
             st.error("No tables accessible with your permissions.")
@@ -1076,7 +4032,8 @@ def main():
         # Mode selection
         mode = st.radio(
             "Select Mode",
-            ["CRUD Operations", "View Data", "Visualizations"],
+            ["CRUD Operations", "View Data", "Visualizations"]
+            + (["Audit Explorer", "Performance"] if role == 'admin_user' else []),
             key="mode_select"
         )
 
@@ -1159,20 +4116,11 @@ def main():
                 selected_view = None
             else:
                 selected_view = st.selectbox("Select View", view_tables, key="view_select")
-        else:
+        elif mode == "Visualizations":
             st.markdown("### 📊 Visualizations")
 
             # Filter visualizations based on role permissions
-            all_viz = {
-                "Customer Age Distribution": "customer_age",
-                "Customer Growth Over Time": "customer_growth",
-                "Customer Account Status": "customer_account_status",
-                "Product Sales Analysis": "product_sales",
-                "Product Stock Status": "product_stock",
-                "Order Amount Distribution": "order_amount",
-                "Order Status Overview": "order_status",
-                "Payment Status Breakdown": "payment_status"
-            }
+            all_viz = {title: key for key, title in VIZ_TITLES.items()}
 
             available_viz = {k: v for k, v in all_viz.items() if can_view_visualization(role, v)}
 
@@ -1182,107 +4130,97 @@ def main():
             else:
                 viz_option = st.selectbox(
                     "Select Visualization",
-                    list(available_viz.keys()),
+                    ["Overview (all charts)"] + list(available_viz.keys()),
                     key="viz_select"
                 )
 
     # Main content area
-    if mode == "View Data" and selected_view:
-        st.header(f"👁️ Database View: {selected_view}")
-
-        # Add description for each view (only granted views)
-        view_descriptions = {
-            'ordersummaryview': 'Summary of all orders with customer and payment information',
-            'customerserviceview': 'Customer service overview with order and return data',
-            'returnmanagementview': 'Return management data for customer service',
-            'marketinganalyticsview': 'Marketing analytics and customer insights',
-            'activedeliveryview': 'Currently active deliveries and their status'
-        }
+    with profile_phase(f"page: {mode}"):
+        if mode == "View Data" and selected_view:
+            st.header(f"👁️ Database View: {selected_view}")
+
+            # Add description for each view (only granted views)
+            view_descriptions = {
+                'ordersummaryview': 'Summary of all orders with customer and payment information',
+                'customerserviceview': 'Customer service overview with order and return data',
+                'returnmanagementview': 'Return management data for customer service',
+                'marketinganalyticsview': 'Marketing analytics and customer insights',
+                'activedeliveryview': 'Currently active deliveries and their status'
+            }
 
-        if selected_view in view_descriptions:
-            st.info(f"📝 **Description:** {view_descriptions[selected_view]}")
+            if selected_view in view_descriptions:
+                st.info(f"📝 **Description:** {view_descriptions[selected_view]}")
 
-        # Fetch and display view data
-        try:
-            df = fetch_table_data(selected_view)
-
-            if not df.empty:
-                # Add search functionality
+            # Fetch and display view data
+            try:
+                # Add search functionality - filters are compiled into the view query
                 st.subheader("🔍 Search and Filter")
-                search_col = st.selectbox("Search by column", ["All"] + list(df.columns))
-                search_term = st.text_input("Search term", "")
-
-                # Filter data based on search
-                if search_term:
-                    if search_col == "All":
-                        # Search across all columns
-                        mask = df.astype(str).apply(lambda x: x.str.contains(search_term, case=False, na=False)).any(axis=1)
-                        filtered_df = df[mask]
-                    else:
-                        # Search in specific column
-                        mask = df[search_col].astype(str).str.contains(search_term, case=False, na=False)
-                        filtered_df = df[mask]
+                where, params = render_filter_builder(selected_view, key_prefix=f"filter_{selected_view}")
 
-                    st.dataframe(filtered_df, use_container_width=True, height=500)
-                    st.info(f"Showing {len(filtered_df)} of {len(df)} records")
-                else:
-                    st.dataframe(df, use_container_width=True, height=500)
-                    st.info(f"Total records: {len(df)}")
-
-                # Add export option
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=df.to_csv(index=False).encode('utf-8'),
-                    file_name=f"{selected_view}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+                df = render_paginated_table(selected_view, key_prefix=f"view_{selected_view}", height=500,
+                                            where=where, params=params)
+                if df.empty:
+                    st.warning(f"No matching data found in view: {selected_view}" if where
+                               else f"No data found in view: {selected_view}")
+
+                # Add export option - streams the filtered view to a file on request
+                render_export_controls(selected_view, key_prefix=f"view_{selected_view}", where=where, params=params)
 
-                # Show column statistics for numeric columns
-                numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-                if len(numeric_cols) > 0:
+                # Show column statistics for numeric columns (aggregated in SQL)
+                stats_df = get_numeric_column_stats(selected_view)
+                if not stats_df.empty:
                     st.subheader("📊 Numeric Column Statistics")
-                    st.dataframe(df[numeric_cols].describe(), use_container_width=True)
-            else:
-                st.warning(f"No data found in view: {selected_view}")
+                    st.dataframe(stats_df, use_container_width=True)
 
-        except Exception as e:
-            st.error(f"Error fetching view data: {str(e)}")
+            except Exception as e:
+                st.error(f"Error fetching view data: {str(e)}")
 
-    elif mode == "CRUD Operations" and crud_operation:
-        # Check if user has access to selected table
-        if not can_access_table(role, selected_table):
-            st.error(f"❌ Access denied: You don't have permission to access the '{selected_table}' table.")
-            st.info(f"Your role ({role_name}) can only access: {', '.join(get_accessible_tables(role))}")
-        else:
-            st.header(f"📋 {crud_operation} Operations - {selected_table}")
-
-            if crud_operation == "Create":
-                create_record(selected_table)
-            elif crud_operation == "Read":
-                read_records(selected_table)
-            elif crud_operation == "Update":
-                update_record(selected_table)
-            elif crud_operation == "Delete":
-                delete_record(selected_table)
-
-    elif mode == "Visualizations" and viz_option:
-        # All visualization permissions already checked when building the menu
-        if viz_option == "Customer Age Distribution":
-            viz_customer_age_distribution()
-        elif viz_option == "Customer Growth Over Time":
-            viz_customer_growth()
-        elif viz_option == "Customer Account Status":
-            viz_customer_by_status()
-        elif viz_option == "Product Sales Analysis":
-            viz_product_sales()
-        elif viz_option == "Product Stock Status":
-            viz_stock_status()
-        elif viz_option == "Order Amount Distribution":
-            viz_order_distribution()
-        elif viz_option == "Order Status Overview":
-            viz_order_status()
-        elif viz_option == "Payment Status Breakdown":
-            viz_payment_status()
+        elif mode == "CRUD Operations" and crud_operation:
+            # Check if user has access to selected table
+            if not can_access_table(role, selected_table):
+                st.error(f"❌ Access denied: You don't have permission to access the '{selected_table}' table.")
+                st.info(f"Your role ({role_name}) can only access: {', '.join(get_accessible_tables(role))}")
+            else:
+                st.header(f"📋 {crud_operation} Operations - {selected_table}")
+
+                if crud_operation == "Create":
+                    create_record(selected_table)
+                elif crud_operation == "Read":
+                    read_records(selected_table)
+                elif crud_operation == "Update":
+                    update_record(selected_table)
+                elif crud_operation == "Delete":
+                    delete_record(selected_table)
+
+        elif mode == "Audit Explorer" and role == 'admin_user':
+            st.header("🔒 Audit Explorer")
+            render_audit_explorer()
+
+        elif mode == "Performance" and role == 'admin_user':
+            st.header("🚀 Query Performance")
+            render_performance_page()
+
+        elif mode == "Visualizations" and viz_option:
+            # All visualization permissions already checked when building the menu
+            if viz_option == "Overview (all charts)":
+                st.header("📊 Overview")
+                render_overview_page(role)
+            elif viz_option == "Customer Age Distribution":
+                viz_customer_age_distribution()
+            elif viz_option == "Customer Growth Over Time":
+                viz_customer_growth()
+            elif viz_option == "Customer Account Status":
+                viz_customer_by_status()
+            elif viz_option == "Product Sales Analysis":
+                viz_product_sales()
+            elif viz_option == "Product Stock Status":
+                viz_stock_status()
+            elif viz_option == "Order Amount Distribution":
+                viz_order_distribution()
+            elif viz_option == "Order Status Overview":
+                viz_order_status()
+            elif viz_option == "Payment Status Breakdown":
+                viz_payment_status()
 
     # Footer
     st.markdown("---")
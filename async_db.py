@@ -0,0 +1,358 @@
+"""
+Async data access for the dashboard database
+
+Coroutine versions of the app.py helpers (table reads, writes, metadata and
+chart queries) on SQLAlchemy's asyncio extension, so a headless API or worker
+process can serve many concurrent requests on one event loop instead of one
+thread per request:
+
+    import async_db
+    engine = async_db.get_async_engine('sales_user', 'password')
+    df = await async_db.fetch_table_data('orders', engine=engine)
+
+Synchronous code (the Streamlit UI, scripts) can use the same functions through
+the blocking facade, which runs them on a background event loop:
+
+    df = async_db.sync.fetch_table_data('orders')
+
+Needs an async driver - asyncmy (or aiomysql) for MySQL, aiosqlite for a
+SQLite stand-in - and greenlet:
+
+    pip install asyncmy greenlet
+
+SQL, permissions, the query result cache, the schema catalog format and the
+query log are shared with app.py, so both paths return the same DataFrames.
+"""
+
+import asyncio
+import functools
+import importlib.util
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app
+
+# Async drivers per backend, in order of preference
+ASYNC_DRIVERS = {
+    'mysql': ['asyncmy', 'aiomysql'],
+    'sqlite': ['aiosqlite']
+}
+
+def async_url(url):
+    """Same database URL with the first installed async driver (mysql+pymysql -> mysql+asyncmy)"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    drivers = ASYNC_DRIVERS.get(backend, [])
+    for driver in drivers:
+        if importlib.util.find_spec(driver) is not None:
+            return url.set(drivername=f"{backend}+{driver}")
+    raise ImportError(f"No async driver for {backend} installed - pip install {drivers[0] if drivers else '<driver>'}")
+
+# =====================================================
+# ENGINES
+# =====================================================
+
+class AsyncEngineRegistry:
+    """One pooled async engine per credential set, like app.EngineRegistry
+
+    An async engine's connections belong to the event loop that opened them,
+    so a process should use either its own loop or the sync facade, not both.
+    """
+
+    def __init__(self, pool_config):
+        self.pool_config = dict(pool_config)
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def get(self, user, password, url=None):
+        """Return the async engine for these credentials, creating it on first use"""
+        key = (user, app.EngineRegistry.fingerprint(user, password, url))
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = self._create_engine(user, password, url)
+                self._engines[key] = engine
+            return engine
+
+    async def discard(self, user, password):
+        """Dispose the engine for these credentials (e.g. after a failed login)"""
+        key = (user, app.EngineRegistry.fingerprint(user, password))
+        with self._lock:
+            engine = self._engines.pop(key, None)
+        if engine is not None:
+            await engine.dispose()
+
+    async def dispose_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for engine in engines:
+            await engine.dispose()
+
+    def _create_engine(self, user, password, url=None):
+        from urllib.parse import quote_plus
+
+        connection_string = url or (
+            f"mysql+pymysql://{user}:{quote_plus(password)}"
+            f"@{app.MYSQL_CONFIG['host']}:{app.MYSQL_CONFIG['port']}/{app.MYSQL_CONFIG['database']}"
+        )
+        engine = create_async_engine(
+            async_url(connection_string),
+            pool_size=self.pool_config['pool_size'],
+            max_overflow=self.pool_config['max_overflow'],
+            pool_timeout=self.pool_config['pool_timeout'],
+            pool_recycle=self.pool_config['pool_recycle'],
+            pool_pre_ping=self.pool_config['pool_pre_ping']
+        )
+        # Events fire on the sync engine underneath, so async queries show on the Performance page
+        app.instrument_engine(engine.sync_engine, app.get_user_role(user) or user)
+        return engine
+
+_registry = AsyncEngineRegistry(app.POOL_CONFIG)
+
+def get_async_engine(username=None, password=None):
+    """Pooled async engine for these credentials (default: the MYSQL_USER service account)
+
+    DASHBOARD_DATABASE_URL only replaces the service engine; logins always
+    connect with their own credentials.
+    """
+    if not (username and password):
+        return _registry.get(app.MYSQL_CONFIG['user'], app.MYSQL_CONFIG['password'],
+                             url=app.DATABASE_URL_OVERRIDE or None)
+    return _registry.get(username, password)
+
+async def authenticate_user(username, password):
+    """Verify credentials by connecting, like app.authenticate_user"""
+    try:
+        async with get_async_engine(username, password).connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        # Don't keep a pool around for credentials that failed
+        await _registry.discard(username, password)
+        return False
+
+async def dispose_engines():
+    """Close every async engine (call before the event loop shuts down)"""
+    await _registry.dispose_all()
+
+# =====================================================
+# QUERIES
+# =====================================================
+
+async def read_sql(sql, params=None, engine=None, tables=None):
+    """Async pd.read_sql through app's query result cache (returns a copy)"""
+    engine = engine if engine is not None else get_async_engine()
+    cache = app.get_result_cache()
+    key = cache.make_key(sql, engine.url.username, params)
+
+    df = cache.get(key)
+    if df is None:
+        async with engine.connect() as conn:
+            result = await conn.execute(text(sql), params or {})
+            df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        cache.put(key, df, tables if tables is not None else app.referenced_tables(sql))
+    return df.copy()
+
+async def fetch_table_data(table_name, engine=None):
+    """Fetch all data from a specific table (not cached)"""
+    engine = engine if engine is not None else get_async_engine()
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"SELECT * FROM {table_name}"))
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+async def execute_sql(query, params=None, engine=None):
+    """Execute a write in one transaction; returns (success, message) like app.execute_sql"""
+    engine = engine if engine is not None else get_async_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(query), params or {})
+        # Cached results that read the written table are now stale
+        app.get_result_cache().invalidate_tables(app.written_tables(query))
+        return True, "Operation successful"
+    except Exception as e:
+        return False, str(e)
+
+async def fetch_table_page(table_name, page_size, after=None, before=None, offset=0, where=None, params=None,
+                           engine=None):
+    """One keyset page; returns (DataFrame, has_more) like app.fetch_table_page"""
+    engine = engine if engine is not None else get_async_engine()
+    catalog = await get_schema_catalog(engine)
+    sql, query_params, descending = app.build_page_query(
+        table_name, catalog.get_primary_key(table_name), page_size, after, before, offset, where, params
+    )
+    async with engine.connect() as conn:
+        result = await conn.execute(text(sql), query_params)
+        df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    has_more = len(df) > page_size
+    df = df.iloc[:page_size]
+    if descending:
+        df = df.iloc[::-1]
+    return df.reset_index(drop=True), has_more
+
+# =====================================================
+# METADATA
+# =====================================================
+
+# URL (password hidden) -> SchemaCatalog, reloaded after app.METADATA_TTL seconds
+_catalogs = {}
+
+async def get_schema_catalog(engine=None):
+    """Cached schema catalog for this engine's user (same snapshot format as app.get_schema_catalog)"""
+    engine = engine if engine is not None else get_async_engine()
+    key = engine.url.render_as_string(hide_password=True)
+    catalog = _catalogs.get(key)
+    if catalog is None or time.time() - catalog.loaded_at > app.METADATA_TTL:
+        # Concurrent misses may both load; the last snapshot wins, which is harmless
+        async with engine.connect() as conn:
+            catalog = await conn.run_sync(app.read_schema_catalog)
+        _catalogs[key] = catalog
+    return catalog
+
+def invalidate_schema_catalog():
+    """Force the next catalog lookup to reload (e.g. after DDL changes)"""
+    _catalogs.clear()
+
+async def get_table_columns(table_name, engine=None):
+    """Column dicts (name, type, nullable, default, autoincrement) for a table or view"""
+    return (await get_schema_catalog(engine)).get_columns(table_name)
+
+async def get_primary_key(table_name, engine=None):
+    """Primary key column(s), or the first column when none is defined"""
+    catalog = await get_schema_catalog(engine)
+    pk = catalog.get_primary_key(table_name)
+    if pk:
+        return pk
+    columns = catalog.get_columns(table_name)
+    return [columns[0]['name']] if columns else []
+
+async def get_all_tables(include_audit=False, engine=None):
+    """Tables and views visible to the engine's user, audit tables only if include_audit"""
+    catalog = await get_schema_catalog(engine)
+    all_objects = catalog.table_names() + catalog.view_names()
+    if include_audit:
+        return sorted(all_objects)
+    excluded = ['customer_audit', 'card_audit', 'product_audit', 'orders_audit', 'payment_audit', 'security_log']
+    return sorted(t for t in all_objects if t not in excluded and not t.endswith('_audit'))
+
+async def get_check_constraint_values(table_name, column_name, engine=None):
+    """Allowed values from a CHECK ... IN (...) constraint, or None"""
+    return (await get_schema_catalog(engine)).get_check_values(table_name, column_name)
+
+# =====================================================
+# CHART QUERIES
+# =====================================================
+
+async def rollups_available(viz_key, engine=None):
+    """True if every table the chart's rollup query reads is visible to this user"""
+    if viz_key not in app.ROLLUP_QUERIES:
+        return False
+    catalog = await get_schema_catalog(engine)
+    return all(catalog.resolve(table) for table in app.referenced_tables(app.ROLLUP_QUERIES[viz_key]))
+
+async def get_order_date_range(engine=None):
+    """(first, last) OrderDate, or (None, None) when there are no orders"""
+    df = await read_sql("SELECT MIN(OrderDate) AS FirstOrder, MAX(OrderDate) AS LastOrder FROM orders",
+                        engine=engine)
+    if df.empty or pd.isna(df['FirstOrder'].iloc[0]):
+        return None, None
+    return pd.to_datetime(df['FirstOrder'].iloc[0]), pd.to_datetime(df['LastOrder'].iloc[0])
+
+async def load_age_buckets(params=None, engine=None):
+    """Age histogram buckets - see app.load_age_buckets"""
+    engine = engine if engine is not None else get_async_engine()
+    if engine.dialect.name == 'mysql':
+        return await read_sql(app.VIZ_QUERIES['customer_age'], {'bins': app.AGE_BUCKETS}, engine)
+    dobs = await read_sql("SELECT DOB FROM customer WHERE DOB IS NOT NULL", engine=engine)
+    return app.compute_age_buckets(dobs['DOB'])
+
+async def load_order_series(params=None, engine=None):
+    """Order amount series per time bucket - see app.load_order_series"""
+    engine = engine if engine is not None else get_async_engine()
+    params = dict(params or {})
+    if 'start' not in params or 'end' not in params:
+        first, last = await get_order_date_range(engine)
+        if first is None:
+            return pd.DataFrame(columns=['Bucket', 'OrderCount', 'Revenue', 'AvgAmount', 'P95Amount'])
+        params.setdefault('start', first)
+        params.setdefault('end', last + pd.Timedelta(seconds=1))
+    granularity = params.pop('granularity', None) or app.choose_time_granularity(params['start'], params['end'])
+
+    expressions = app.TIME_BUCKET_EXPRESSIONS.get(engine.dialect.name, app.TIME_BUCKET_EXPRESSIONS['mysql'])
+    sql = app.VIZ_QUERIES['order_amount'].format(bucket=expressions[granularity])
+    bind = {'start': pd.Timestamp(params['start']).to_pydatetime(),
+            'end': pd.Timestamp(params['end']).to_pydatetime()}
+    return await read_sql(sql, bind, engine)
+
+# Charts whose data needs more than a single cached query
+VIZ_LOADERS = {
+    'customer_age': load_age_buckets,
+    'order_amount': load_order_series
+}
+
+async def load_viz_data(viz_key, params=None, engine=None):
+    """A chart's data through the result cache, preferring its rollup table"""
+    if viz_key in VIZ_LOADERS:
+        return await VIZ_LOADERS[viz_key](params=params, engine=engine)
+    try:
+        use_rollup = await rollups_available(viz_key, engine)
+    except Exception:
+        use_rollup = False
+    sql = app.ROLLUP_QUERIES[viz_key] if use_rollup else app.VIZ_QUERIES[viz_key]
+    return await read_sql(sql, params, engine)
+
+async def load_viz_panels(viz_keys, engine=None):
+    """Several charts at once on one event loop; returns {viz_key: DataFrame or the exception}"""
+    results = await asyncio.gather(*(load_viz_data(key, engine=engine) for key in viz_keys),
+                                   return_exceptions=True)
+    return dict(zip(viz_keys, results))
+
+# =====================================================
+# SYNC FACADE
+# =====================================================
+
+class SyncFacade:
+    """Blocking wrappers around the coroutines above, run on one background event loop
+
+    async_db.sync.fetch_table_data('orders') blocks the calling thread until the
+    coroutine finishes; any number of threads may call it at once.
+    """
+
+    def __init__(self, functions):
+        self._functions = functions
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='async-db-loop', daemon=True).start()
+            return self._loop
+
+    def run(self, coro):
+        """Run a coroutine on the background loop and return its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._functions:
+            raise AttributeError(name)
+        function = self._functions[name]
+
+        @functools.wraps(function)
+        def blocking(*args, **kwargs):
+            return self.run(function(*args, **kwargs))
+        return blocking
+
+sync = SyncFacade({function.__name__: function for function in [
+    read_sql, fetch_table_data, execute_sql, fetch_table_page, get_schema_catalog, get_table_columns,
+    get_primary_key, get_all_tables, get_check_constraint_values, get_order_date_range, load_viz_data,
+    load_viz_panels, dispose_engines
+]})
@@ -0,0 +1,8 @@
+"""
+Benchmark suite for the E-Commerce dashboard
+
+    python -m benchmarks.run --url sqlite:///bench.db --scale 100000 --generate
+    python -m benchmarks.compare results/base.json results/new.json
+
+See Documentation/PERFORMANCE_GUIDE.md ("Benchmarks") for details.
+"""
@@ -0,0 +1,167 @@
+"""
+Compare the pandas and Arrow fetch paths
+
+    python -m benchmarks.arrow_fetch --url mysql+pymysql://root:pw@localhost/ecommerce_bench
+    python -m benchmarks.arrow_fetch --url sqlite:///bench.db --tables orders,payment --repeat 10
+
+Reads whole tables three ways with the dashboard's own helpers:
+
+- pandas:       pd.read_sql (the default path, DASHBOARD_ARROW_FETCH=false)
+- arrow:        app.read_sql_arrow - cursor chunks into typed record batches
+- arrow+pandas: the Arrow table converted to an ArrowDtype DataFrame
+                (what the dashboard displays with DASHBOARD_ARROW_FETCH=true)
+
+Before timing a table it checks that read_sql_arrow returns as many rows as
+pd.read_sql on a stream_results connection (server-side cursors on MySQL,
+where SQLAlchemy pre-buffers the first row), and exits with status 1 if not.
+
+For each path it reports the median wall time, the size of the result and
+the peak memory of the read. Peak memory is measured in a fresh process per
+path and table: the tracemalloc peak (Python objects and NumPy buffers) plus
+the peak of pyarrow's memory pool, which tracemalloc does not see.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from benchmarks import schema
+from benchmarks.run import RESULTS_DIR, git_revision
+
+PATHS = ['pandas', 'arrow', 'arrow+pandas']
+DEFAULT_TABLES = ['orders', 'payment', 'customer', 'orderProduct']
+
+def read(app, conn, path, table, limit=None):
+    """Run one read; returns the result (DataFrame or pyarrow Table)"""
+    sql = f"SELECT * FROM {table}" + (f" LIMIT {limit}" if limit else "")
+    if path == 'pandas':
+        return pd.read_sql(text(sql), conn)
+    result = app.read_sql_arrow(conn, sql, table_name=table)
+    if path == 'arrow+pandas':
+        return result.to_pandas(types_mapper=pd.ArrowDtype)
+    return result
+
+def result_bytes(result):
+    if hasattr(result, 'memory_usage'):
+        return int(result.memory_usage(deep=True).sum())
+    return int(result.nbytes)
+
+def measure_peak(url, path, table):
+    """Peak memory of one read, in a fresh Python process"""
+    completed = subprocess.run([sys.executable, '-m', 'benchmarks.arrow_fetch', '--url', url,
+                                '--peak-of', path, table],
+                               capture_output=True, text=True, cwd=schema.REPO_ROOT, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])['peak_bytes']
+
+def check_row_count(app, conn, table):
+    """Row counts of pd.read_sql and app.read_sql_arrow under stream_results; returns (pandas, arrow)"""
+    sql = f"SELECT * FROM {table}"
+    streaming = conn.execution_options(stream_results=True)
+    return len(pd.read_sql(text(sql), streaming)), app.read_sql_arrow(streaming, sql, table_name=table).num_rows
+
+def child_peak(app, path, table):
+    import pyarrow as pa
+
+    engine = app.get_engine()
+    with engine.connect() as conn:
+        # Warm the connection, the schema catalog, pandas and pyarrow before measuring
+        read(app, conn, 'pandas', table, limit=1)
+        read(app, conn, 'arrow+pandas', table, limit=1)
+        pool = pa.default_memory_pool()
+        pool_baseline = pool.bytes_allocated()
+        tracemalloc.start()
+        result = read(app, conn, path, table)
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        arrow_peak = max(pool.max_memory() - pool_baseline, 0)
+        print(json.dumps({'peak_bytes': python_peak + arrow_peak, 'rows': len(result)}))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=os.getenv('DASHBOARD_DATABASE_URL'),
+                        help='SQLAlchemy URL of the database to read (default: $DASHBOARD_DATABASE_URL)')
+    parser.add_argument('--tables', default=','.join(DEFAULT_TABLES), help='comma-separated tables to read')
+    parser.add_argument('--repeat', type=int, default=5, help='timed reads per path and table')
+    parser.add_argument('--no-memory', action='store_true', help='skip the per-process peak memory runs')
+    parser.add_argument('--output', help='JSON report (default: benchmarks/results/arrow-<time>-<commit>.json)')
+    parser.add_argument('--peak-of', nargs=2, metavar=('PATH', 'TABLE'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        parser.error('--url or DASHBOARD_DATABASE_URL is required')
+
+    # app.py reads its settings at import time
+    os.environ['DASHBOARD_DATABASE_URL'] = args.url
+    sys.path.insert(0, schema.REPO_ROOT)
+    import app
+
+    if args.peak_of:
+        child_peak(app, *args.peak_of)
+        return 0
+
+    tables = [t.strip() for t in args.tables.split(',') if t.strip()]
+    engine = app.get_engine()
+    rows = []
+    for table in tables:
+        table_name = app.get_schema_catalog(engine).resolve(table)
+        if table_name is None:
+            print(f"{table}: not found, skipped")
+            continue
+        with engine.connect() as conn:
+            pandas_rows, arrow_rows = check_row_count(app, conn, table_name)
+        if pandas_rows != arrow_rows:
+            print(f"{table_name}: read_sql_arrow returned {arrow_rows:,} rows, pd.read_sql {pandas_rows:,}")
+            return 1
+        for path in PATHS:
+            timings = []
+            with engine.connect() as conn:
+                read(app, conn, path, table_name)   # warm-up
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    result = read(app, conn, path, table_name)
+                    timings.append((time.perf_counter() - started) * 1000)
+            row = {
+                'table': table_name,
+                'path': path,
+                'rows': len(result),
+                'median_ms': round(statistics.median(timings), 2),
+                'min_ms': round(min(timings), 2),
+                'result_mb': round(result_bytes(result) / 2 ** 20, 2)
+            }
+            if not args.no_memory:
+                row['peak_mb'] = round(measure_peak(args.url, path, table_name) / 2 ** 20, 2)
+            rows.append(row)
+
+    print(f"\n{'table':<14} {'path':<13} {'rows':>9} {'median ms':>10} {'vs pandas':>10} "
+          f"{'result MB':>10} {'peak MB':>9}")
+    baseline = {r['table']: r for r in rows if r['path'] == 'pandas'}
+    for r in rows:
+        speedup = baseline[r['table']]['median_ms'] / r['median_ms'] if r['median_ms'] else 0
+        print(f"{r['table']:<14} {r['path']:<13} {r['rows']:>9,} {r['median_ms']:>10.1f} {speedup:>9.2f}x "
+              f"{r['result_mb']:>10.2f} {r.get('peak_mb', float('nan')):>9.2f}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"arrow-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{git_revision()}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'url': app.get_engine().url.render_as_string(hide_password=True),
+            'dialect': engine.dialect.name,
+            'revision': git_revision(),
+            'repeat': args.repeat,
+            'results': rows
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
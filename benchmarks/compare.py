@@ -0,0 +1,54 @@
+"""
+Compare two benchmark result files
+
+    python -m benchmarks.compare results/base.json results/new.json [--threshold 1.10]
+
+Exits with status 1 if any scenario's median got slower than `threshold`
+times the baseline (and by more than --min-ms), so it can gate CI.
+"""
+
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    return report['metadata'], {r['name']: r for r in report['results']}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=1.10, help='slowdown ratio counted as a regression')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='ignore differences smaller than this')
+    args = parser.parse_args(argv)
+
+    base_meta, base = load(args.baseline)
+    new_meta, new = load(args.candidate)
+    print(f"baseline  {base_meta['commit']}  ({base_meta['dialect']}, {base_meta['row_counts'].get('orders')} orders)")
+    print(f"candidate {new_meta['commit']}  ({new_meta['dialect']}, {new_meta['row_counts'].get('orders')} orders)\n")
+    if base_meta['row_counts'] != new_meta['row_counts']:
+        print("⚠️  Row counts differ - the datasets are not the same\n")
+
+    regressions = 0
+    print(f"{'scenario':<45} {'baseline':>12} {'candidate':>12} {'ratio':>8}")
+    for name in sorted(set(base) | set(new)):
+        if name not in base or name not in new or 'error' in base[name] or 'error' in new[name]:
+            print(f"{name:<45} {'-':>12} {'-':>12} {'n/a':>8}")
+            continue
+        before, after = base[name]['median_ms'], new[name]['median_ms']
+        ratio = after / before if before else float('inf')
+        flag = ''
+        if ratio > args.threshold and after - before > args.min_ms:
+            flag = '  ⬆ regression'
+            regressions += 1
+        elif ratio < 1 / args.threshold and before - after > args.min_ms:
+            flag = '  ⬇ faster'
+        print(f"{name:<45} {before:>10.2f}ms {after:>10.2f}ms {ratio:>7.2f}x{flag}")
+
+    print(f"\n{regressions} regression(s)")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
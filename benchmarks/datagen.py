@@ -0,0 +1,228 @@
+"""
+Deterministic synthetic data for the benchmark database
+
+`scale` is the number of orders; every other table is sized from it:
+
+    customers       scale / 4   (at least 100)
+    products        scale / 100 (at least 200)
+    orderProduct    1-4 lines per order
+    payment         one per order
+    delivery        one per processing / shipped / delivered order
+    *_audit         one INSERT row per entity, plus UPDATE rows for orders and payments
+
+Rows are generated in fixed-size blocks, each from its own seeded generator,
+so the same seed and scale always produce the same database.
+"""
+
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import text
+
+BLOCK_ROWS = 50000
+EPOCH = datetime(2023, 1, 1)
+HISTORY_SECONDS = 3 * 365 * 24 * 3600
+
+FIRST_NAMES = ['Ahmed', 'Sara', 'John', 'Fatima', 'Li', 'Maria', 'Omar', 'Aisha', 'David', 'Noor',
+               'James', 'Layla', 'Chen', 'Elena', 'Yusuf', 'Hana']
+LAST_NAMES = ['Khan', 'Smith', 'Ali', 'Garcia', 'Wang', 'Hassan', 'Brown', 'Ibrahim', 'Lee', 'Rossi',
+              'Patel', 'Nasser', 'Kim', 'Silva']
+
+ORDER_STATUSES = (['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled', 'Refunded'],
+                  [0.10, 0.15, 0.15, 0.50, 0.06, 0.04])
+PAYMENT_FOR_ORDER = {'Pending': 'Pending', 'Processing': 'Completed', 'Shipped': 'Completed',
+                     'Delivered': 'Completed', 'Cancelled': 'Failed', 'Refunded': 'Refunded'}
+DELIVERY_FOR_ORDER = {'Processing': 'Pending', 'Shipped': 'In Transit', 'Delivered': 'Delivered'}
+ACCOUNT_STATUSES = (['Active', 'Inactive', 'Suspended', 'Deleted'], [0.80, 0.12, 0.05, 0.03])
+STOCK_STATUSES = (['In Stock', 'Low Stock', 'Out of Stock', 'Discontinued'], [0.70, 0.15, 0.10, 0.05])
+PAYMENT_METHODS = ['Credit Card', 'Debit Card', 'PayPal', 'Bank Transfer']
+
+TABLE_CODES = {'customer': 1, 'product': 2, 'card': 3, 'orders': 4, 'supplier': 5, 'deliveryPerson': 6}
+
+def table_sizes(scale):
+    return {
+        'orders': int(scale),
+        'customer': max(int(scale) // 4, 100),
+        'product': max(int(scale) // 100, 200),
+        'card': max(int(scale) // 8, 50),
+        'supplier': 100,
+        'deliveryPerson': 50
+    }
+
+def block_rng(seed, table, block):
+    return np.random.default_rng([seed, TABLE_CODES[table], block])
+
+def timestamps(seconds):
+    """Seconds since EPOCH -> 'YYYY-MM-DD HH:MM:SS' strings"""
+    values = np.datetime64(EPOCH, 's') + seconds.astype('timedelta64[s]')
+    return np.datetime_as_string(values, unit='s').astype(object)
+
+def dates(seconds):
+    values = np.datetime64(EPOCH, 's') + seconds.astype('timedelta64[s]')
+    return np.datetime_as_string(values, unit='D').astype(object)
+
+def money(values):
+    return np.round(values, 2).tolist()
+
+class Loader:
+    """executemany of positional tuples in chunks, using the driver's own paramstyle"""
+
+    def __init__(self, conn, chunk_rows=5000):
+        self.conn = conn
+        self.chunk_rows = chunk_rows
+        self.placeholder = '?' if conn.dialect.paramstyle == 'qmark' else '%s'
+        self.counts = {}
+
+    def insert(self, table, columns, rows):
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+               f"VALUES ({', '.join([self.placeholder] * len(columns))})")
+        rows = list(rows)
+        for offset in range(0, len(rows), self.chunk_rows):
+            self.conn.exec_driver_sql(sql, rows[offset:offset + self.chunk_rows])
+        self.counts[table] = self.counts.get(table, 0) + len(rows)
+
+def blocks(total):
+    for block, start in enumerate(range(0, total, BLOCK_ROWS)):
+        yield block, start, min(BLOCK_ROWS, total - start)
+
+def generate_customers(loader, sizes, seed):
+    for block, start, n in blocks(sizes['customer']):
+        rng = block_rng(seed, 'customer', block)
+        ids = np.arange(start + 1, start + n + 1)
+        # Born between ~1950 and ~2008 (15-73 years before EPOCH)
+        dob_strings = dates(rng.integers(-73 * 365, -15 * 365, n) * 86400)
+        registered = timestamps(rng.integers(-3 * 365 * 86400, HISTORY_SECONDS, n))
+        status = rng.choice(ACCOUNT_STATUSES[0], n, p=ACCOUNT_STATUSES[1])
+        first = rng.choice(FIRST_NAMES, n)
+        last = rng.choice(LAST_NAMES, n)
+        loader.insert('customer',
+                      ['CustomerID', 'FirstName', 'LastName', 'DOB', 'Gender', 'RegistrationDate',
+                       'LoyaltyPoints', 'AccountStatus'],
+                      zip(ids.tolist(), first.tolist(), last.tolist(), dob_strings,
+                          rng.choice(['Male', 'Female'], n).tolist(), registered,
+                          rng.integers(0, 5000, n).tolist(), status.tolist()))
+        loader.insert('customer_audit',
+                      ['CustomerID', 'ActionType', 'NewFirstName', 'NewLastName', 'NewAccountStatus',
+                       'NewLoyaltyPoints', 'ChangedBy', 'ChangeTimestamp'],
+                      zip(ids.tolist(), ['INSERT'] * n, first.tolist(), last.tolist(), status.tolist(),
+                          [0] * n, ['benchmark@localhost'] * n, registered))
+
+def generate_products(loader, sizes, seed):
+    for block, start, n in blocks(sizes['product']):
+        rng = block_rng(seed, 'product', block)
+        ids = np.arange(start + 1, start + n + 1)
+        names = [f"Product {i}" for i in ids]
+        status = rng.choice(STOCK_STATUSES[0], n, p=STOCK_STATUSES[1]).tolist()
+        loader.insert('product',
+                      ['ProductID', 'ProductName', 'SKU', 'Weight', 'Warranty', 'Dimensions', 'StockStatus'],
+                      zip(ids.tolist(), names, [f"SKU-{i:08d}" for i in ids], money(rng.uniform(0.1, 25, n)),
+                          rng.choice(['None', '1 Year', '2 Years'], n).tolist(), ['30x20x10'] * n, status))
+        loader.insert('product_audit',
+                      ['ProductID', 'ActionType', 'NewProductName', 'NewStockStatus', 'ChangedBy', 'ChangeTimestamp'],
+                      zip(ids.tolist(), ['INSERT'] * n, names, status, ['benchmark@localhost'] * n,
+                          timestamps(np.zeros(n, dtype=np.int64))))
+
+        # Each product is offered by one or two suppliers
+        first = (ids % sizes['supplier']) + 1
+        second = ((ids * 7) % sizes['supplier']) + 1
+        supplier_price = rng.uniform(1, 400, n)
+        rows = list(zip(first.tolist(), ids.tolist(), money(supplier_price), money(supplier_price * 1.3),
+                        rng.integers(0, 500, n).tolist(), dates(rng.integers(0, HISTORY_SECONDS, n))))
+        rows += [(s, p, sp, round(sp * 1.25, 2), q, d) for (f, p, sp, _, q, d), s
+                 in zip(rows, second.tolist()) if s != f]
+        loader.insert('supplierProduct',
+                      ['SupplierID', 'ProductID', 'SupplierPrice', 'SellingPrice', 'Quantity', 'DateAdded'], rows)
+
+def generate_reference(loader, sizes, seed):
+    rng = block_rng(seed, 'supplier', 0)
+    loader.insert('supplier', ['SupplierID', 'SupplierName', 'EstablishedDate'],
+                  [(i, f"Supplier {i}", f"{1990 + i % 30}-01-01") for i in range(1, sizes['supplier'] + 1)])
+    loader.insert('deliveryPerson', ['DeliveryPersonID', 'DeliveryPersonName'],
+                  [(i, f"Courier {i}") for i in range(1, sizes['deliveryPerson'] + 1)])
+    n = sizes['card']
+    rng = block_rng(seed, 'card', 0)
+    loader.insert('card', ['CardID', 'CardNumber', 'CardHolderName', 'ExpiryYear', 'ExpiryMonth'],
+                  zip(range(1, n + 1), [f"4{i:015d}" for i in range(1, n + 1)], ['Card Holder'] * n,
+                      rng.integers(2026, 2032, n).tolist(), rng.integers(1, 13, n).tolist()))
+
+def generate_orders(loader, sizes, seed):
+    for block, start, n in blocks(sizes['orders']):
+        rng = block_rng(seed, 'orders', block)
+        ids = np.arange(start + 1, start + n + 1)
+        placed = np.sort(rng.integers(0, HISTORY_SECONDS, n))
+        order_dates = timestamps(placed)
+        amount = money(rng.lognormal(4.0, 0.8, n))
+        fee = rng.choice([0.0, 4.99, 9.99, 14.99], n).tolist()
+        status = rng.choice(ORDER_STATUSES[0], n, p=ORDER_STATUSES[1]).tolist()
+        customers = rng.integers(1, sizes['customer'] + 1, n).tolist()
+        id_list = ids.tolist()
+
+        loader.insert('orders',
+                      ['OrderID', 'OrderDate', 'TotalAmount', 'ShippingFee', 'TrackingID', 'OrderStatus', 'CustomerID'],
+                      zip(id_list, order_dates, amount, fee, [f"TRK{i:012d}" for i in id_list], status, customers))
+
+        # 1-4 distinct products per order
+        lines = rng.integers(1, 5, n)
+        first_product = rng.integers(0, sizes['product'], n)
+        order_ids = np.repeat(ids, lines)
+        offsets = np.arange(lines.sum()) - np.repeat(np.cumsum(lines) - lines, lines)
+        product_ids = (np.repeat(first_product, lines) + offsets * 7) % sizes['product'] + 1
+        loader.insert('orderProduct', ['OrderID', 'ProductID', 'Quantity', 'PriceAtPurchase'],
+                      zip(order_ids.tolist(), product_ids.tolist(), rng.integers(1, 6, len(order_ids)).tolist(),
+                          money(rng.uniform(2, 300, len(order_ids)))))
+
+        pay_status = [PAYMENT_FOR_ORDER[s] for s in status]
+        pay_amount = [round(a + f, 2) for a, f in zip(amount, fee)]
+        cards = rng.integers(1, sizes['card'] + 1, n).tolist()
+        loader.insert('payment',
+                      ['PaymentID', 'Amount', 'StatementDate', 'PaymentMethod', 'PaymentStatus', 'Currency',
+                       'PaymentGateway', 'CardID', 'OrderID'],
+                      zip(id_list, pay_amount, dates(placed), rng.choice(PAYMENT_METHODS, n).tolist(), pay_status,
+                          ['USD'] * n, ['Stripe'] * n, cards, id_list))
+
+        delivered = [(i, d, s) for i, d, s in zip(id_list, dates(placed + 3 * 86400), status) if s in DELIVERY_FOR_ORDER]
+        couriers = rng.integers(1, sizes['deliveryPerson'] + 1, len(delivered)).tolist()
+        loader.insert('delivery',
+                      ['DeliveryDate', 'DeliveryTimeEstimate', 'DeliveryFee', 'DeliveryStatus', 'AssignedDate',
+                       'OrderID', 'DeliveryPersonID'],
+                      [(d, '2-4 days', 4.99, DELIVERY_FOR_ORDER[s], d, i, c)
+                       for (i, d, s), c in zip(delivered, couriers)])
+
+        # Audit history: every order/payment was inserted as Pending, then moved to its final status
+        by = ['benchmark@localhost'] * n
+        moved = [i for i, s in enumerate(status) if s != 'Pending']
+        later = timestamps(placed + 3600)
+        loader.insert('orders_audit',
+                      ['OrderID', 'ActionType', 'NewOrderStatus', 'NewTotalAmount', 'ChangedBy', 'ChangeTimestamp'],
+                      zip(id_list, ['INSERT'] * n, ['Pending'] * n, amount, by, order_dates))
+        loader.insert('orders_audit',
+                      ['OrderID', 'ActionType', 'OldOrderStatus', 'NewOrderStatus', 'OldTotalAmount',
+                       'NewTotalAmount', 'ChangedBy', 'ChangeTimestamp'],
+                      [(id_list[i], 'UPDATE', 'Pending', status[i], amount[i], amount[i], by[i], later[i])
+                       for i in moved])
+        loader.insert('payment_audit',
+                      ['PaymentID', 'ActionType', 'NewAmount', 'NewPaymentStatus', 'ChangedBy', 'ChangeTimestamp'],
+                      zip(id_list, ['INSERT'] * n, pay_amount, ['Pending'] * n, by, order_dates))
+        loader.insert('payment_audit',
+                      ['PaymentID', 'ActionType', 'OldAmount', 'NewAmount', 'OldPaymentStatus', 'NewPaymentStatus',
+                       'ChangedBy', 'ChangeTimestamp'],
+                      [(id_list[i], 'UPDATE', pay_amount[i], pay_amount[i], 'Pending', pay_status[i], by[i], later[i])
+                       for i in moved if pay_status[i] != 'Pending'])
+
+def generate(engine, scale, seed=42, progress=None):
+    """Fill an empty benchmark schema; returns {table: rows inserted}"""
+    sizes = table_sizes(scale)
+    steps = [('reference data', generate_reference), ('customers', generate_customers),
+             ('products', generate_products), ('orders', generate_orders)]
+
+    with engine.begin() as conn:
+        if engine.dialect.name == 'mysql':
+            conn.execute(text("SET SESSION unique_checks = 0, foreign_key_checks = 0"))
+        loader = Loader(conn)
+        for name, step in steps:
+            if progress:
+                progress(name)
+            step(loader, sizes, seed)
+        if engine.dialect.name == 'mysql':
+            conn.execute(text("SET SESSION unique_checks = 1, foreign_key_checks = 1"))
+    return loader.counts
@@ -0,0 +1,405 @@
+"""
+Index advisor for the dashboard's queries
+
+    python -m benchmarks.index_advisor --url mysql+pymysql://root:pw@localhost/ecommerce_bench
+    python -m benchmarks.index_advisor --url ... --measure --emit "Basic Operations/migrations"
+
+1. Capture: runs the read, chart and search benchmark scenarios and records
+   every SELECT the app sends to the database (statement and parameters).
+2. Explain: runs EXPLAIN FORMAT=JSON (MySQL) or EXPLAIN QUERY PLAN (SQLite)
+   on each distinct query and flags full table scans, full index scans,
+   filesorts and temporary tables.
+3. Recommend: a candidate index is recommended when a flagged query reads
+   its table and uses its leading column. Candidates that already exist in
+   the database are reported, not recommended again.
+4. --measure times every captured query, creates the recommended indexes,
+   times the queries again and drops the indexes (unless --keep).
+5. --emit writes the recommendations as the next numbered migration file,
+   including the measured timings when --measure was given.
+
+--measure changes the schema: run it on a benchmark database, not production.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import event, inspect
+
+from benchmarks import schema
+from benchmarks.run import RESULTS_DIR, git_revision
+from benchmarks.scenarios import SCENARIOS
+
+MIGRATIONS_DIR = os.path.join(schema.REPO_ROOT, 'Basic Operations', 'migrations')
+
+# Indexes the dashboard's hot queries can use. Secondary InnoDB indexes carry
+# the primary key, so a single-column index also serves keyset pages
+# (`WHERE col = ? AND OrderID > ? ORDER BY OrderID`). `views` lists views
+# whose definition filters on the leading column.
+CANDIDATE_INDEXES = [
+    {'table': 'orders', 'name': 'idx_orders_date_amount', 'columns': ['OrderDate', 'TotalAmount'],
+     'reason': 'order amount time series and date range search; covers TotalAmount'},
+    {'table': 'orders', 'name': 'idx_orders_status', 'columns': ['OrderStatus'],
+     'reason': 'order status chart (GROUP BY) and status search'},
+    {'table': 'payment', 'name': 'idx_payment_status_amount', 'columns': ['PaymentStatus', 'Amount'],
+     'reason': 'payment status chart; covers SUM(Amount)'},
+    {'table': 'product', 'name': 'idx_product_stock_status', 'columns': ['StockStatus'],
+     'reason': 'stock status chart'},
+    {'table': 'customer', 'name': 'idx_customer_registration', 'columns': ['RegistrationDate'],
+     'reason': 'customer growth chart (GROUP BY DATE(RegistrationDate))'},
+    {'table': 'customer', 'name': 'idx_customer_account_status', 'columns': ['AccountStatus'],
+     'reason': 'account status chart'},
+    {'table': 'customer', 'name': 'idx_customer_dob', 'columns': ['DOB'],
+     'reason': 'customer age histogram (DOB range)'},
+    {'table': 'delivery', 'name': 'idx_delivery_status', 'columns': ['DeliveryStatus'],
+     'reason': "ActiveDeliveryView (DeliveryStatus IN (...))", 'views': ['activedeliveryview']},
+    {'table': 'orderProduct', 'name': 'idx_orderproduct_product_qty', 'columns': ['ProductID', 'Quantity'],
+     'reason': 'top products chart; covers SUM(Quantity) per product'}
+]
+
+CAPTURED_GROUPS = ('read', 'viz', 'search')
+SYSTEM_TABLES = {'information_schema', 'sqlite_master', 'sqlite_sequence', 'performance_schema', 'mysql'}
+ALIAS_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|LEFT\b|INNER\b|"
+                           r"CROSS\b|GROUP\b|ORDER\b|LIMIT\b)(\w+))?", re.IGNORECASE)
+
+# ---------------------------------------------------------------- capture
+
+def capture_queries(app, engine, repeat=1):
+    """Run the read-only scenarios and return the distinct SELECTs they issued"""
+    captured = {}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return
+        tables = app.referenced_tables(statement)
+        if not tables or tables & SYSTEM_TABLES:
+            return
+        fingerprint = app.fingerprint_sql(statement)
+        if fingerprint not in captured:
+            captured[fingerprint] = {'fingerprint': fingerprint, 'statement': statement,
+                                     'parameters': parameters, 'tables': sorted(tables),
+                                     'caller': app.find_query_caller(), 'scenarios': []}
+            if captured[fingerprint]['caller'] == '?':
+                # chart queries run straight from load_viz_data
+                captured[fingerprint]['caller'] = current['name']
+        scenarios = captured[fingerprint]['scenarios']
+        if current['name'] not in scenarios:
+            scenarios.append(current['name'])
+
+    current = {'name': None}
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        for entry in SCENARIOS:
+            if entry['group'] not in CAPTURED_GROUPS:
+                continue
+            current['name'] = entry['name']
+            for _ in range(repeat):
+                app.get_result_cache().clear()
+                try:
+                    entry['fn'](app)
+                except Exception as e:
+                    print(f"  {entry['name']}: {str(e)[:100]}")
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+    return list(captured.values())
+
+# ---------------------------------------------------------------- explain
+
+def walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from walk(value)
+
+def explain_mysql(conn, statement, parameters):
+    """Problems in an EXPLAIN FORMAT=JSON plan: [(table or None, problem, detail)]"""
+    raw = conn.exec_driver_sql(f"EXPLAIN FORMAT=JSON {statement}", parameters).scalar()
+    plan = json.loads(raw)
+    problems = []
+    for node in walk(plan):
+        if node.get('using_filesort'):
+            problems.append((None, 'filesort', ''))
+        if node.get('using_temporary_table'):
+            problems.append((None, 'temporary table', ''))
+        table = node.get('table')
+        if isinstance(table, dict) and 'access_type' in table:
+            rows = table.get('rows_examined_per_scan')
+            if table['access_type'] == 'ALL':
+                problems.append((table.get('table_name'), 'full table scan', f"~{rows} rows"))
+            elif table['access_type'] == 'index':
+                problems.append((table.get('table_name'), 'full index scan', f"{table.get('key')}, ~{rows} rows"))
+    return plan, problems
+
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (COVERING )?INDEX (\w+))?")
+
+def explain_sqlite(conn, statement, parameters):
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    plan = [row[-1] for row in rows]
+    problems = []
+    for detail in plan:
+        match = SQLITE_SCAN.match(detail)
+        if match and not match.group(3):
+            problems.append((match.group(1), 'full table scan', ''))
+        elif match:
+            problems.append((match.group(1), 'full index scan', match.group(3)))
+        elif detail.startswith('USE TEMP B-TREE'):
+            problems.append((None, 'filesort' if 'ORDER BY' in detail else 'temporary table', detail))
+    return plan, problems
+
+def explain(engine, query):
+    explainer = explain_mysql if engine.dialect.name == 'mysql' else explain_sqlite
+    with engine.connect() as conn:
+        return explainer(conn, query['statement'], query['parameters'])
+
+def table_aliases(statement):
+    """alias or table name (lower-cased) -> table name (lower-cased)"""
+    aliases = {}
+    for table, alias in ALIAS_PATTERN.findall(statement):
+        aliases[table.lower()] = table.lower()
+        if alias:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+# ---------------------------------------------------------------- recommend
+
+def existing_indexes(engine):
+    """{table (lower-cased): [column lists of its indexes, primary key included]}"""
+    inspector = inspect(engine)
+    indexes = {}
+    for table in {c['table'] for c in CANDIDATE_INDEXES}:
+        try:
+            found = [[c.lower() for c in ix['column_names'] if c] for ix in inspector.get_indexes(table)]
+            pk = inspector.get_pk_constraint(table).get('constrained_columns') or []
+        except Exception:
+            continue
+        indexes[table.lower()] = found + ([[c.lower() for c in pk]] if pk else [])
+    return indexes
+
+def uses_column(statement, column):
+    return re.search(rf"\b{re.escape(column)}\b", statement, re.IGNORECASE) is not None
+
+def recommend(queries, indexes):
+    """Match flagged queries to candidate indexes
+
+    Returns (recommended, present, unmatched): candidates to create (with the
+    queries that motivate them), candidates the database already has, and
+    flagged queries no candidate covers.
+    """
+    recommended, present = {}, {}
+    unmatched = []
+    for query in queries:
+        if not query['problems']:
+            continue
+        aliases = table_aliases(query['statement'])
+        flagged = {aliases.get((t or '').lower(), (t or '').lower()) for t, _, _ in query['problems']}
+        sorts = any(t is None for t, _, _ in query['problems'])
+        matched = False
+        for candidate in CANDIDATE_INDEXES:
+            table = candidate['table'].lower()
+            # plans of view queries name the view's base tables by their aliases
+            if not set(candidate.get('views', ())) & set(query['tables']):
+                if table not in query['tables'] or not uses_column(query['statement'], candidate['columns'][0]):
+                    continue
+                if table not in flagged and not sorts:
+                    continue
+            matched = True
+            wanted = [c.lower() for c in candidate['columns']]
+            target = present if any(ix[:len(wanted)] == wanted for ix in indexes.get(table, [])) else recommended
+            target.setdefault(candidate['name'], {**candidate, 'queries': []})['queries'].append(query['fingerprint'])
+        if not matched:
+            unmatched.append(query)
+    return list(recommended.values()), list(present.values()), unmatched
+
+# ---------------------------------------------------------------- measure
+
+def time_query(engine, query, repeat):
+    runs = []
+    with engine.connect() as conn:
+        for _ in range(repeat + 1):
+            started = time.perf_counter()
+            conn.exec_driver_sql(query['statement'], query['parameters']).fetchall()
+            runs.append((time.perf_counter() - started) * 1000)
+    # first run warms the buffer pool / page cache
+    return round(statistics.median(runs[1:]), 3)
+
+def create_index_sql(candidate):
+    return f"CREATE INDEX {candidate['name']} ON {candidate['table']} ({', '.join(candidate['columns'])})"
+
+def drop_index_sql(candidate, dialect):
+    if dialect == 'mysql':
+        return f"DROP INDEX {candidate['name']} ON {candidate['table']}"
+    return f"DROP INDEX {candidate['name']}"
+
+def apply_indexes(engine, candidates):
+    with engine.begin() as conn:
+        for candidate in candidates:
+            conn.exec_driver_sql(create_index_sql(candidate))
+        # refresh statistics so the optimizer sees the new indexes' cardinality
+        if engine.dialect.name == 'mysql':
+            for table in sorted({c['table'] for c in candidates}):
+                conn.exec_driver_sql(f"ANALYZE TABLE {table}").fetchall()
+        else:
+            conn.exec_driver_sql("ANALYZE")
+
+def drop_indexes(engine, candidates):
+    with engine.begin() as conn:
+        for candidate in candidates:
+            conn.exec_driver_sql(drop_index_sql(candidate, engine.dialect.name))
+
+# ---------------------------------------------------------------- output
+
+def next_migration_path(directory, label='dashboard_indexes'):
+    os.makedirs(directory, exist_ok=True)
+    numbers = [int(m.group(1)) for m in (re.match(r"(\d+)_", f) for f in os.listdir(directory)) if m]
+    return os.path.join(directory, f"{max(numbers, default=0) + 1:03d}_{label}.sql")
+
+def write_migration(path, recommended, queries, engine, measured):
+    by_fingerprint = {q['fingerprint']: q for q in queries}
+    lines = [
+        "-- =========================================",
+        "-- DASHBOARD INDEXES",
+        "-- =========================================",
+        "-- Generated by benchmarks/index_advisor.py from the plans of the queries the",
+        "-- dashboard issues (read, chart and search scenarios).",
+        f"-- Source: {engine.dialect.name} {engine.url.render_as_string(hide_password=True)}, "
+        f"commit {git_revision()}, {datetime.now().isoformat(timespec='seconds')}",
+        "--",
+        f"-- Run after schema.sql:",
+        f"--   mysql -u root -p ecommerce_db < \"Basic Operations/migrations/{os.path.basename(path)}\"",
+        "",
+        "USE ecommerce_db;",
+        ""
+    ]
+    for number, candidate in enumerate(recommended, 1):
+        lines.append(f"-- {number}. {candidate['reason']}")
+        for fingerprint in candidate['queries']:
+            query = by_fingerprint[fingerprint]
+            problems = ", ".join(sorted({p for _, p, _ in query['problems']}))
+            timing = ""
+            if fingerprint in measured:
+                before, after = measured[fingerprint]
+                timing = f"; {before:.2f} ms -> {after:.2f} ms"
+            lines.append(f"--    {query['caller']} ({problems}{timing})")
+        lines.append(create_index_sql(candidate) + ";")
+        lines.append("")
+    lines.append("-- Rollback:")
+    for candidate in recommended:
+        lines.append(f"-- {drop_index_sql(candidate, 'mysql')};")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+def print_report(queries, recommended, present, unmatched):
+    print(f"\n{len(queries)} distinct queries captured, "
+          f"{sum(1 for q in queries if q['problems'])} with full scans / sorts")
+    for query in queries:
+        if not query['problems']:
+            continue
+        print(f"\n  {query['caller']}  [{', '.join(query['scenarios'][:3])}]")
+        print(f"    {query['fingerprint'][:150]}")
+        for table, problem, detail in query['problems']:
+            print(f"    - {problem}" + (f" on {table}" if table else "") + (f" ({detail})" if detail else ""))
+
+    print("\nRecommended indexes:" if recommended else "\nNo new indexes recommended")
+    for candidate in recommended:
+        print(f"  {create_index_sql(candidate)}   -- {len(candidate['queries'])} queries")
+    if present:
+        print("Already present: " + ", ".join(c['name'] for c in present))
+    if unmatched:
+        print(f"{len(unmatched)} flagged queries have no candidate index (review by hand):")
+        for query in unmatched:
+            print(f"  {query['caller']}: {query['fingerprint'][:120]}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=os.getenv('DASHBOARD_DATABASE_URL'),
+                        help='SQLAlchemy URL of the database to analyze (default: $DASHBOARD_DATABASE_URL)')
+    parser.add_argument('--measure', action='store_true',
+                        help='time the queries before and after creating the recommended indexes')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per query with --measure')
+    parser.add_argument('--keep', action='store_true', help='keep the indexes created by --measure')
+    parser.add_argument('--force', action='store_true', help='allow --measure on the MYSQL_DATABASE database')
+    parser.add_argument('--emit', nargs='?', const=MIGRATIONS_DIR,
+                        help=f'write the next numbered migration file (default dir: {MIGRATIONS_DIR})')
+    parser.add_argument('--output', help='JSON report (default: benchmarks/results/indexes-<time>-<commit>.json)')
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        parser.error('--url or DASHBOARD_DATABASE_URL is required')
+
+    # app.py reads its settings at import time
+    os.environ['DASHBOARD_DATABASE_URL'] = args.url
+    sys.path.insert(0, schema.REPO_ROOT)
+    import app
+    import streamlit as st
+    st.session_state['role'] = 'admin_user'
+
+    engine = app.get_engine()
+    if args.measure and engine.dialect.name == 'mysql' and not args.force \
+            and engine.url.database == os.getenv('MYSQL_DATABASE', 'ecommerce_db'):
+        sys.exit(f"Refusing to create and drop indexes on '{engine.url.database}' - use a benchmark "
+                 f"database or pass --force")
+
+    print("Capturing queries...")
+    queries = capture_queries(app, engine)
+    for query in queries:
+        try:
+            query['plan'], query['problems'] = explain(engine, query)
+        except Exception as e:
+            query['plan'], query['problems'] = None, []
+            query['explain_error'] = str(e)[:200]
+    recommended, present, unmatched = recommend(queries, existing_indexes(engine))
+    print_report(queries, recommended, present, unmatched)
+
+    measured = {}
+    if args.measure and recommended:
+        print("\nMeasuring...")
+        before = {q['fingerprint']: time_query(engine, q, args.repeat) for q in queries}
+        apply_indexes(engine, recommended)
+        try:
+            for query in queries:
+                after = time_query(engine, query, args.repeat)
+                measured[query['fingerprint']] = (before[query['fingerprint']], after)
+                query['after_problems'] = explain(engine, query)[1]
+        finally:
+            if not args.keep:
+                drop_indexes(engine, recommended)
+        for query in queries:
+            b, a = measured[query['fingerprint']]
+            print(f"  {b:>10.2f} ms -> {a:>10.2f} ms  {b / a if a else 0:>6.1f}x  {query['caller']}: "
+                  f"{query['fingerprint'][:70]}")
+
+    if args.emit is not None and recommended:
+        path = next_migration_path(args.emit)
+        write_migration(path, recommended, queries, engine, measured)
+        print(f"\nMigration written to {path}")
+
+    report = {
+        'metadata': {
+            'commit': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'dialect': engine.dialect.name,
+            'database': engine.url.render_as_string(hide_password=True)
+        },
+        'queries': [{k: v for k, v in q.items() if k != 'parameters'} for q in queries],
+        'recommended': recommended,
+        'present': [c['name'] for c in present],
+        'measured_ms': {fp: {'before': b, 'after': a} for fp, (b, a) in measured.items()}
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"indexes-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['metadata']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Report written to {output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+Load test: concurrent dashboard sessions per role
+
+    python -m benchmarks.loadtest --url mysql+pymysql://root:pw@localhost/ecommerce_bench --stages 10,25,50,100
+    python -m benchmarks.loadtest --stages 5,20 --stage-seconds 15 --roles sales_manager,warehouse_staff
+
+Each virtual user is a thread that logs in as one of the ROLE_PERMISSIONS
+roles and loops over that role's action mix (charts, table pages, record
+lookups, single-record updates) with a think time between actions. Actions
+call the same app.py functions the pages use, through the role's own pooled
+engine. Concurrency is ramped stage by stage; for every stage the report
+shows throughput, latency percentiles per action, connection pool
+saturation and the server's Threads_connected.
+
+Without --url the app's normal MySQL settings and the role credentials are
+used. With --url every role's pool connects to that database (the pools are
+still separate, as in the running app).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+from benchmarks import schema
+from benchmarks.run import RESULTS_DIR, git_revision, percentile
+
+# Login credentials of the roles created by security/userAccountCreation.sql
+DEFAULT_CREDENTIALS = {
+    'admin_user': 'SecurePass123!',
+    'sales_manager': 'SalesPass456!',
+    'customer_service': 'CSPass789!',
+    'warehouse_staff': 'WarehousePass012!',
+    'marketing_team': 'MarketPass345!',
+    'delivery_coordinator': 'DeliveryPass678!'
+}
+
+# ---------------------------------------------------------------- actions
+# Each action takes (app, rng, keys) and returns a row count.
+# `keys` holds the highest ID of the tables actions pick random records from.
+
+def page(table):
+    def run(app, rng, keys):
+        return len(app.fetch_table_page(table, app.DEFAULT_PAGE_SIZE)[0])
+    return run
+
+def deep_page(table):
+    def run(app, rng, keys):
+        after = (rng.randint(1, max(keys[table], 1)),)
+        return len(app.fetch_table_page(table, app.DEFAULT_PAGE_SIZE, after=after)[0])
+    return run
+
+def chart(viz_key):
+    def run(app, rng, keys):
+        return len(app.load_viz_data(viz_key))
+    return run
+
+def search(table, column, operator, values):
+    def run(app, rng, keys):
+        where, params = app.build_filter_clause(table, [(column, operator, rng.choice(values))])
+        return len(app.fetch_table_page(table, app.DEFAULT_PAGE_SIZE, where=where, params=params)[0])
+    return run
+
+def lookup(table, column):
+    def run(app, rng, keys):
+        found = app.search_record_keys(table, [column], {column: str(rng.randint(1, max(keys[table], 1)))})
+        return 0 if not found else len(app.fetch_record(table, [column], found[0]))
+    return run
+
+def update(table, column, key_column, values):
+    """Single-record update, the same statement the Update page runs"""
+    def run(app, rng, keys):
+        success, message = app.execute_sql(
+            f"UPDATE {table} SET {column} = :value WHERE {key_column} = :key",
+            {'value': rng.choice(values), 'key': rng.randint(1, max(keys[table], 1))})
+        if not success:
+            raise RuntimeError(message)
+        return 1
+    return run
+
+ORDER_STATUSES = ['Pending', 'Processing', 'Shipped', 'Delivered']
+STOCK_STATUSES = ['In Stock', 'Low Stock', 'Out of Stock']
+DELIVERY_STATUSES = ['Pending', 'In Transit', 'Out for Delivery', 'Delivered']
+
+# role -> [(weight, action name, fn, writes)]
+ROLE_MIXES = {
+    'admin_user': [
+        (3, 'page:orders', page('orders'), False),
+        (2, 'deep_page:orders', deep_page('orders'), False),
+        (2, 'chart:order_amount', chart('order_amount'), False),
+        (1, 'chart:customer_growth', chart('customer_growth'), False),
+        (1, 'update:orders.OrderStatus', update('orders', 'OrderStatus', 'OrderID', ORDER_STATUSES), True)
+    ],
+    'sales_manager': [
+        (3, 'chart:order_amount', chart('order_amount'), False),
+        (2, 'chart:order_status', chart('order_status'), False),
+        (2, 'chart:payment_status', chart('payment_status'), False),
+        (2, 'chart:product_sales', chart('product_sales'), False),
+        (3, 'page:orders', page('orders'), False),
+        (2, 'search:orders.OrderStatus', search('orders', 'OrderStatus', 'equals', ORDER_STATUSES), False),
+        (1, 'update:orders.OrderStatus', update('orders', 'OrderStatus', 'OrderID', ORDER_STATUSES), True)
+    ],
+    'customer_service': [
+        (4, 'lookup:customer', lookup('customer', 'CustomerID'), False),
+        (3, 'lookup:orders', lookup('orders', 'OrderID'), False),
+        (2, 'search:customer.LastName', search('customer', 'LastName', 'like', ['son', 'ar', 'el', 'an']), False),
+        (1, 'chart:customer_age', chart('customer_age'), False),
+        (1, 'chart:order_status', chart('order_status'), False)
+    ],
+    'warehouse_staff': [
+        (3, 'page:product', page('product'), False),
+        (2, 'page:supplierProduct', page('supplierProduct'), False),
+        (2, 'chart:product_stock', chart('product_stock'), False),
+        (1, 'chart:product_sales', chart('product_sales'), False),
+        (3, 'update:product.StockStatus', update('product', 'StockStatus', 'ProductID', STOCK_STATUSES), True)
+    ],
+    'marketing_team': [
+        (3, 'chart:customer_growth', chart('customer_growth'), False),
+        (2, 'chart:customer_account_status', chart('customer_account_status'), False),
+        (2, 'chart:product_sales', chart('product_sales'), False),
+        (2, 'chart:order_amount', chart('order_amount'), False),
+        (1, 'page:customer', page('customer'), False)
+    ],
+    'delivery_coordinator': [
+        (3, 'page:delivery', page('delivery'), False),
+        (2, 'deep_page:delivery', deep_page('delivery'), False),
+        (2, 'lookup:orders', lookup('orders', 'OrderID'), False),
+        (2, 'update:delivery.DeliveryStatus',
+         update('delivery', 'DeliveryStatus', 'DeliveryID', DELIVERY_STATUSES), True)
+    ]
+}
+
+KEY_COLUMNS = {'orders': 'OrderID', 'customer': 'CustomerID', 'product': 'ProductID',
+               'delivery': 'DeliveryID'}
+
+# ---------------------------------------------------------------- virtual users
+
+class StageRecorder:
+    """Latency samples and errors of one stage, shared by its virtual users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+        self.last_error = {}
+
+    def record(self, role, action, elapsed_ms, error=None):
+        name = f"{role}:{action}"
+        with self.lock:
+            if error is None:
+                self.samples.setdefault(name, []).append(elapsed_ms)
+            else:
+                self.errors[name] = self.errors.get(name, 0) + 1
+                self.last_error[name] = str(error)[:200]
+
+def virtual_user(app, engine, role, mix, keys, recorder, stop, think_ms, seed):
+    rng = random.Random(seed)
+    weights = [m[0] for m in mix]
+    with app.bind_engine(engine):
+        while not stop.is_set():
+            _, action, fn, _ = rng.choices(mix, weights=weights)[0]
+            started = time.perf_counter()
+            try:
+                fn(app, rng, keys)
+                recorder.record(role, action, (time.perf_counter() - started) * 1000)
+            except Exception as e:
+                recorder.record(role, action, None, error=e)
+            if think_ms:
+                stop.wait(rng.expovariate(1.0 / think_ms) / 1000)
+
+def sample_server(app, engine, stop, interval, samples):
+    """Poll pool usage and Threads_connected while a stage runs"""
+    while not stop.wait(interval):
+        pools = app.get_engine_registry().stats()
+        threads = None
+        if engine.dialect.name == 'mysql':
+            try:
+                with engine.connect() as conn:
+                    threads = int(conn.exec_driver_sql(
+                        "SHOW GLOBAL STATUS LIKE 'Threads_connected'").fetchone()[1])
+            except Exception:
+                pass
+        samples.append({
+            'checked_out': sum(p['checked_out'] for p in pools),
+            'overflow': sum(p['overflow'] for p in pools),
+            'waits': sum(p['waits'] for p in pools),
+            'threads_connected': threads
+        })
+
+def assign_roles(users, roles):
+    """Spread `users` virtual users round-robin over the roles"""
+    return [roles[i % len(roles)] for i in range(users)]
+
+def run_stage(app, engines, monitor_engine, users, roles, keys, seconds, think_ms, skip_writes, seed):
+    recorder = StageRecorder()
+    stop = threading.Event()
+    samples = []
+    pools_before = {p['user']: p for p in app.get_engine_registry().stats()}
+
+    threads = []
+    for i, role in enumerate(assign_roles(users, roles)):
+        mix = [m for m in ROLE_MIXES[role] if not (skip_writes and m[3])]
+        threads.append(threading.Thread(
+            target=virtual_user, daemon=True,
+            args=(app, engines[role], role, mix, keys, recorder, stop, think_ms, seed * 100003 + i)))
+    monitor = threading.Thread(target=sample_server, args=(app, monitor_engine, stop, 0.5, samples), daemon=True)
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    monitor.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    monitor.join()
+    elapsed = time.perf_counter() - started
+
+    actions = []
+    for name in sorted(set(recorder.samples) | set(recorder.errors)):
+        runs = recorder.samples.get(name, [])
+        actions.append({
+            'action': name,
+            'count': len(runs),
+            'errors': recorder.errors.get(name, 0),
+            'last_error': recorder.last_error.get(name),
+            'p50_ms': round(percentile(runs, 0.50), 2) if runs else None,
+            'p95_ms': round(percentile(runs, 0.95), 2) if runs else None,
+            'p99_ms': round(percentile(runs, 0.99), 2) if runs else None,
+            'max_ms': round(max(runs), 2) if runs else None
+        })
+
+    all_runs = [ms for runs in recorder.samples.values() for ms in runs]
+    errors = sum(recorder.errors.values())
+    pools = []
+    for p in app.get_engine_registry().stats():
+        before = pools_before.get(p['user'], {})
+        pools.append({
+            'user': p['user'],
+            'pool_size': p['pool_size'],
+            'peak_overflow': p['peak_overflow'],
+            'waits': p['waits'] - before.get('waits', 0),
+            'avg_wait_ms': p['avg_wait_ms'],
+            'connects': p['connects'] - before.get('connects', 0)
+        })
+    threads_connected = [s['threads_connected'] for s in samples if s['threads_connected'] is not None]
+    return {
+        'users': users,
+        'seconds': round(elapsed, 2),
+        'requests': len(all_runs),
+        'errors': errors,
+        'throughput_rps': round(len(all_runs) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(all_runs, 0.50), 2) if all_runs else None,
+        'p95_ms': round(percentile(all_runs, 0.95), 2) if all_runs else None,
+        'p99_ms': round(percentile(all_runs, 0.99), 2) if all_runs else None,
+        'peak_checked_out': max((s['checked_out'] for s in samples), default=0),
+        'peak_overflow': max((s['overflow'] for s in samples), default=0),
+        'peak_threads_connected': max(threads_connected) if threads_connected else None,
+        'pools': pools,
+        'actions': actions
+    }
+
+def max_keys(engine):
+    keys = {}
+    with engine.connect() as conn:
+        for table, column in KEY_COLUMNS.items():
+            keys[table] = conn.exec_driver_sql(f"SELECT MAX({column}) FROM {table}").scalar() or 1
+    return keys
+
+def print_stage(stage):
+    print(f"\n{stage['users']:>4} users  {stage['throughput_rps']:>8.1f} req/s  "
+          f"p50 {stage['p50_ms'] or 0:>8.1f} ms  p95 {stage['p95_ms'] or 0:>8.1f} ms  "
+          f"p99 {stage['p99_ms'] or 0:>8.1f} ms  errors {stage['errors']}")
+    print(f"      pool: peak checked out {stage['peak_checked_out']}, peak overflow {stage['peak_overflow']}, "
+          f"waits {sum(p['waits'] for p in stage['pools'])}"
+          + (f" | Threads_connected peak {stage['peak_threads_connected']}"
+             if stage['peak_threads_connected'] is not None else ""))
+    for action in stage['actions']:
+        line = f"      {action['action']:<50} {action['count']:>6}"
+        if action['count']:
+            line += f"  p50 {action['p50_ms']:>8.1f}  p95 {action['p95_ms']:>8.1f}  p99 {action['p99_ms']:>8.1f}"
+        if action['errors']:
+            line += f"  errors {action['errors']} ({action['last_error'][:60]})"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=os.getenv('DASHBOARD_DATABASE_URL'),
+                        help='SQLAlchemy URL used by every role (default: $DASHBOARD_DATABASE_URL, '
+                             'else the MySQL settings with per-role logins)')
+    parser.add_argument('--stages', default='10,25,50,100', help='comma-separated virtual user counts')
+    parser.add_argument('--stage-seconds', type=float, default=30, help='duration of each stage')
+    parser.add_argument('--think-ms', type=float, default=500, help='mean think time between actions (0 = none)')
+    parser.add_argument('--roles', default=','.join(ROLE_MIXES), help='comma-separated roles to simulate')
+    parser.add_argument('--credentials', help='JSON file mapping role -> password (default: the users.sql ones)')
+    parser.add_argument('--cache-ttl', type=int,
+                        help='override DASHBOARD_CACHE_TTL (0 sends every read to the database)')
+    parser.add_argument('--skip-writes', action='store_true', help='leave out update actions')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='result file (default: benchmarks/results/load-<time>-<commit>.json)')
+    args = parser.parse_args(argv)
+
+    stages = [int(s) for s in args.stages.split(',') if s.strip()]
+    roles = [r.strip() for r in args.roles.split(',') if r.strip()]
+    unknown = [r for r in roles if r not in ROLE_MIXES]
+    if unknown:
+        parser.error(f"unknown role(s): {', '.join(unknown)}")
+    credentials = dict(DEFAULT_CREDENTIALS)
+    if args.credentials:
+        with open(args.credentials, encoding='utf-8') as f:
+            credentials.update(json.load(f))
+
+    # app.py reads its settings at import time
+    if args.url:
+        os.environ['DASHBOARD_DATABASE_URL'] = args.url
+    if args.cache_ttl is not None:
+        os.environ['DASHBOARD_CACHE_TTL'] = str(args.cache_ttl)
+    sys.path.insert(0, schema.REPO_ROOT)
+    import app
+
+    if args.url:
+        # Every role shares the benchmark database, each with its own pool and query log role
+        engines = {role: app.get_engine_registry().get(role, credentials[role], url=args.url) for role in roles}
+    else:
+        engines = {role: app.get_engine(role, credentials[role]) for role in roles}
+    monitor_engine = engines[roles[0]]
+    keys = max_keys(monitor_engine)
+
+    report = {
+        'metadata': {
+            'commit': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'dialect': monitor_engine.dialect.name,
+            'database': monitor_engine.url.render_as_string(hide_password=True),
+            'roles': roles,
+            'stage_seconds': args.stage_seconds,
+            'think_ms': args.think_ms,
+            'cache_ttl': app.RESULT_CACHE_TTL,
+            'pool_config': app.POOL_CONFIG,
+            'skip_writes': args.skip_writes
+        },
+        'stages': []
+    }
+
+    for users in stages:
+        print(f"Stage: {users} users for {args.stage_seconds:g}s...", flush=True)
+        stage = run_stage(app, engines, monitor_engine, users, roles, keys, args.stage_seconds,
+                          args.think_ms, args.skip_writes, args.seed)
+        print_stage(stage)
+        report['stages'].append(stage)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['metadata']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Run the benchmark scenarios and write a JSON result file
+
+    python -m benchmarks.run --url sqlite:///bench.db --scale 100000 --generate
+    python -m benchmarks.run --url mysql+pymysql://root:pw@localhost/ecommerce_bench --only viz
+
+--generate drops and recreates every table in the target database first.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, make_url, text
+
+from benchmarks import datagen, schema
+from benchmarks.scenarios import SCENARIOS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+COUNTED_TABLES = ['customer', 'product', 'orders', 'orderProduct', 'payment', 'delivery',
+                  'orders_audit', 'payment_audit']
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=schema.REPO_ROOT, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, cwd=schema.REPO_ROOT).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except Exception:
+        return 'unknown'
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+def time_scenario(app, entry, repeat, warmup):
+    runs = []
+    rows = None
+    if entry.get('setup'):
+        entry['setup'](app)
+    try:
+        for i in range(warmup + repeat):
+            app.get_result_cache().clear()
+            started = time.perf_counter()
+            rows = entry['fn'](app)
+            elapsed = (time.perf_counter() - started) * 1000
+            if i >= warmup:
+                runs.append(round(elapsed, 3))
+    finally:
+        if entry.get('cleanup'):
+            entry['cleanup'](app)
+    return {
+        'name': entry['name'],
+        'group': entry['group'],
+        'rows': int(rows) if rows is not None else None,
+        'runs_ms': runs,
+        'min_ms': min(runs),
+        'median_ms': round(statistics.median(runs), 3),
+        'p95_ms': percentile(runs, 0.95),
+        'mean_ms': round(statistics.mean(runs), 3)
+    }
+
+def prepare_database(url, scale, seed, force=False):
+    engine = create_engine(url)
+    if engine.dialect.name == 'mysql' and engine.url.database == os.getenv('MYSQL_DATABASE', 'ecommerce_db') \
+            and not force:
+        sys.exit(f"Refusing to drop and regenerate '{engine.url.database}' - use a separate benchmark "
+                 f"database or pass --force")
+    print(f"Generating scale={scale:,} seed={seed} into {engine.url.render_as_string(hide_password=True)}")
+    schema.drop_all(engine)
+    schema.create_tables(engine)
+    started = time.perf_counter()
+    counts = datagen.generate(engine, scale, seed, progress=lambda step: print(f"  {step}..."))
+    skipped = schema.create_triggers_and_views(engine)
+    print(f"  loaded {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s"
+          + (f" (views skipped: {', '.join(skipped)})" if skipped else ""))
+    engine.dispose()
+
+def row_counts(engine):
+    counts = {}
+    with engine.connect() as conn:
+        for table in COUNTED_TABLES:
+            try:
+                counts[table] = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            except Exception:
+                counts[table] = None
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=os.getenv('DASHBOARD_DATABASE_URL'),
+                        help='SQLAlchemy URL of the benchmark database (default: $DASHBOARD_DATABASE_URL)')
+    parser.add_argument('--scale', type=int, default=10000, help='number of orders to generate (10^4 - 10^7)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--generate', action='store_true', help='drop, recreate and fill the database first')
+    parser.add_argument('--force', action='store_true', help='allow --generate on the MYSQL_DATABASE database')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per scenario')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed runs per scenario')
+    parser.add_argument('--only', action='append', default=[], help='run scenarios whose name contains this')
+    parser.add_argument('--skip-writes', action='store_true', help='leave out scenarios that modify data')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<time>-<commit>.json)')
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        parser.error('--url or DASHBOARD_DATABASE_URL is required')
+    if args.generate:
+        prepare_database(args.url, args.scale, args.seed, args.force)
+
+    # app.py reads its settings at import time
+    os.environ['DASHBOARD_DATABASE_URL'] = args.url
+    sys.path.insert(0, schema.REPO_ROOT)
+    import app
+    import streamlit as st
+    st.session_state['role'] = 'admin_user'
+
+    engine = app.get_engine()
+    selected = [s for s in SCENARIOS
+                if (not args.only or any(o in s['name'] for o in args.only))
+                and not (args.skip_writes and s['writes'])]
+
+    results = []
+    for entry in selected:
+        try:
+            result = time_scenario(app, entry, args.repeat, args.warmup)
+            print(f"{entry['name']:<45} median {result['median_ms']:>10.2f} ms   p95 {result['p95_ms']:>10.2f} ms")
+        except Exception as e:
+            result = {'name': entry['name'], 'group': entry['group'], 'error': str(e)[:300]}
+            print(f"{entry['name']:<45} FAILED: {str(e)[:100]}")
+        results.append(result)
+
+    with engine.connect() as conn:
+        server = conn.execute(text("SELECT VERSION()" if engine.dialect.name == 'mysql'
+                                   else "SELECT sqlite_version()")).scalar()
+    report = {
+        'metadata': {
+            'commit': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'dialect': engine.dialect.name,
+            'server_version': server,
+            'database': make_url(args.url).render_as_string(hide_password=True),
+            'scale': args.scale if args.generate else None,
+            'seed': args.seed if args.generate else None,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'row_counts': row_counts(engine)
+        },
+        'results': results
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['metadata']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 0 if all('error' not in r for r in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
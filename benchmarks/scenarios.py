@@ -0,0 +1,168 @@
+"""
+Timed benchmark scenarios
+
+Each scenario calls the dashboard's own data-access functions in app.py, so
+the numbers follow the code paths the pages use. The result cache is cleared
+before every run: scenarios measure the database and the Python around it,
+not cache hits.
+
+Write scenarios may register a cleanup that removes the rows they added (or
+restores the rows they changed, from a snapshot taken by their setup), so a
+rerun against the same database measures the same data.
+"""
+
+import itertools
+import uuid
+
+import pandas as pd
+
+SCENARIOS = []
+
+def scenario(group, name, writes=False, setup=None, cleanup=None):
+    """Register a scenario; the function takes the imported app module and returns a row count
+
+    `setup(app)` runs once before the first run, `cleanup(app)` once after all
+    runs of the scenario, even when one fails.
+    """
+    def register(fn):
+        SCENARIOS.append({'group': group, 'name': f"{group}:{name}", 'fn': fn, 'writes': writes,
+                          'setup': setup, 'cleanup': cleanup})
+        return fn
+    return register
+
+def last_key(app, table, column):
+    with app.get_engine().connect() as conn:
+        return conn.exec_driver_sql(f"SELECT MAX({column}) FROM {table}").scalar() or 0
+
+# ---------------------------------------------------------------- reads
+
+@scenario('read', 'fetch_table_data:customer')
+def read_all_customers(app):
+    return len(app.fetch_table_data('customer'))
+
+@scenario('read', 'fetch_table_data:orders')
+def read_all_orders(app):
+    return len(app.fetch_table_data('orders'))
+
+@scenario('read', 'page:orders:first')
+def first_orders_page(app):
+    return len(app.fetch_table_page('orders', app.DEFAULT_PAGE_SIZE)[0])
+
+@scenario('read', 'page:orders:deep')
+def deep_orders_page(app):
+    after = (last_key(app, 'orders', 'OrderID') - app.DEFAULT_PAGE_SIZE * 3,)
+    return len(app.fetch_table_page('orders', app.DEFAULT_PAGE_SIZE, after=after)[0])
+
+@scenario('read', 'page:ActiveDeliveryView')
+def active_deliveries_page(app):
+    return len(app.fetch_table_page('ActiveDeliveryView', app.DEFAULT_PAGE_SIZE)[0])
+
+@scenario('read', 'row_count:orders')
+def count_orders(app):
+    return app.estimate_row_count('orders')[0]
+
+@scenario('read', 'record_lookup:orderProduct')
+def lookup_order_line(app):
+    keys = app.search_record_keys('orderProduct', ['OrderID', 'ProductID'], {'OrderID': '1000'})
+    return 0 if not keys else len(app.fetch_record('orderProduct', ['OrderID', 'ProductID'], keys[0]))
+
+@scenario('read', 'audit_page:all_tables')
+def audit_first_page(app):
+    return len(app.fetch_audit_page()[0])
+
+@scenario('read', 'audit_history:orders')
+def audit_order_history(app):
+    return len(app.fetch_entity_history('orders_audit', 1000))
+
+# ---------------------------------------------------------------- charts
+
+def viz_scenario(key):
+    @scenario('viz', key)
+    def run(app):
+        return len(app.load_viz_data(key))
+    return run
+
+for _key in ['customer_age', 'customer_growth', 'customer_account_status', 'product_sales',
+             'product_stock', 'order_amount', 'order_status', 'payment_status']:
+    viz_scenario(_key)
+
+# ---------------------------------------------------------------- View Data search
+
+def search_scenario(name, table, predicate):
+    @scenario('search', name)
+    def run(app):
+        where, params = app.build_filter_clause(table, [predicate])
+        return len(app.fetch_table_page(table, app.DEFAULT_PAGE_SIZE, where=where, params=params)[0])
+    return run
+
+search_scenario('orders:status_equals', 'orders', ('OrderStatus', 'equals', 'Shipped'))
+search_scenario('orders:tracking_prefix', 'orders', ('TrackingID', 'prefix', 'TRK00000001'))
+search_scenario('orders:date_range', 'orders', ('OrderDate', 'range', ('2024-03-01', '2024-03-31')))
+search_scenario('customer:name_like', 'customer', ('LastName', 'like', 'ass'))
+search_scenario('OrderSummaryView:all_columns', 'OrderSummaryView', (None, 'like', 'Refund'))
+
+# ---------------------------------------------------------------- writes (audit triggers active)
+
+# TrackingID is UNIQUE - a per-process prefix keeps reruns (and leftovers of failed runs) apart
+BENCH_TRACKING_PREFIX = 'BENCH'
+_tracking_run = uuid.uuid4().hex[:12]
+_tracking = itertools.count(1)
+
+def delete_benchmark_orders(app):
+    app.execute_sql("DELETE FROM orders WHERE TrackingID LIKE :prefix", {'prefix': f"{BENCH_TRACKING_PREFIX}%"})
+
+def delete_benchmark_customers(app):
+    app.execute_sql("DELETE FROM customer WHERE FirstName = 'Bench' AND LastName = 'Import'")
+
+# Orders the batch update rewrites, and their OrderStatus before its first run
+BATCH_ORDER_IDS = range(1, 101)
+_batch_order_statuses = {}
+
+def snapshot_batch_orders(app):
+    with app.get_engine().connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"SELECT OrderID, OrderStatus FROM orders "
+            f"WHERE OrderID BETWEEN {BATCH_ORDER_IDS[0]} AND {BATCH_ORDER_IDS[-1]}").all()
+    _batch_order_statuses.clear()
+    _batch_order_statuses.update(rows)
+
+def restore_batch_orders(app):
+    if not _batch_order_statuses:
+        return
+    success, message = app.execute_sql(
+        "UPDATE orders SET OrderStatus = :status WHERE OrderID = :id",
+        [{'id': order_id, 'status': status} for order_id, status in _batch_order_statuses.items()])
+    if not success:
+        raise RuntimeError(message)
+
+@scenario('write', 'insert_record:orders', writes=True, cleanup=delete_benchmark_orders)
+def insert_order(app):
+    success, message, _ = app.insert_record('orders', {
+        'OrderDate': '2025-06-01 12:00:00', 'TotalAmount': 49.99, 'ShippingFee': 4.99,
+        'TrackingID': f"{BENCH_TRACKING_PREFIX}-{_tracking_run}-{next(_tracking):08d}",
+        'OrderStatus': 'Pending', 'CustomerID': 1
+    })
+    if not success:
+        raise RuntimeError(message)
+    return 1
+
+@scenario('write', 'batch_update:orders:100', writes=True,
+          setup=snapshot_batch_orders, cleanup=restore_batch_orders)
+def batch_update_orders(app):
+    keys = [(i,) for i in BATCH_ORDER_IDS]
+    success, message, affected, _ = app.execute_batch('orders', 'update', keys, {'OrderStatus': 'Processing'})
+    if not success:
+        raise RuntimeError(message)
+    return affected
+
+@scenario('write', 'bulk_import:customer:1000', writes=True, cleanup=delete_benchmark_customers)
+def bulk_import_customers(app):
+    df = pd.DataFrame({
+        'FirstName': ['Bench'] * 1000, 'LastName': ['Import'] * 1000, 'DOB': ['1990-05-05'] * 1000,
+        'Gender': ['Female'] * 1000, 'RegistrationDate': ['2025-01-01 00:00:00'] * 1000,
+        'LoyaltyPoints': ['0'] * 1000, 'AccountStatus': ['Active'] * 1000
+    })
+    clean, errors = app.validate_import_rows('customer', df)
+    if not errors.empty:
+        raise RuntimeError(errors.head().to_string())
+    return app.bulk_insert('customer', clean)['inserted']
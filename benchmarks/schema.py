@@ -0,0 +1,108 @@
+"""
+Create the dashboard schema in a benchmark database
+
+The DDL is read from the repository's own SQL files, so the benchmark schema
+follows schema.sql, the audit tables, the triggers and the views. For SQLite
+stand-ins the MySQL-specific syntax is translated on the fly.
+"""
+
+import os
+import re
+
+from sqlalchemy import text
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TABLE_FILES = [
+    os.path.join('Basic Operations', 'schema.sql'),
+    os.path.join('security', 'AuditTrailTables.sql'),
+    os.path.join('security', 'SecurityLog.sql')
+]
+TRIGGER_FILE = os.path.join('security', 'Trigers.sql')
+VIEW_FILE = os.path.join('security', 'ViewAccessControl.sql')
+
+def read_statements(relative_path):
+    """SQL statements of a repository file, with comments, USE and DELIMITER lines removed"""
+    with open(os.path.join(REPO_ROOT, relative_path), encoding='utf-8') as f:
+        sql = re.sub(r'/\*.*?\*/', '', f.read(), flags=re.DOTALL)
+
+    lines = [line for line in sql.splitlines()
+             if not line.strip().startswith('--')
+             and not re.match(r'\s*(USE|CREATE DATABASE|DELIMITER)\b', line, re.IGNORECASE)]
+    sql = "\n".join(lines)
+
+    # Trigger bodies end with END$$ - split those first so their inner ';' survive
+    if '$$' in sql:
+        return [s.strip() for s in sql.split('$$') if s.strip()]
+    return [s.strip() for s in sql.split(';') if s.strip()]
+
+def to_sqlite(statement):
+    """Translate the MySQL DDL used in this repository to SQLite"""
+    statement = re.sub(r'\bINT\s+PRIMARY\s+KEY\s+AUTO_INCREMENT\b', 'INTEGER PRIMARY KEY AUTOINCREMENT',
+                       statement, flags=re.IGNORECASE)
+    statement = re.sub(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', 'INTEGER PRIMARY KEY AUTOINCREMENT',
+                       statement, flags=re.IGNORECASE)
+    statement = re.sub(r'\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP\b', '', statement, flags=re.IGNORECASE)
+    statement = re.sub(r'\bUSER\(\)', "'benchmark'", statement, flags=re.IGNORECASE)
+    if re.match(r'\s*CREATE\s+TRIGGER\b', statement, re.IGNORECASE):
+        # SQLite needs ';' after the last statement of a trigger body
+        statement = re.sub(r'\)\s*;?\s*END\s*$', ');\nEND', statement, flags=re.IGNORECASE)
+    return statement
+
+def table_statements(dialect):
+    statements = [s for path in TABLE_FILES for s in read_statements(path)]
+    return [to_sqlite(s) for s in statements] if dialect == 'sqlite' else statements
+
+def trigger_statements(dialect):
+    statements = [s for s in read_statements(TRIGGER_FILE) if s.upper().startswith('CREATE TRIGGER')]
+    return [to_sqlite(s) for s in statements] if dialect == 'sqlite' else statements
+
+def view_statements(dialect):
+    return [s for s in read_statements(VIEW_FILE) if s.upper().startswith('CREATE VIEW')]
+
+def drop_all(engine):
+    """Drop every table and view of the benchmark database"""
+    from sqlalchemy import inspect
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == 'mysql':
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        for view in inspector.get_view_names():
+            conn.execute(text(f"DROP VIEW IF EXISTS {view}"))
+        for table in inspector.get_table_names():
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        if engine.dialect.name == 'mysql':
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+def create_tables(engine):
+    with engine.begin() as conn:
+        for statement in table_statements(engine.dialect.name):
+            conn.execute(text(statement))
+
+def create_triggers_and_views(engine):
+    """Install audit triggers and role views after the bulk load
+
+    Views that don't work on this backend (MySQL-only functions such as
+    CONCAT on SQLite) are skipped and returned.
+    """
+    created, skipped = set(), []
+    with engine.begin() as conn:
+        for statement in trigger_statements(engine.dialect.name):
+            conn.execute(text(statement))
+    for statement in view_statements(engine.dialect.name):
+        name = re.search(r'CREATE\s+VIEW\s+(\w+)', statement, re.IGNORECASE).group(1)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP VIEW IF EXISTS {name}"))
+                conn.execute(text(statement))
+            # SQLite only resolves function names when the view is queried
+            with engine.connect() as conn:
+                conn.execute(text(f"SELECT * FROM {name} LIMIT 0"))
+            created.add(name)
+        except Exception:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP VIEW IF EXISTS {name}"))
+            skipped.append(name)
+    # The view file redefines some views - only report names that never got created
+    return [name for name in skipped if name not in created]
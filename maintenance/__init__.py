@@ -0,0 +1,7 @@
+"""
+Database maintenance jobs for the E-Commerce dashboard
+
+    python -m maintenance.audit_retention --keep-months 12 --archive-dir /var/backups/audit
+
+See Documentation/PERFORMANCE_GUIDE.md ("Audit Retention") for details.
+"""
@@ -0,0 +1,206 @@
+"""
+Archive and drop old audit history
+
+    python -m maintenance.audit_retention --keep-months 12 --archive-dir /var/backups/audit
+    python -m maintenance.audit_retention --keep-months 12 --archive-dir /var/backups/audit --dry-run
+    python -m maintenance.audit_retention --status
+
+Rows older than the first day of the month `--keep-months` months ago are
+exported to gzip-compressed CSV files in --archive-dir, then removed:
+
+- partitioned tables (Basic Operations/migrations/002_audit_partitioning.sql):
+  every monthly partition that ends on or before the cutoff is exported with
+  SELECT ... PARTITION (p) and dropped with ALTER TABLE ... DROP PARTITION,
+  which takes milliseconds regardless of its size
+- tables that are not partitioned: rows before the cutoff are exported and
+  then deleted in primary key order, --batch-rows at a time
+
+Nothing is removed unless its archive file was written completely and holds
+the same number of rows the table has for that range. Run it daily from cron
+with an account that may SELECT, DELETE and ALTER the audit tables.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+from datetime import date
+
+from sqlalchemy import text
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# table -> (primary key column, timestamp column)
+AUDIT_TABLES = {
+    'customer_audit': ('AuditID', 'ChangeTimestamp'),
+    'card_audit': ('AuditID', 'ChangeTimestamp'),
+    'product_audit': ('AuditID', 'ChangeTimestamp'),
+    'orders_audit': ('AuditID', 'ChangeTimestamp'),
+    'payment_audit': ('AuditID', 'ChangeTimestamp'),
+    'security_log': ('LogID', 'Timestamp')
+}
+
+def retention_cutoff(keep_months, today=None):
+    """First day of the month `keep_months` months before the current one"""
+    today = today or date.today()
+    month = today.year * 12 + today.month - 1 - keep_months
+    return date(month // 12, month % 12 + 1, 1)
+
+def list_partitions(conn, table):
+    """[(name, upper bound date or None for MAXVALUE, estimated rows)] in order; [] if not partitioned"""
+    if conn.dialect.name != 'mysql':
+        return []
+    rows = conn.execute(text("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """), {'table': table}).fetchall()
+    partitions = []
+    for name, description, estimated in rows:
+        bound = None if description == 'MAXVALUE' else date.fromisoformat(description.strip("'")[:10])
+        partitions.append((name, bound, estimated))
+    return partitions
+
+def archive(app, engine, source, where, params, destination):
+    """Export `SELECT * FROM source [WHERE ...]` to destination (.csv.gz); returns rows written"""
+    path, rows = app.stream_export(source, 'csv.gz', where=where, params=params, engine=engine)
+    try:
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.move(path, destination)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    return rows
+
+def retire_partitions(app, engine, table, partitions, cutoff, archive_dir, dry_run):
+    """Archive and drop the monthly partitions that end on or before the cutoff"""
+    removed = 0
+    expired = [(name, bound, estimated) for name, bound, estimated in partitions
+               if bound is not None and bound <= cutoff]
+    if not expired:
+        print(f"  {table}: no partitions before {cutoff}")
+    for name, bound, estimated in expired:
+        destination = os.path.join(archive_dir, table, f"{table}-{name}.csv.gz")
+        if dry_run:
+            print(f"  {table}: would archive and drop partition {name} (< {bound}, ~{estimated:,} rows)")
+            continue
+        rows = archive(app, engine, f"{table} PARTITION ({name})", None, None, destination)
+        with engine.begin() as conn:
+            count = conn.execute(text(f"SELECT COUNT(*) FROM {table} PARTITION ({name})")).scalar()
+            if count != rows:
+                raise RuntimeError(f"{table}.{name}: archived {rows} rows but the partition has {count}; "
+                                   f"not dropped")
+            conn.execute(text(f"ALTER TABLE {table} DROP PARTITION {name}"))
+        print(f"  {table}: partition {name} -> {destination} ({rows:,} rows), dropped")
+        removed += rows
+    return removed
+
+def retire_rows(app, engine, table, key_column, ts_column, cutoff, archive_dir, batch_rows, dry_run):
+    """Archive rows before the cutoff, then delete them in key order, batch_rows at a time"""
+    params = {'cutoff': cutoff}
+    with engine.connect() as conn:
+        count, last_key = conn.execute(
+            text(f"SELECT COUNT(*), MAX({key_column}) FROM {table} WHERE {ts_column} < :cutoff"), params).one()
+    if not count:
+        print(f"  {table}: no rows before {cutoff}")
+        return 0
+    if dry_run:
+        print(f"  {table}: would archive and delete {count:,} rows before {cutoff}")
+        return 0
+
+    destination = os.path.join(archive_dir, table, f"{table}-before-{cutoff:%Y%m}.csv.gz")
+    # Rows that arrive late for an already archived range go to a new file
+    suffix = 1
+    while os.path.exists(destination):
+        destination = os.path.join(archive_dir, table, f"{table}-before-{cutoff:%Y%m}-{suffix}.csv.gz")
+        suffix += 1
+    # Only rows up to the last archived key are deleted, even if older rows arrive meanwhile
+    where = f"{ts_column} < :cutoff AND {key_column} <= :last_key"
+    params['last_key'] = last_key
+    rows = archive(app, engine, table, where, params, destination)
+    if rows != count:
+        raise RuntimeError(f"{table}: archived {rows} rows but {count} match; nothing deleted")
+
+    deleted = 0
+    while True:
+        with engine.begin() as conn:
+            upper = conn.execute(text(
+                f"SELECT {key_column} FROM {table} WHERE {where} ORDER BY {key_column} LIMIT 1 OFFSET :offset"),
+                {**params, 'offset': batch_rows - 1}).scalar()
+            result = conn.execute(text(
+                f"DELETE FROM {table} WHERE {where}" + (f" AND {key_column} <= :upper" if upper is not None else "")),
+                {**params, 'upper': upper})
+            deleted += result.rowcount
+        if upper is None:
+            break
+    print(f"  {table}: {rows:,} rows -> {destination}, {deleted:,} deleted")
+    return deleted
+
+def print_status(engine):
+    with engine.connect() as conn:
+        for table, (_, ts_column) in AUDIT_TABLES.items():
+            try:
+                partitions = list_partitions(conn, table)
+                oldest = conn.execute(text(f"SELECT MIN({ts_column}) FROM {table}")).scalar()
+            except Exception as e:
+                print(f"{table}: {str(e)[:100]}")
+                continue
+            if not partitions:
+                print(f"{table}: not partitioned, oldest row {oldest}")
+                continue
+            print(f"{table}: {len(partitions)} partitions, oldest row {oldest}")
+            for name, bound, estimated in partitions:
+                print(f"  {name:<10} < {bound or 'MAXVALUE'}   ~{estimated:,} rows")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=os.getenv('DASHBOARD_DATABASE_URL'),
+                        help='SQLAlchemy URL (default: $DASHBOARD_DATABASE_URL, else the MYSQL_* settings)')
+    parser.add_argument('--keep-months', type=int, default=12, help='full months of history to keep online')
+    parser.add_argument('--archive-dir', default=os.path.join(REPO_ROOT, 'archive'),
+                        help='directory receiving <table>/<table>-<partition>.csv.gz files')
+    parser.add_argument('--tables', default=','.join(AUDIT_TABLES), help='comma-separated tables to process')
+    parser.add_argument('--batch-rows', type=int, default=10000, help='rows per DELETE on unpartitioned tables')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be archived')
+    parser.add_argument('--status', action='store_true', help='show partitions and oldest rows, then exit')
+    args = parser.parse_args(argv)
+
+    tables = [t.strip() for t in args.tables.split(',') if t.strip()]
+    unknown = [t for t in tables if t not in AUDIT_TABLES]
+    if unknown:
+        parser.error(f"unknown table(s): {', '.join(unknown)}")
+    if args.keep_months < 1:
+        parser.error('--keep-months must be at least 1')
+
+    # app.py reads its settings at import time
+    if args.url:
+        os.environ['DASHBOARD_DATABASE_URL'] = args.url
+    sys.path.insert(0, REPO_ROOT)
+    import app
+
+    engine = app.get_engine()
+    if args.status:
+        print_status(engine)
+        return 0
+
+    cutoff = retention_cutoff(args.keep_months)
+    print(f"Archiving audit rows before {cutoff} to {args.archive_dir}" + (" (dry run)" if args.dry_run else ""))
+    failed = False
+    for table in tables:
+        key_column, ts_column = AUDIT_TABLES[table]
+        try:
+            with engine.connect() as conn:
+                partitions = list_partitions(conn, table)
+            if partitions:
+                retire_partitions(app, engine, table, partitions, cutoff, args.archive_dir, args.dry_run)
+            else:
+                retire_rows(app, engine, table, key_column, ts_column, cutoff, args.archive_dir,
+                            args.batch_rows, args.dry_run)
+        except Exception as e:
+            failed = True
+            print(f"  {table}: FAILED - {str(e)[:200]}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())